@@ -118,7 +118,9 @@ while [ $j -lt $n_cases ]; do
      fi
    fi
 
-   if [ $condense_field_climo -eq 1 ] && [ $compute_climo -eq 1 ]; then
+   if [ $condense_field_climo -eq 1 ] && [ $compute_climo -eq 1 ] && [ ${climo_from_history:-0} -eq 1 ]; then
+     echo "climo_from_history set to 1. Not condensing climo variables for $casename!"
+   elif [ $condense_field_climo -eq 1 ] && [ $compute_climo -eq 1 ]; then
      ./bash_scripts/condense_field_bundle.bash $archive_dir_atm \
 					       $scratch_dir \
 					       $casename \
@@ -141,10 +143,44 @@ while [ $j -lt $n_cases ]; do
    casename="${case_set[$j]}"
    scratch_dir="${scratch_dir_set[$j]}"
    compute_climo=${compute_climo_set[$j]}
+   remap_climo=${remap_climo_set[$j]}
+   native_res="${native_res_set[$j]}"
    begin_yr_climo=${begin_yr_climo_set[$j]}
    end_yr_climo=${end_yr_climo_set[$j]}
 
-   if [ $compute_climo -eq 1 ]; then
+   archive_dir="${archive_dir_set[$j]}"
+   short_term_archive=${short_term_archive_set[$j]}
+   condense_field_climo=${condense_field_climo_set[$j]}
+
+   archive_dir_atm="$archive_dir/$casename/run"
+
+   if [ $short_term_archive -eq 1 ]; then
+     archive_dir_atm="$archive_dir/$casename/archive/atm/hist"
+   fi
+
+   if [ $compute_climo -eq 1 ] && [ $condense_field_climo -eq 1 ] && [ ${climo_from_history:-0} -eq 1 ]; then
+     echo
+     echo "Computing seasonal climatology for $casename from history files"
+     echo "Log files in $log_dir/climo_$casename..."
+     echo
+     ./bash_scripts/compute_climo_from_history.bash $archive_dir_atm \
+						    $scratch_dir \
+						    $casename \
+						    $compute_climo_var_list_file \
+						    $begin_yr_climo \
+						    $end_yr_climo
+   elif [ $compute_climo -eq 1 ] && [ $remap_climo -eq 1 ] && [ ${fuse_climo_remap:-0} -eq 1 ]; then
+     echo
+     echo "Computing and remapping seasonal climatology for $casename"
+     echo "Log files in $log_dir/climo_$casename..."
+     echo
+     ./bash_scripts/compute_climo.bash $scratch_dir \
+				       $casename \
+				       $compute_climo_var_list_file \
+				       $begin_yr_climo \
+				       $end_yr_climo \
+				       $native_res
+   elif [ $compute_climo -eq 1 ]; then
      echo
      echo "Computing seasonal climatology for $casename"
      echo "Log files in $log_dir/climo_$casename..."
@@ -173,7 +209,10 @@ while [ $j -lt $n_cases ]; do
    begin_yr_climo=${begin_yr_climo_set[$j]}
    end_yr_climo=${end_yr_climo_set[$j]}
 
-   if [ $remap_climo -eq 1 ]; then
+   if [ $remap_climo -eq 1 ] && [ $compute_climo -eq 1 ] && [ ${fuse_climo_remap:-0} -eq 1 ] && \
+      ! ( [ ${condense_field_climo_set[$j]} -eq 1 ] && [ ${climo_from_history:-0} -eq 1 ] ); then
+     echo "fuse_climo_remap set to 1. Climatology for $casename already remapped!"
+   elif [ $remap_climo -eq 1 ]; then
      echo
      echo "Remapping seasonal climatology files for $casename" 
      echo "Log files in $log_dir/remap_climo_$casename..."
@@ -212,6 +251,11 @@ ref_end_yr_climo=${end_yr_climo_set[$j-1]}
 echo "Reference Case: $ref_case"
 echo
 
+# Plot jobs of all test cases are collected in one file and plotted by one
+# pool of python processes, which reads each reference field once
+plot_climo_job_file=$log_dir/plot_climo_jobs.txt
+rm -f $plot_climo_job_file
+
 n_test_cases=$((n_cases-1))
 j=0
 while [ $j -lt $n_test_cases ]; do
@@ -228,11 +272,19 @@ while [ $j -lt $n_test_cases ]; do
 			          $ref_scratch_dir \
 			          $ref_case \
 			          $ref_begin_yr_climo \
-			          $ref_end_yr_climo
+			          $ref_end_yr_climo \
+			          $plot_climo_job_file
 
    j=$((j+1))
 done
 
+python python/plot_climo_batch.py --n_workers ${plot_climo_n_workers:-0} $plot_climo_job_file
+exstatus=$?
+if [ $exstatus -ne 0 ]; then
+  echo
+  echo "Failed plotting some climatologies, see $log_dir/plot_climo*.log"
+fi
+
 
 # TIME TRENDS        
 
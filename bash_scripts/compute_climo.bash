@@ -12,6 +12,10 @@ casename=$2
 compute_climo_var_list_file=$3
 begin_yr=$4
 end_yr=$5
+# Optional: if native_res is given, climatologies are remapped in memory to the
+# interp_grid of each variable and only the remapped files are written (plus
+# the native grid files if fuse_climo_write_native=1)
+native_res=$6
 
 # Read in variable list for  diagnostics e.g FLUT, FSNT etc.
 source $compute_climo_var_list_file
@@ -24,43 +28,126 @@ n_seasons=${#begin_month_set[@]}
 # Create Climatology of supplied fields
 if [ "$casename" != "obs" ]; then
 
+  get_climo_paths() {
+     var="${var_set[$1]}"
+     interp_grid="${interp_grid_set[$1]}"
+     interp_method="${interp_method_set[$1]}"
+     season_name="${season_name_set[$2]}"
+
+     regrid_wgt_file="$remap_files_dir/$native_res-to-$interp_grid.conservative.wgts.nc"
+
+     infile=$scratch_dir/$casename.cam.h0.$var.$begin_yr-$end_yr.nc
+     outfile=$scratch_dir/${casename}_${season_name}_climo.$var.$begin_yr-$end_yr.nc
+
+     if [ -n "$native_res" ]; then
+	outfile=$scratch_dir/${casename}_${season_name}_climo.${interp_grid}_$interp_method.$var.$begin_yr-$end_yr.nc
+     fi
+  }
+
+  # Climatologies missing or out of date in the scratch cache, checked for
+  # all variables and seasons by one python process
+  check_list=""
+
+  i=0
+  while [ $i -lt ${#var_set[@]} ]; do
+     ns=0
+     while [ $ns -lt $n_seasons ]; do
+	get_climo_paths $i $ns
+
+	params="--param begin_month=${begin_month_set[$ns]} --param end_month=${end_month_set[$ns]}"
+
+	if [ -n "$native_res" ]; then
+		check_list="$check_list--stage climo_remap --output $outfile $params $infile $regrid_wgt_file"$'\n'
+	else
+		check_list="$check_list--stage climo --output $outfile $params $infile"$'\n'
+	fi
+
+        ns=$((ns+1))
+     done
+
+     i=$((i+1))
+  done
+
+  stale_list=$(printf "%s" "$check_list" | python python/scratch_cache.py check-many)
+  if [ $? -ne 0 ]; then
+    echo
+    echo "Failed checking the climatologies in the scratch cache"
+    exit 1
+  fi
+
+  declare -A stale_climo
+  while read -r outfile; do
+     if [ -n "$outfile" ]; then
+	stale_climo[$outfile]=1
+     fi
+  done <<< "$stale_list"
+
   i=0
   while [ $i -lt ${#var_set[@]} ]; do
      var="${var_set[$i]}"
+     interp_grid="${interp_grid_set[$i]}"
+     interp_method="${interp_method_set[$i]}"
      echo
      echo "$casename $var"
      echo
 
-     ns=0
-     while [ $ns -lt $n_seasons ]; do
-	begin_month=${begin_month_set[$ns]}
-	end_month=${end_month_set[$ns]}
-	season_name="${season_name_set[$ns]}"
+     remap_opt=""
+     if [ -n "$native_res" ]; then
+	regrid_wgt_file="$remap_files_dir/$native_res-to-$interp_grid.conservative.wgts.nc"
+	remap_opt="--wgt_file $regrid_wgt_file --interp_grid $interp_grid --interp_method $interp_method"
+	remap_opt="$remap_opt --remap_cache_dir ${remap_cache_dir:-$scratch_dir/remap_cache}"
 
-	outfile=$scratch_dir/${casename}_${season_name}_climo.$var.$begin_yr-$end_yr.nc
+	if [ ${fuse_climo_write_native:-0} -eq 1 ]; then
+		remap_opt="$remap_opt --write_native"
+	fi
+     fi
 
-	if [ -f $outfile ]; then 
-		echo "file $outfile exists! Not computing climatology."
-	else
+     # Collect the seasons whose climatology is missing or out of date,
+     # so that create_climatology.py reads the field once for all of them
+     begin_month_list=()
+     end_month_list=()
 
-		python python/create_climatology.py --indir $scratch_dir \
-						    -c $casename \
-						    -f $var \
-						    --begin_month $begin_month \
-						    --end_month $end_month \
-						    --begin_yr $begin_yr \
-						    --end_yr $end_yr >& $log_dir/climo_${casename}_${var}_${season_name}_years$begin_yr-$end_yr.log &
-                exstatus=$?
-                if [ $exstatus -ne 0 ]; then
-                  echo
-                  echo "Failed computing climatologies for season $ns"
-                  exit 1
-                fi
+     ns=0
+     while [ $ns -lt $n_seasons ]; do
+	get_climo_paths $i $ns
 
+	if [ -z "${stale_climo[$outfile]}" ]; then
+		echo "Not computing climatology."
+	else
+		begin_month_list=("${begin_month_list[@]}" ${begin_month_set[$ns]})
+		end_month_list=("${end_month_list[@]}" ${end_month_set[$ns]})
 	fi
 
         ns=$((ns+1))
      done
+
+     if [ ${#begin_month_list[@]} -gt 0 ]; then
+	incremental_opt=""
+	if [ ${incremental_update:-0} -eq 1 ]; then
+		incremental_opt="--incremental"
+	fi
+
+	begin_months=$(IFS=,; echo "${begin_month_list[*]}")
+	end_months=$(IFS=,; echo "${end_month_list[*]}")
+
+	python python/create_climatology.py --indir $scratch_dir \
+					    -c $casename \
+					    -f $var \
+					    --begin_month $begin_months \
+					    --end_month $end_months \
+					    --begin_yr $begin_yr \
+					    --end_yr $end_yr \
+					    --max_memory_mb ${climo_max_memory_mb:-0} \
+					    $remap_opt \
+					    $incremental_opt >& $log_dir/climo_${casename}_${var}_years$begin_yr-$end_yr.log &
+        exstatus=$?
+        if [ $exstatus -ne 0 ]; then
+          echo
+          echo "Failed computing climatologies for $var"
+          exit 1
+        fi
+     fi
+
      i=$((i+1))
   done
 fi
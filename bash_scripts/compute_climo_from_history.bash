@@ -0,0 +1,71 @@
+#!/bin/bash
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+# 
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+
+# Computes climatologies directly from the monthly history files in a single
+# sweep for all variables, without condensing each field first.
+
+archive_dir=$1
+scratch_dir=$2
+casename=$3
+compute_climo_var_list_file=$4
+begin_yr=$5
+end_yr=$6
+
+# Read in variable list for  diagnostics e.g FLUT, FSNT etc.
+source $compute_climo_var_list_file
+n_var=${#var_set[@]}
+
+# Read in list of seasons for which diagnostics are being computed
+source $log_dir/season_info.temp
+n_seasons=${#begin_month_set[@]}
+
+# Create Climatology of supplied fields
+if [ "$casename" != "obs" ]; then
+
+  # create_climatology_from_history.py skips the variables whose climatology
+  # files are up to date in the scratch cache manifest
+  var_list=("${var_set[@]}")
+
+  if [ ${#var_list[@]} -eq 0 ]; then
+	echo "No variables to compute climatologies for."
+  else
+	echo
+	echo "$casename ${var_list[@]}"
+	echo
+
+	incremental_opt=""
+	if [ ${incremental_update:-0} -eq 1 ]; then
+		incremental_opt="--incremental"
+	fi
+
+	vars=$(IFS=,; echo "${var_list[*]}")
+	begin_months=$(IFS=,; echo "${begin_month_set[*]}")
+	end_months=$(IFS=,; echo "${end_month_set[*]}")
+
+	python python/create_climatology_from_history.py --archive_dir $archive_dir \
+							 --outdir $scratch_dir \
+							 -c $casename \
+							 --var_list $vars \
+							 --begin_month $begin_months \
+							 --end_month $end_months \
+							 --begin_yr $begin_yr \
+							 --end_yr $end_yr \
+							 --max_memory_mb ${climo_max_memory_mb:-0} \
+							 $incremental_opt >& $log_dir/climo_${casename}_from_history_years$begin_yr-$end_yr.log
+        exstatus=$?
+        if [ $exstatus -ne 0 ]; then
+          echo
+          echo "Failed computing climatologies from history files"
+          exit 1
+        fi
+  fi
+fi
+
+echo "...Done."
+echo
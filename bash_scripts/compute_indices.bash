@@ -73,7 +73,8 @@ for ((i=0; i<$n_index; i++)); do
 							--index_name ${index_name[@]} \
 							--no_ann 1 \
 							--stdize 0 \
-							--write_netcdf 1 >& $log_dir/compute_index_${case}_$index_name.log &
+							--write_netcdf 1 \
+							--incremental ${incremental_update:-0} >& $log_dir/compute_index_${case}_$index_name.log &
        exstatus=$?
        if [ $exstatus -ne 0 ]; then
          echo
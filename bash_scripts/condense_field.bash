@@ -20,6 +20,8 @@ else
   end_yr=$6
 fi
 
+scratch_cache="python $PWD/python/scratch_cache.py"
+
 cd $archive_dir
 
 file_list=()
@@ -38,17 +40,43 @@ echo "condensing $field_name"
 echo
 
 outfile=$scratch_dir/$casename.cam.h0.$field_name.$begin_yr-$end_yr.nc
-if [ -f $outfile ]; then
-	echo "file $outfile exists! Not condensing."
+temp_outfile=$outfile.tmp$$
+
+# Variables copied, coordinate variables of the dimensions of $field_name
+# (e.g. lev) included as by ncrcat, listed as in python/condense_fields.py
+# so that both record the same cache key
+header=`ncdump -h ${file_list[0]}`
+dims=`echo "$header" | sed -n "s/^\s*[a-z0-9]* $field_name(\(.*\)) ;$/\1/p" | tr -d ' ' | tr ',' ' '`
+
+vars=date,time,lat,lon,area
+for dim in $dims; do
+   if [[ ",$vars," != *",$dim,"* ]] && echo "$header" | grep -q "^\s*[a-z0-9]* $dim(.*) ;$"; then
+      vars=$vars,$dim
+   fi
+done
+vars=$vars,$field_name
+
+if $scratch_cache check --stage condense \
+		       --output $outfile \
+		       --param vars=$vars \
+		       ${file_list[@]}; then
+	echo "Not condensing."
 else
-	ncrcat -O -v date,time,lat,lon,area,$field_name ${file_list[@]} $outfile
+	ncrcat -O -v date,time,lat,lon,area,$field_name ${file_list[@]} $temp_outfile
 
 	if [ $? -ne 0 ]; then
 	  echo
 	  echo "Could not condense $field_name into one file. Exiting!"
+	  rm -f $temp_outfile
 	  exit
 	fi
 
+	mv $temp_outfile $outfile
+
+	$scratch_cache record --stage condense \
+			      --output $outfile \
+			      --param vars=$vars \
+			      ${file_list[@]}
 fi
 
 cd -
@@ -24,29 +24,33 @@ echo
 echo "Condensing $casename fields:"
 echo "${var_set[@]}"
 echo
-echo "Log files in $log_dir/condense_field_${casename}...log"
+echo "Log file in $log_dir/condense_field_${casename}.$begin_yr-$end_yr.log"
 echo
 
-i=0
-while [ $i -lt ${#var_set[@]} ]; do
-   var="${var_set[$i]}"
-   echo "$var"
+# condense_fields.py reads each history file once per group of variables,
+# with at most $condense_n_procs groups processed in parallel, and skips the
+# variables whose condensed files are up to date in the scratch cache.
+var_list=("${var_set[@]}")
 
-   outfile=$scratch_dir/$casename.cam.h0.$var.$begin_yr-$end_yr.nc
-
-   if [ -f $outfile ]; then
-	echo "file $outfile exists! Not condensing."
-   else
-
-   ./bash_scripts/condense_field.bash $archive_dir \
-                                      $scratch_dir \
-                                      $casename \
-                                      $var \
-                                      $begin_yr \
-                                      $end_yr >& $log_dir/condense_field_${casename}_$var.$begin_yr-$end_yr.log &
+if [ ${#var_list[@]} -gt 0 ]; then
+   incremental_opt=""
+   if [ ${incremental_update:-0} -eq 1 ]; then
+     incremental_opt="--incremental"
    fi
 
-   i=$((i+1))
-done
+   vars=$(IFS=,; echo "${var_list[*]}")
+
+   python python/condense_fields.py --archive_dir $archive_dir \
+				    --outdir $scratch_dir \
+				    -c $casename \
+				    --var_list $vars \
+				    --begin_yr $begin_yr \
+				    --end_yr $end_yr \
+				    --n_procs ${condense_n_procs:-4} \
+				    $incremental_opt >& $log_dir/condense_field_${casename}.$begin_yr-$end_yr.log
 
-wait
+   if [ $? -ne 0 ]; then
+     echo
+     echo "Could not condense all of ${var_list[@]}. See log file."
+   fi
+fi
@@ -42,6 +42,18 @@ end_yr=`echo $end_yr_climo | awk '{printf "%04d",$1}'`
 
 cd $plots_dir
 
+# Plots of a-prime are written in $plot_format, with <plot>_thumb.png
+# thumbnails if plot_thumbnail_width > 0 (see python/save_plot.py)
+plot_ext=${plot_format:-png}
+
+plot_link() {
+  if [ "${plot_thumbnail_width:-0}" -gt 0 ]; then
+    echo "<A HREF=\"$1.$plot_ext\"><IMG SRC=\"$1_thumb.png\"></a>"
+  else
+    echo "<A HREF=\"$1.$plot_ext\">plot</a>"
+  fi
+}
+
 # Setting up text for ref case
 if [ "$ref_case" == "obs" ]; then
   ref_case_text="$ref_case (climo)" 
@@ -179,7 +191,7 @@ EOF
 
           cat >> index.html << EOF
 		<TR>
-		  <TH ALIGN=LEFT><A HREF="${casename}_${var}_ANN_reg_ts.png">$var</a> 
+		  <TH ALIGN=LEFT><A HREF="${casename}_${var}_ANN_reg_ts.$plot_ext">$var</a> 
 		  <TD ALIGN=LEFT>${var_name_set[$j]}
 EOF
         fi
@@ -332,9 +344,9 @@ EOF
 		<TR>
 		  <TH ALIGN=LEFT>$var 
 		  <TD ALIGN=LEFT>${var_name_set[$j]}
-		  <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_climo_DJF.png">plot</a>
-		  <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_climo_JJA.png">plot</a>
-		  <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_climo_ANN.png">plot</a>
+		  <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_climo_DJF")
+		  <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_climo_JJA")
+		  <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_climo_ANN")
 EOF
         fi
         j=$((j + 1))
@@ -375,7 +387,7 @@ if [ $generate_atm_enso_diags -eq 1 ]; then
   <font color=green size=+1><b>Equatorial SOI Index</b></font><br>
   <TABLE>
         <TR>
-          <TH ALIGN=LEFT><A HREF="${casename}_PSL_ANN_EQSOI.png">EQSOI</a> 
+          <TH ALIGN=LEFT><A HREF="${casename}_PSL_ANN_EQSOI.$plot_ext">EQSOI</a> 
         <TR>
           <TD><BR>
   </TABLE>
@@ -385,7 +397,7 @@ if [ $generate_atm_enso_diags -eq 1 ]; then
   <font color=green size=+1><b>NINO Index</b></font><br>
   <TABLE>
         <TR>
-          <TH ALIGN=LEFT><A HREF="${casename}_TS_ANN_NINO.png">Nino3, Nino3.4, Nino4</a> 
+          <TH ALIGN=LEFT><A HREF="${casename}_TS_ANN_NINO.$plot_ext">Nino3, Nino3.4, Nino4</a> 
         <TR>
           <TD><BR>
   </TABLE>
@@ -395,7 +407,7 @@ if [ $generate_atm_enso_diags -eq 1 ]; then
   <font color=green size=+1><b>EQSOI and Nino3.4 Index</b></font><br>
   <TABLE>
         <TR>
-          <TH ALIGN=LEFT><A HREF="${casename}_ANN_EQSOI_Nino3.4.png">EQSOI, Nino 3.4</a> 
+          <TH ALIGN=LEFT><A HREF="${casename}_ANN_EQSOI_Nino3.4.$plot_ext">EQSOI, Nino 3.4</a> 
         <TR>
           <TD><BR>
   </TABLE>
@@ -405,7 +417,7 @@ if [ $generate_atm_enso_diags -eq 1 ]; then
   <font color=green size=+1><b>ENSO Seasonality</b></font><br>
   <TABLE>
         <TR>
-          <TH ALIGN=LEFT><A HREF="${casename}_TS_seasonality_NINO.png">Nino3, Nino3.4, Nino4</a> 
+          <TH ALIGN=LEFT><A HREF="${casename}_TS_seasonality_NINO.$plot_ext">Nino3, Nino3.4, Nino4</a> 
         <TR>
           <TD><BR>
   </TABLE>
@@ -484,9 +496,9 @@ EOF
                         <TR>
                           <TH ALIGN=LEFT>$var 
                           <TD ALIGN=LEFT>${var_name_set[$i]}
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_DJF.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_JJA.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_ANN.png">plot</a>
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_DJF")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_JJA")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_meridional_avg_Tropical_Pacific_ANN")
 EOF
                 fi
                 i=$((i+1))
@@ -559,7 +571,7 @@ EOF
                                 <TR>
                                   <TH ALIGN=LEFT>$var 
                                   <TD ALIGN=LEFT>${var_name_set[$i]}
-                                  <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_feedback_${var}_Nino4_ANN_TS_Nino3_ANN.png">plot</a>
+                                  <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_feedback_${var}_Nino4_ANN_TS_Nino3_ANN")
 EOF
                         fi
                         i=$((i+1))
@@ -633,7 +645,7 @@ EOF
                                 <TR>
                                   <TH ALIGN=LEFT>$var 
                                   <TD ALIGN=LEFT>${var_name_set[$i]}
-                                  <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_feedback_${var}_Nino3_ANN_TS_Nino3_ANN.png">plot</a>
+                                  <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_feedback_${var}_Nino3_ANN_TS_Nino3_ANN")
 EOF
                         fi
                         i=$((i+1))
@@ -708,9 +720,9 @@ EOF
                         <TR>
                           <TH ALIGN=LEFT>$var 
                           <TD ALIGN=LEFT>${var_name_set[$i]}
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_DJF.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_JJA.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_ANN.png">plot</a>
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_DJF")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_JJA")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}-${ref_casename_plot}_${var}_stddev_Greater_Tropical_Pacific_ANN")
 EOF
 		fi
 		i=$((i+1))
@@ -776,9 +788,9 @@ EOF
                         <TR>
                           <TH ALIGN=LEFT>$var 
                           <TD ALIGN=LEFT>${var_name_set[$i]}
-                          <TD ALIGN=LEFT><A HREF="${casename}_regr_${var}_global_DJF_TS_Nino3_DJF.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}_regr_${var}_global_JJA_TS_Nino3_JJA.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}_regr_${var}_global_ANN_TS_Nino3_ANN.png">plot</a>
+                          <TD ALIGN=LEFT>$(plot_link "${casename}_regr_${var}_global_DJF_TS_Nino3_DJF")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}_regr_${var}_global_JJA_TS_Nino3_JJA")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}_regr_${var}_global_ANN_TS_Nino3_ANN")
 EOF
 		fi
 		i=$((i+1))
@@ -843,8 +855,8 @@ EOF
                         <TR>
                           <TH ALIGN=LEFT>$var 
                           <TD ALIGN=LEFT>${var_name_set[$i]}
-                          <TD ALIGN=LEFT><A HREF="${casename}_ENSO_evolution_regr_${var}_global_ANN_TS_Nino3.4_ANN.png">plot</a>
-                          <TD ALIGN=LEFT><A HREF="${casename}_ENSO_evolution_corr_${var}_global_ANN_TS_Nino3.4_ANN.png">plot</a>
+                          <TD ALIGN=LEFT>$(plot_link "${casename}_ENSO_evolution_regr_${var}_global_ANN_TS_Nino3.4_ANN")
+                          <TD ALIGN=LEFT>$(plot_link "${casename}_ENSO_evolution_corr_${var}_global_ANN_TS_Nino3.4_ANN")
 EOF
 		fi
 		i=$((i+1))
@@ -15,6 +15,9 @@ ref_scratch_dir=$5
 ref_case=$6
 ref_begin_yr=$7
 ref_end_yr=$8
+# Optional: file to append the plot jobs to, for the caller to plot all cases
+# with one python/plot_climo_batch.py run. Jobs are plotted here otherwise.
+plot_job_file=$9
 
 # Read in variable list for plotting climatologies  diagnostics
 if [ "$ref_case" == "obs" ]; then
@@ -29,7 +32,14 @@ n_var=${#var_set[@]}
 source $log_dir/season_info.temp
 n_seasons=${#begin_month_set[@]}
 
-# Generate plots for each field and season
+if [ "$plot_job_file" == "" ]; then
+  job_file=$log_dir/plot_climo_jobs_$casename.txt
+  rm -f $job_file
+else
+  job_file=$plot_job_file
+fi
+
+# Generate plot jobs for each field and season
 k=0
 while [ $k -lt $n_var ]; do
 
@@ -58,64 +68,45 @@ while [ $k -lt $n_var ]; do
       season_name="${season_name_set[$ns]}"
 
       if [ "$var" == "TAU" ]; then
-        python python/plot_climo_vector.py \
-			--indir $scratch_dir \
-			-c $casename \
-			-f $var \
-			--begin_month $begin_month \
-			--end_month $end_month \
-			--begin_yr $begin_yr \
-			--end_yr $end_yr \
-			--interp_grid $interp_grid \
-			--interp_method $interp_method \
-			--ref_case_dir $ref_scratch_dir \
-			--ref_case $ref_casename \
-			--ref_begin_yr $ref_begin_yr \
-			--ref_end_yr $ref_end_yr \
-			--ref_interp_grid $ref_interp_grid \
-			--ref_interp_method $ref_interp_method \
-			--plots_dir $plots_dir >& $log_dir/plot_climo_$casename-$ref_casename.$var.$season_name.log &
-        exstatus=$?
-        if [ $exstatus -ne 0 ]; then
-          echo
-          echo "Failed plotting $var climatology"
-          exit 1
-        fi
-
+        plot_script=plot_climo_vector.py
       else
-        python python/plot_climo.py \
-			--indir $scratch_dir \
-			-c $casename \
-			-f $var \
-			--begin_month $begin_month \
-			--end_month $end_month \
-			--begin_yr $begin_yr \
-			--end_yr $end_yr \
-			--interp_grid $interp_grid \
-			--interp_method $interp_method \
-			--ref_case_dir $ref_scratch_dir \
-			--ref_case $ref_casename \
-			--ref_begin_yr $ref_begin_yr \
-			--ref_end_yr $ref_end_yr \
-			--ref_interp_grid $ref_interp_grid \
-			--ref_interp_method $ref_interp_method \
-			--plots_dir $plots_dir >& $log_dir/plot_climo_$casename-$ref_casename.$var.$season_name.log &
-        exstatus=$?
-        if [ $exstatus -ne 0 ]; then
-          echo
-          echo "Failed plotting $var climatology"
-          exit 1
-        fi
+        plot_script=plot_climo.py
       fi
 
+      echo "$plot_script $log_dir/plot_climo_$casename-$ref_casename.$var.$season_name.log \
+	--indir $scratch_dir \
+	-c $casename \
+	-f $var \
+	--begin_month $begin_month \
+	--end_month $end_month \
+	--begin_yr $begin_yr \
+	--end_yr $end_yr \
+	--interp_grid $interp_grid \
+	--interp_method $interp_method \
+	--ref_case_dir $ref_scratch_dir \
+	--ref_case $ref_casename \
+	--ref_begin_yr $ref_begin_yr \
+	--ref_end_yr $ref_end_yr \
+	--ref_interp_grid $ref_interp_grid \
+	--ref_interp_method $ref_interp_method \
+	--plots_dir $plots_dir" >> $job_file
+
       ns=$((ns+1))
    done
 
    k=$((k+1))
 done
 
-echo
-echo "Waiting for jobs to complete ..."
-echo
+if [ "$plot_job_file" == "" ]; then
+  echo
+  echo "Plotting climatologies from $job_file ..."
+  echo
 
-wait
+  python python/plot_climo_batch.py --n_workers ${plot_climo_n_workers:-0} $job_file
+  exstatus=$?
+  if [ $exstatus -ne 0 ]; then
+    echo
+    echo "Failed plotting climatologies, see $log_dir/plot_climo_$casename-$ref_casename.*.log"
+    exit 1
+  fi
+fi
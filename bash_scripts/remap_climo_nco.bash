@@ -22,11 +22,55 @@ n_var=${#var_set[@]}
 source $log_dir/season_info.temp
 n_seasons=${#begin_month_set[@]}
 
-# Remap climos using ncremap
+# Remap climos using python/remap_files.py (remap_engine=python), which loads
+# each weights file once for all variables and seasons sharing it, or ncremap
 if [ "$casename" != "obs" ]; then
 
+  scratch_cache="python $PWD/python/scratch_cache.py"
+  remap_files="python $PWD/python/remap_files.py"
+
+  declare -A remap_infiles
+  declare -A remap_outfiles
+
   cd $scratch_dir
 
+  # Remapped climatologies missing or out of date in the scratch cache,
+  # checked for all variables and seasons by one python process
+  check_list=""
+
+  k=0
+  while [ $k -lt $n_var ]; do
+     var="${var_set[$k]}"
+     regrid_wgt_file="$remap_files_dir/$native_res-to-${interp_grid_set[$k]}.conservative.wgts.nc"
+
+     ns=0
+     while [ $ns -lt $n_seasons ]; do
+        season_name="${season_name_set[$ns]}"
+        climo_file="${casename}_${season_name}_climo.$var.$begin_yr-$end_yr.nc"
+        interp_climo_file="${casename}_${season_name}_climo.${interp_grid_set[$k]}_${interp_method_set[$k]}.$var.$begin_yr-$end_yr.nc"
+
+        check_list="$check_list--stage remap_climo --output $interp_climo_file $climo_file $regrid_wgt_file"$'\n'
+
+        ns=$((ns+1))
+     done
+
+     k=$((k+1))
+  done
+
+  stale_list=$(printf "%s" "$check_list" | $scratch_cache check-many)
+  if [ $? -ne 0 ]; then
+    echo
+    echo "Failed checking the remapped climatologies in the scratch cache"
+    exit 1
+  fi
+
+  declare -A stale_interp_climo
+  while read -r interp_climo_file; do
+     if [ -n "$interp_climo_file" ]; then
+	stale_interp_climo[$interp_climo_file]=1
+     fi
+  done <<< "$stale_list"
+
   k=0
   while [ $k -lt $n_var ]; do
      var="${var_set[$k]}"
@@ -44,15 +88,24 @@ if [ "$casename" != "obs" ]; then
         climo_file="${casename}_${season_name}_climo.$var.$begin_yr-$end_yr.nc"
         interp_climo_file="${casename}_${season_name}_climo.${interp_grid}_$interp_method.$var.$begin_yr-$end_yr.nc"
 
-	if [ -f $interp_climo_file ]; then
-		echo "file $interp_climo_file exists! Not remapping."
+	if [ -z "${stale_interp_climo[$interp_climo_file]}" ]; then
+		echo "Not remapping."
+	elif [ "${remap_engine:-python}" == "python" ]; then
+		remap_infiles[$regrid_wgt_file]="${remap_infiles[$regrid_wgt_file]},$climo_file"
+		remap_outfiles[$regrid_wgt_file]="${remap_outfiles[$regrid_wgt_file]},$interp_climo_file"
 	else
+		# Remap to a temporary file, renamed and recorded in the cache once complete
+		temp_interp_climo_file="${interp_climo_file%.nc}.tmp$$.nc"
 
-		ncremap -I $scratch_dir \
+		(ncremap -I $scratch_dir \
 			-i $climo_file \
 			-m $regrid_wgt_file \
 			-O $scratch_dir \
-			-o $interp_climo_file >& $log_dir/remap_climo_${casename}_${var}_${season_name}_years$begin_yr-$end_yr.log &
+			-o $temp_interp_climo_file && \
+		 mv $temp_interp_climo_file $interp_climo_file && \
+		 $scratch_cache record --stage remap_climo \
+				      --output $interp_climo_file \
+				      $climo_file $regrid_wgt_file) >& $log_dir/remap_climo_${casename}_${var}_${season_name}_years$begin_yr-$end_yr.log &
 
 	fi
 
@@ -62,6 +115,17 @@ if [ "$casename" != "obs" ]; then
      k=$((k+1))
   done
 
+  for regrid_wgt_file in "${!remap_infiles[@]}"; do
+     wgt_name=`basename $regrid_wgt_file .wgts.nc`
+
+     $remap_files --wgt_file $regrid_wgt_file \
+		  -I $scratch_dir \
+		  --infiles ${remap_infiles[$regrid_wgt_file]#,} \
+		  --outfiles ${remap_outfiles[$regrid_wgt_file]#,} \
+		  --cache_dir ${remap_cache_dir:-$scratch_dir/remap_cache} \
+		  --stage remap_climo >& $log_dir/remap_climo_${casename}_${wgt_name}_years$begin_yr-$end_yr.log &
+  done
+
   cd -
 fi
 
@@ -18,11 +18,49 @@ ts_remap_var_list_file=$6
 source $ts_remap_var_list_file
 n_var=${#var_set[@]}
 
-# Remap files using ncremap
+# Remap files using python/remap_files.py (remap_engine=python), which loads
+# each weights file once for all variables sharing it, or ncremap
 if [ "$casename" != "obs" ]; then
 
+  scratch_cache="python $PWD/python/scratch_cache.py"
+  remap_files="python $PWD/python/remap_files.py"
+
+  declare -A remap_infiles
+  declare -A remap_outfiles
+
   cd $scratch_dir
 
+  # Remapped time series missing or out of date in the scratch cache,
+  # checked for all variables by one python process
+  check_list=""
+
+  i=0
+  while [ $i -lt $n_var ]; do
+     var="${var_set[$i]}"
+     regrid_wgt_file="$remap_files_dir/$native_res-to-${interp_grid_set[$i]}.conservative.wgts.nc"
+
+     ts_file="${casename}.cam.h0.$var.$begin_yr-$end_yr.nc"
+     interp_ts_file="${casename}.cam.h0.${interp_grid_set[$i]}_${interp_method_set[$i]}.$var.$begin_yr-$end_yr.nc"
+
+     check_list="$check_list--stage remap_ts --output $interp_ts_file $ts_file $regrid_wgt_file"$'\n'
+
+     i=$((i+1))
+  done
+
+  stale_list=$(printf "%s" "$check_list" | $scratch_cache check-many)
+  if [ $? -ne 0 ]; then
+    echo
+    echo "Failed checking the remapped time series in the scratch cache"
+    exit 1
+  fi
+
+  declare -A stale_interp_ts
+  while read -r interp_ts_file; do
+     if [ -n "$interp_ts_file" ]; then
+	stale_interp_ts[$interp_ts_file]=1
+     fi
+  done <<< "$stale_list"
+
   i=0
   while [ $i -lt $n_var ]; do
      var="${var_set[$i]}"
@@ -37,19 +75,40 @@ if [ "$casename" != "obs" ]; then
      ts_file="${casename}.cam.h0.$var.$begin_yr-$end_yr.nc"
      interp_ts_file="${casename}.cam.h0.${interp_grid}_$interp_method.$var.$begin_yr-$end_yr.nc"
 
-     if [ -f $interp_ts_file ]; then
-	echo "file $interp_ts_file exists! Not remapping"
+     if [ -z "${stale_interp_ts[$interp_ts_file]}" ]; then
+	echo "Not remapping"
+     elif [ "${remap_engine:-python}" == "python" ]; then
+	     remap_infiles[$regrid_wgt_file]="${remap_infiles[$regrid_wgt_file]},$ts_file"
+	     remap_outfiles[$regrid_wgt_file]="${remap_outfiles[$regrid_wgt_file]},$interp_ts_file"
      else
-	     ncremap -I $scratch_dir \
+	     # Remap to a temporary file, renamed and recorded in the cache once complete
+	     temp_interp_ts_file="${interp_ts_file%.nc}.tmp$$.nc"
+
+	     (ncremap -I $scratch_dir \
 		     -i $ts_file \
 		     -m $regrid_wgt_file \
 		     -O $scratch_dir \
-		     -o $interp_ts_file >& $log_dir/remap_time_series_${casename}_${var}_years$begin_yr-$end_yr.log &
+		     -o $temp_interp_ts_file && \
+	      mv $temp_interp_ts_file $interp_ts_file && \
+	      $scratch_cache record --stage remap_ts \
+				   --output $interp_ts_file \
+				   $ts_file $regrid_wgt_file) >& $log_dir/remap_time_series_${casename}_${var}_years$begin_yr-$end_yr.log &
      fi
 
      i=$((i+1))
   done
 
+  for regrid_wgt_file in "${!remap_infiles[@]}"; do
+     wgt_name=`basename $regrid_wgt_file .wgts.nc`
+
+     $remap_files --wgt_file $regrid_wgt_file \
+		  -I $scratch_dir \
+		  --infiles ${remap_infiles[$regrid_wgt_file]#,} \
+		  --outfiles ${remap_outfiles[$regrid_wgt_file]#,} \
+		  --cache_dir ${remap_cache_dir:-$scratch_dir/remap_cache} \
+		  --stage remap_ts >& $log_dir/remap_time_series_${casename}_${wgt_name}_years$begin_yr-$end_yr.log &
+  done
+
   cd -
 fi
 
@@ -8,6 +8,14 @@
 # to compute mean (aggregates) of time series data at different intervals,
 # for e.g. to compute annual mean from daily timeseries data.
 
+#
+# The time series is reshaped to (n_aggregates, aggregate_size, ...) and
+# reduced with the weights in one tensordot over the second axis. Masked
+# values are left out of both the weighted sum and the sum of weights of
+# their aggregate (aggregates without valid values are masked). Trailing
+# time steps that do not fill a whole aggregate (e.g. a partial season at
+# the end of the series) are left out.
+
 import numpy
 
 def aggregate_time_series_data(data, aggregate_size, wgts, debug = False):
@@ -20,16 +28,30 @@ def aggregate_time_series_data(data, aggregate_size, wgts, debug = False):
 
     print __name__, 'agg_shape: ', agg_shape
 
-    aggregate_data = numpy.ma.zeros((agg_shape))
-    print "aggregate_data.shape: ", aggregate_data.shape
+    if n_aggregates * aggregate_size < nt:
+        print __name__, 'Leaving out last partial aggregate of ', nt - n_aggregates * aggregate_size, ' time steps'
+
+    reshape_size = (n_aggregates, aggregate_size) + data.shape[1:]
+
+    mask = numpy.ma.getmask(data)
 
-    if data.ndim == 1:
-        for i in range(0, n_aggregates):
-            aggregate_data[i] = numpy.ma.average(data[i*aggregate_size:(i+1) * aggregate_size], axis = 0, weights = wgts)
+    data_reshape = numpy.ma.getdata(data)[0:n_aggregates * aggregate_size].reshape(reshape_size)
+
+    wgts = numpy.ones(aggregate_size) * numpy.asarray(wgts, dtype = numpy.float64)
+
+    if mask is numpy.ma.nomask:
+        aggregate_data = numpy.tensordot(wgts, data_reshape, axes = ([0], [1])) / numpy.sum(wgts)
+
+        aggregate_data = numpy.ma.array(aggregate_data)
 
     else:
-        for i in range(0, n_aggregates):
-            aggregate_data[i, ::] = numpy.ma.average(data[i*aggregate_size:(i+1) * aggregate_size, ::], axis = 0, weights = wgts)
+        mask_reshape = mask[0:n_aggregates * aggregate_size].reshape(reshape_size)
+
+        wgts_sum = numpy.tensordot(wgts, numpy.where(mask_reshape, 0.0, data_reshape), axes = ([0], [1]))
+        wgts_norm = numpy.tensordot(wgts, numpy.logical_not(mask_reshape).astype(numpy.float64), axes = ([0], [1]))
+
+        with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+            aggregate_data = numpy.ma.masked_where(wgts_norm == 0, wgts_sum / wgts_norm)
 
     print "aggregate_data.shape: ", aggregate_data.shape
 
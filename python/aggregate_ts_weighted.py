@@ -7,6 +7,8 @@
 #
 import numpy
 
+from aggregate_time_series_data import aggregate_time_series_data
+
 def aggregate_ts_weighted(ts, bw, wgts = 1, debug = False):
  
     nt = ts.shape[0]
@@ -14,15 +16,14 @@ def aggregate_ts_weighted(ts, bw, wgts = 1, debug = False):
 
     if debug: print __name__, 'nyrs_ts: ', n_agg_ts
 
-    ts_reshape = numpy.reshape(ts, (n_agg_ts, bw))
-
-    if debug: print __name__, 'ts_reshape: ', ts_reshape
-
-    ts_reshape_wgted = wgts * ts_reshape
-
-    if debug: print __name__, 'ts_reshape_wgted: ', ts_reshape_wgted
+    #Weighted means over consecutive blocks of bw time steps, see aggregate_time_series_data
+    agg_ts = aggregate_time_series_data(data = ts,
+                                        aggregate_size = bw,
+                                        wgts = wgts,
+                                        debug = debug)
 
-    agg_ts = numpy.sum(ts_reshape_wgted, axis = 1)/numpy.sum(wgts)
+    if not numpy.ma.isMaskedArray(ts):
+        agg_ts = numpy.ma.filled(agg_ts, numpy.nan)
 
     if debug: print __name__, 'area_seasonal_avg: ', agg_ts
 
@@ -0,0 +1,150 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+#python script to measure the start-up time of the python entry points of
+#a-prime. Each script taking command line options is timed
+#
+#   - with --help, which returns once its options are parsed, before the
+#     plotting packages are imported (see e.g. plot_climo.py)
+#
+#   - importing everything a run of the script may import: its own imports
+#     and those of the a-prime modules it uses, including the deferred
+#     imports inside functions (matplotlib.pyplot, Basemap, scipy), i.e. the
+#     start-up time of a real run before it reads any data. sympy is left
+#     out: it is only imported for derived variables which are not linear
+#     combinations of variables, and none are defined (see
+#     get_derived_var_expr). Packages which are not installed are listed as
+#     missing.
+#
+#e.g. python benchmark_startup.py -n 5
+#     python benchmark_startup.py plot_climo.py plot_regress_index_field.py
+
+import ast
+import glob
+import os
+import subprocess
+import sys
+import time
+
+from optparse import OptionParser
+
+parser = OptionParser(usage = "python %prog [options] [scripts]")
+
+parser.add_option("-n", "--n_runs", dest = "n_runs", type = "int",
+                    help = "number of runs per script", default = 3)
+
+parser.add_option("--python", dest = "python",
+                    help = "python interpreter to run the scripts with", default = sys.executable)
+
+(options, args) = parser.parse_args()
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+if args:
+    scripts = [os.path.join(script_dir, os.path.basename(x)) for x in args]
+else:
+    scripts = []
+    for script in sorted(glob.glob(os.path.join(script_dir, '*.py'))):
+        if script == os.path.abspath(__file__):
+            continue
+        if 'parse_args' in open(script).read():
+            scripts.append(script)
+
+
+#Imported only by rare code paths, see above
+rare_imports = ['sympy']
+
+
+def get_import_statements(script, statements, seen):
+
+    #All import statements of script, at any level, and of the a-prime
+    #modules it imports
+    tree = ast.parse(open(script).read(), script)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules   = [x.name for x in node.names]
+            statement = 'import ' + ', '.join(modules)
+
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module != '__future__':
+            modules   = [node.module]
+            statement = 'from ' + node.module + ' import ' + ', '.join(x.name for x in node.names)
+
+        else:
+            continue
+
+        if any(module.split('.')[0] in rare_imports for module in modules):
+            continue
+
+        if statement not in statements:
+            statements.append(statement)
+
+        for module in modules:
+            module_file = os.path.join(script_dir, module.split('.')[0] + '.py')
+
+            if os.path.isfile(module_file) and module_file not in seen:
+                seen.add(module_file)
+                get_import_statements(module_file, statements, seen)
+
+    return statements
+
+
+def get_import_code(script):
+
+    statements = get_import_statements(script, [], set([script]))
+
+    #Missing packages are reported, not counted as failures
+    code = ['import sys', 'missing = []']
+
+    for statement in statements:
+        code.append('try:\n    ' + statement + '\nexcept ImportError as e:\n    missing.append(str(e).split()[-1])')
+
+    code.append('sys.stderr.write(" ".join(sorted(set(missing))))')
+
+    return '\n'.join(code)
+
+
+def time_command(command, env):
+
+    times = []
+
+    for i in range(options.n_runs):
+        t0 = time.time()
+        process = subprocess.Popen(command, cwd = script_dir, env = env,
+                                   stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        stdout, stderr = process.communicate()
+        times.append(time.time() - t0)
+
+    times.sort()
+    median = times[len(times)/2] if len(times) % 2 == 1 else 0.5 * (times[len(times)/2 - 1] + times[len(times)/2])
+
+    return median, times[0], times[-1], process.returncode, stderr
+
+
+#Backend set by the scripts before importing pyplot
+env = dict(os.environ)
+env['MPLBACKEND'] = 'Agg'
+
+print '%-50s %27s %27s' % ('', '--help (s)', 'all imports (s)')
+print '%-50s %8s %8s %8s  %8s %8s %8s' % ('script', 'median', 'min', 'max', 'median', 'min', 'max')
+
+for script in scripts:
+    help_times   = time_command([options.python, script, '--help'], env)
+    import_times = time_command([options.python, '-c', get_import_code(script)], env)
+
+    line = '%-50s ' % os.path.basename(script)
+
+    for median, t_min, t_max, status, stderr in [help_times, import_times]:
+        if status != 0:
+            line += ' %26s' % ('failed (exit status ' + str(status) + ')')
+        else:
+            line += ' %8.3f %8.3f %8.3f ' % (median, t_min, t_max)
+
+    if import_times[3] == 0 and import_times[4].strip():
+        line += ' missing: ' + import_times[4].strip()
+
+    print line
@@ -1,49 +1,82 @@
 #
 # Copyright (c) 2017, UT-BATTELLE, LLC
 # All rights reserved.
-# 
+#
 # This software is released under the BSD license detailed
 # in the LICENSE file in the top level a-prime directory
 #
 import numpy
 from round_to_first import round_to_first
 from round_to_first_given_range import round_to_first_given_range
+from get_field_stats import get_field_stats
+
+#Contour levels from the mean and standard deviation of a field. stats
+#(from get_field_stats) may be given if already computed, e.g. by
+#get_contour_levels; they are computed from field otherwise.
+
+def compute_contour_levels(field, n_stddev, num_levels, stats = None):
 
-def compute_contour_levels(field, n_stddev, num_levels):
+    if stats is None:
+        stats = get_field_stats(field)
 
-    if numpy.ma.min(field[:]) < 0 and numpy.ma.max(field[:]) > 0:
-        max_plot_temp = numpy.ma.mean(field) + n_stddev * numpy.ma.std(field)
-        range_plot = 2 * max_plot_temp 
+    if stats['min'] < 0 and stats['max'] > 0:
+        max_plot_temp = stats['mean'] + n_stddev * stats['std']
+        range_plot = 2 * max_plot_temp
         max_plot    = round_to_first_given_range(x = max_plot_temp, range_x = range_plot)
 
         print __name__, 'max_plot_temp: ', max_plot_temp
         print __name__, 'max_plot: ', max_plot
 
-        levels = numpy.linspace(-max_plot, max_plot, num = num_levels)    
+        levels = numpy.linspace(-max_plot, max_plot, num = num_levels)
 
     else:
-        max_plot_temp = numpy.ma.mean(field[:]) + \
-                  n_stddev * numpy.ma.std(field[:])
+        max_plot_temp = stats['mean'] + n_stddev * stats['std']
 
-        if max_plot_temp > numpy.ma.max(field[:]):
-            max_plot_temp = numpy.ma.max(field[:])
+        if max_plot_temp > stats['max']:
+            max_plot_temp = stats['max']
 
-        min_plot_temp = numpy.ma.mean(field[:]) - \
-                      n_stddev * numpy.ma.std(field[:])
+        min_plot_temp = stats['mean'] - n_stddev * stats['std']
 
-        if min_plot_temp < numpy.ma.min(field[:]):
-            min_plot_temp = numpy.ma.min(field[:])
+        if min_plot_temp < stats['min']:
+            min_plot_temp = stats['min']
 
         range_plot = max_plot_temp - min_plot_temp
 
         max_plot = round_to_first_given_range(max_plot_temp, range_x = range_plot)
         min_plot = round_to_first_given_range(min_plot_temp, range_x = range_plot)
-        
+
         print __name__, 'min_plot_temp, max_plot_temp: ', min_plot_temp, max_plot_temp
         print __name__, 'min_plot, max_plot: ', min_plot, max_plot
 
         levels = numpy.linspace(min_plot, max_plot, num = num_levels)
 
     print 'contour levels: ', levels
-    
+
+    return levels
+
+
+#Levels of the climatology plots (plot_climo): mean -/+ n_stddev standard
+#deviations, within the range of the field, rounded to the first digit
+
+def compute_climo_contour_levels(field, n_stddev, num_levels, stats = None):
+
+    if stats is None:
+        stats = get_field_stats(field)
+
+    max_plot_temp = stats['mean'] + n_stddev * stats['std']
+
+    if max_plot_temp > stats['max']:
+        max_plot_temp = stats['max']
+
+    max_plot = round_to_first(max_plot_temp)
+
+    min_plot_temp = stats['mean'] - n_stddev * stats['std']
+
+    if min_plot_temp < stats['min']:
+        min_plot_temp = stats['min']
+
+    min_plot = round_to_first(min_plot_temp)
+
+    levels = numpy.linspace(min_plot, max_plot, num = num_levels)
+
     return levels
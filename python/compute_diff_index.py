@@ -6,14 +6,6 @@
 # in the LICENSE file in the top level a-prime directory
 #
 
-import matplotlib as mpl
-#changing the default backend to agg to resolve contouring issue on rhea
-mpl.use('Agg')
-
-from mpl_toolkits.basemap import Basemap
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
-
 import numpy
 from netCDF4 import Dataset
 
@@ -134,7 +126,7 @@ def compute_diff_index   (archive_dir,
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -214,9 +206,6 @@ if __name__ == "__main__":
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
 
-    x = mpl.get_backend()
-    print 'backend: ', x
-
     compute_diff_index(archive_dir = archive_dir,
                        indir = indir,
                        casename = casename,
@@ -6,14 +6,6 @@
 # in the LICENSE file in the top level a-prime directory
 #
 
-import matplotlib as mpl
-#changing the default backend to agg to resolve contouring issue on rhea
-mpl.use('Agg')
-
-from mpl_toolkits.basemap import Basemap
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
-
 import numpy
 from netCDF4 import Dataset
 
@@ -28,6 +20,7 @@ from get_reg_avg_climo import get_reg_avg_climo
 from remove_seasonal_cycle_monthly_data import remove_seasonal_cycle_monthly_data
 from standardize_time_series import standardize_time_series
 from get_index_filename import get_index_filename
+from get_previous_file import get_previous_file
 from optparse import OptionParser
 import argparse
 
@@ -47,10 +40,44 @@ def compute_index   (archive_dir,
                no_ann,
                stdize,
                write_netcdf,
+               incremental = 0,
                debug = False):
 
     print __name__, 'casename: ', casename
     print __name__, 'reg: ', reg
+
+    #Reusing the area averages saved in the index file of an earlier, shorter run
+    skip_yrs = 0
+    prev_area_seasonal_avg = None
+
+    if incremental == 1 and begin_month <= end_month:
+        outfile = get_index_filename (      indir         = indir,
+                          casename      = casename,
+                          index_name    = index_name,
+                          field_name    = field_name,
+                          interp_grid   = interp_grid,
+                          interp_method = interp_method,
+                          begin_yr      = begin_yr,
+                          end_yr        = end_yr,
+                          begin_month   = begin_month,
+                          end_month     = end_month,
+                          aggregate     = aggregate,
+                          no_ann    = no_ann,
+                          stdize    = stdize,
+                          debug         = debug)
+
+        prev_file, prev_end_yr = get_previous_file(outfile, begin_yr, end_yr, debug = debug)
+
+        if prev_file is not None:
+            f_prev = Dataset(prev_file, 'r')
+
+            if 'area_avg' in f_prev.variables:
+                print __name__, 'Extending area averages of years ', begin_yr, '-', prev_end_yr
+                prev_area_seasonal_avg = f_prev.variables['area_avg'][:]
+                skip_yrs = prev_end_yr - begin_yr + 1
+
+            f_prev.close()
+
     area_seasonal_avg, n_months_season, units = get_reg_seasonal_avg (
                               indir     = archive_dir,
                               casename     = casename,
@@ -63,10 +90,15 @@ def compute_index   (archive_dir,
                               end_month     = end_month,
                               reg         = reg,
                               aggregate     = aggregate,
+                              skip_yrs     = skip_yrs,
                               debug     = debug)
 
+    if prev_area_seasonal_avg is not None:
+        area_seasonal_avg = numpy.ma.concatenate((prev_area_seasonal_avg, area_seasonal_avg))
+
 
     index = area_seasonal_avg
+    area_avg_units = units
 
     if aggregate == 0 and no_ann == 1:
         area_seasonal_avg_no_ann = remove_seasonal_cycle_monthly_data(index, n_months_season, debug = debug)
@@ -122,11 +154,19 @@ def compute_index   (archive_dir,
 
         time_outfile[:] = time
 
+        area_avg_outfile = f_write.createVariable('area_avg', 'f8', ('time'))
+        area_avg_outfile.setncattr('long_name', field_name + ' area average before removing annual cycle or standardizing')
+        area_avg_outfile.setncattr('units', area_avg_units)
+
+        area_avg_outfile[:] = area_seasonal_avg
+
+        f_write.close()
+
     return index, units
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -179,6 +219,9 @@ if __name__ == "__main__":
     parser.add_argument("--write_netcdf", dest = "write_netcdf", type = int,
             help = "flag (0/1) to write netcdf file of the index, default is on (1)", default = 1)
 
+    parser.add_argument("--incremental", dest = "incremental", type = int,
+            help = "flag (0/1) to extend the index file of an earlier, shorter run, default is off (0)", default = 0)
+
     args = parser.parse_args()
 
     debug              = args.debug
@@ -198,12 +241,10 @@ if __name__ == "__main__":
     no_ann             = args.no_ann
     stdize             = args.stdize
     write_netcdf       = args.write_netcdf
+    incremental        = args.incremental
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
 
-    x = mpl.get_backend()
-    print 'backend: ', x
-
     compute_index(archive_dir = archive_dir,
                   indir = indir,
                   casename = casename,
@@ -220,4 +261,5 @@ if __name__ == "__main__":
                   no_ann = no_ann,
                   stdize = stdize,
                   write_netcdf = write_netcdf,
+                  incremental = incremental,
                   debug = debug)
@@ -0,0 +1,32 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to compute the climatology of each calendar month from a monthly
+# time series that starts in January, for e.g. (time, ncol) model output,
+# or from monthly sums and counts (see compute_monthly_sums). Points
+# without any valid sample in a month are masked.
+#
+# field may be a numpy array or a netCDF4 variable. The time axis is
+# read chunk_size time steps at a time while running sums and counts
+# are kept for each month, so that peak memory depends on the size of
+# one chunk and not on the number of years in the file.
+# chunk_size = None reads the whole field in one request.
+
+import numpy
+
+from compute_monthly_sums import compute_monthly_sums
+
+def compute_monthly_climo(field = None, chunk_size = None, sum_field = None, count_field = None, debug = False):
+
+    if field is not None:
+        sum_field, count_field = compute_monthly_sums(field, chunk_size = chunk_size, debug = debug)
+
+    clim_field = numpy.ma.divide(sum_field, numpy.ma.masked_equal(count_field, 0))
+
+    if debug: print __name__, 'clim_field.shape: ', clim_field.shape
+
+    return clim_field
@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to compute the sum and number of samples of each calendar month of a
+# monthly time series that starts in January, for e.g. (time, ncol) model
+# output, starting at time step t_start (a multiple of 12 to skip whole years).
+#
+# field may be a numpy array or a netCDF4 variable. The time axis is
+# read chunk_size time steps at a time, so that peak memory depends on
+# the size of one chunk and not on the number of years in the file.
+# chunk_size = None reads the whole field in one request.
+#
+# Masked values (e.g. land points of observed SST) are left out of the sums,
+# and the samples are counted per grid point: count_field has the shape
+# (12,) + field.shape[1:].
+
+import numpy
+
+def compute_monthly_sums(field, t_start = 0, chunk_size = None, debug = False):
+
+    ntime = field.shape[0]
+    nyrs  = ntime/12
+    nt    = nyrs*12
+
+    if chunk_size is None or chunk_size > nt - t_start:
+        chunk_size = max(1, nt - t_start)
+
+    sum_field   = numpy.zeros((12,) + field.shape[1:])
+    count_field = numpy.zeros((12,) + field.shape[1:])
+
+    for t_begin in range(t_start, nt, chunk_size):
+        t_end = min(t_begin + chunk_size, nt)
+
+        if debug: print __name__, 'reading time steps: ', t_begin, t_end
+
+        chunk = field[t_begin:t_end, ...]
+
+        for month in range(0, 12):
+            first = (month - t_begin) % 12
+
+            if first >= t_end - t_begin:
+                continue
+
+            sum_field[month, ...]   += numpy.ma.filled(numpy.ma.sum(chunk[first::12, ...], axis = 0, dtype = numpy.float64), 0.0)
+            count_field[month, ...] += numpy.ma.count(chunk[first::12, ...], axis = 0)
+
+    return sum_field, count_field
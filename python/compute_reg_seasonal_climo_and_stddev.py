@@ -24,6 +24,7 @@ def compute_reg_seasonal_climo_and_stddev(indir,
                 end_month,
               reg,
               aggregate,
+              input_files = None,
               debug = False):
 
     field, lat_reg, lon_reg, area_reg, units_out = read_monthly_data_ts(indir = indir,
@@ -36,6 +37,7 @@ def compute_reg_seasonal_climo_and_stddev(indir,
                  begin_month = begin_month,
                  end_month = end_month,
                  reg = reg,
+                 input_files = input_files,
                  debug = debug)
 
 
@@ -0,0 +1,27 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to compute the days-weighted seasonal mean from the 12 monthly
+# climatologies returned by compute_monthly_climo.
+
+import numpy
+
+from get_season_months_index import get_season_months_index
+from get_days_in_season_months import get_days_in_season_months
+
+def compute_seasonal_climo(clim_field, begin_month, end_month, debug = False):
+
+    index_months, n_months_season = get_season_months_index(begin_month, end_month)
+
+    wgts = get_days_in_season_months(begin_month, end_month)
+
+    if debug: print __name__, 'index_months: ', index_months
+    if debug: print __name__, 'wgts: ', wgts
+
+    seasonal_clim = numpy.average(clim_field[index_months, ...], axis = 0, weights = wgts)
+
+    return seasonal_clim
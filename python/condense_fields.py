@@ -0,0 +1,279 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Condense many fields of a case into per-variable time series files,
+# $casename.cam.h0.$var.$begin_yr-$end_yr.nc, as ncrcat -v date,time,lat,lon,area,$var
+# does for one variable, coordinate variables of the dimensions of $var
+# (e.g. lev, ilev) included. Each monthly history file is opened once per
+# group of variables and the fields are fanned out to their output files.
+# Variables are split into at most --n_procs groups condensed in parallel,
+# so the archive is scanned n_procs times instead of once per variable.
+# With --incremental, a condensed file of an earlier run with the same
+# begin year is copied and only the history files of the later years
+# are appended to it.
+# Condensed files are written under a temporary name, renamed once complete
+# and recorded in the scratch cache manifest; variables whose condensed file
+# is up to date with the history files are skipped.
+
+import numpy
+from   netCDF4  import Dataset
+import time
+import os
+import shutil
+from   multiprocessing import Pool
+from   optparse import OptionParser
+
+from get_history_file_list import get_history_file_list
+from get_previous_file import get_previous_file
+from scratch_cache import get_cache_key, get_temp_filename, is_cached, record_cache
+
+coord_vars = ['date', 'time', 'lat', 'lon', 'area']
+
+
+def get_condensed_var_names(f, var):
+
+    #Coordinate variables of the dimensions of var, as ncrcat -v copies them
+    dim_coord_vars = [dim for dim in f.variables[var].dimensions \
+                        if dim in f.variables and dim not in coord_vars]
+
+    return coord_vars + dim_coord_vars + [var]
+
+
+def get_condensed_filename(outdir, casename, var, begin_yr, end_yr):
+
+    return outdir + '/' + casename + '.cam.h0.' + var + \
+                '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
+
+
+def copy_var_def(f_in, f_out, var_name):
+
+    var_in = f_in.variables[var_name]
+
+    for dim in var_in.dimensions:
+        if dim not in f_out.dimensions:
+            if f_in.dimensions[dim].isunlimited():
+                f_out.createDimension(dim, None)
+            else:
+                f_out.createDimension(dim, len(f_in.dimensions[dim]))
+
+    ncattrs = var_in.ncattrs()
+
+    if '_FillValue' in ncattrs:
+        var_out = f_out.createVariable(var_name, var_in.dtype, var_in.dimensions,
+                                       fill_value = var_in.getncattr('_FillValue'))
+    else:
+        var_out = f_out.createVariable(var_name, var_in.dtype, var_in.dimensions)
+
+    for ncattr in ncattrs:
+        if ncattr != '_FillValue':
+            var_out.setncattr(ncattr, var_in.getncattr(ncattr))
+
+    return var_out
+
+
+def condense_var_group(args):
+
+    file_list, year_list, outdir, casename, var_group, var_names, begin_yr, end_yr, incremental, cache_keys = args
+
+    t0 = time.time()
+
+    f_first = Dataset(file_list[0], 'r')
+
+    f_out_set   = {}
+    it_set      = {}
+    prev_end_yr = {}
+
+    for var in var_group:
+        outfile   = get_condensed_filename(outdir, casename, var, begin_yr, end_yr)
+        temp_file = get_temp_filename(outfile)
+
+        prev_file = None
+        if incremental:
+            prev_file, prev_end_yr_temp = get_previous_file(outfile, begin_yr, end_yr, debug = True)
+
+        if prev_file is not None:
+            print "Extending ", prev_file, " into ", outfile
+
+            shutil.copyfile(prev_file, temp_file)
+
+            f_out = Dataset(temp_file, 'a')
+
+            #Coordinate variables missing from files condensed without them
+            for var_name in var_names[var]:
+                if var_name in f_first.variables and var_name not in f_out.variables and \
+                   'time' not in f_first.variables[var_name].dimensions:
+                    var_out = copy_var_def(f_first, f_out, var_name)
+                    var_out[:] = f_first.variables[var_name][:]
+
+            it_set[var]      = len(f_out.dimensions['time'])
+            prev_end_yr[var] = prev_end_yr_temp
+        else:
+            print "Writing ", outfile
+
+            f_out = Dataset(temp_file, 'w', format = f_first.data_model)
+
+            for ncattr in f_first.ncattrs():
+                f_out.setncattr(ncattr, f_first.getncattr(ncattr))
+
+            for var_name in var_names[var]:
+                if var_name in f_first.variables:
+                    copy_var_def(f_first, f_out, var_name)
+
+            it_set[var]      = 0
+            prev_end_yr[var] = begin_yr - 1
+
+        f_out_set[var] = f_out
+
+    f_first.close()
+
+    #Single sweep over the history files for all variables in the group
+    for file_name, year in zip(file_list, year_list):
+
+        var_to_write = [var for var in var_group if year > prev_end_yr[var]]
+
+        if len(var_to_write) == 0:
+            continue
+
+        f_in = Dataset(file_name, 'r')
+        f_in.set_auto_maskandscale(False)
+
+        nt_in = len(f_in.dimensions['time'])
+
+        for var in var_to_write:
+            f_out = f_out_set[var]
+            it    = it_set[var]
+
+            for var_name in var_names[var]:
+                if var_name not in f_out.variables:
+                    continue
+
+                var_in  = f_in.variables[var_name]
+                var_out = f_out.variables[var_name]
+                var_out.set_auto_maskandscale(False)
+
+                if 'time' in var_in.dimensions:
+                    var_out[it:it+nt_in, ...] = var_in[:]
+                elif it == 0:
+                    var_out[:] = var_in[:]
+
+            it_set[var] = it + nt_in
+
+        f_in.close()
+
+    for var in var_group:
+        f_out_set[var].close()
+
+        outfile = get_condensed_filename(outdir, casename, var, begin_yr, end_yr)
+
+        os.rename(get_temp_filename(outfile), outfile)
+
+        record_cache(outfile, cache_keys[var])
+
+    print var_group, " condensed!, time taken: ", str(time.time()-t0)
+
+    return var_group
+
+
+if __name__ == '__main__':
+
+    #Parse options
+    parser = OptionParser(usage = "python %prog [options]")
+
+    parser.add_option("--archive_dir", dest = "archive_dir",
+                        help = "directory with the monthly history files")
+
+    parser.add_option("--outdir", dest = "outdir",
+                        help = "directory to write condensed files to")
+
+    parser.add_option("-c", "--casename", dest = "casename",
+                        help = "casename of the run")
+
+    parser.add_option("--var_list", dest = "var_list",
+                        help = "comma separated list of variable names")
+
+    parser.add_option("--begin_yr", dest = "begin_yr", type = "int",
+                        help = "begin year")
+
+    parser.add_option("--end_yr", dest = "end_yr", type = "int",
+                        help = "end year")
+
+    parser.add_option("--n_procs", dest = "n_procs", type = "int",
+                        help = "maximum number of parallel condense processes", default = 4)
+
+    parser.add_option("--incremental", dest = "incremental", action = "store_true",
+                        help = "extend the condensed files of an earlier, shorter run", default = False)
+
+    (options, args) = parser.parse_args()
+
+    archive_dir = options.archive_dir
+    outdir      = options.outdir
+    casename    = options.casename
+    begin_yr    = options.begin_yr
+    end_yr      = options.end_yr
+    n_procs     = max(1, options.n_procs)
+    incremental = options.incremental
+
+    var_list = options.var_list.split(',')
+
+    file_list, year_list, month_list = get_history_file_list(archive_dir, begin_yr, end_yr, debug = True)
+
+    if len(file_list) == 0:
+        print "No history files found in ", archive_dir, " for years ", begin_yr, end_yr
+        raise SystemExit(1)
+
+    print "begin_yr, end_yr: ", begin_yr, end_yr
+    print "first file: ", file_list[0]
+    print "last file: ", file_list[-1]
+
+    f = Dataset(file_list[0], 'r')
+
+    var_found = []
+    var_names = {}
+    for var in var_list:
+        if var in f.variables:
+            var_found.append(var)
+            var_names[var] = get_condensed_var_names(f, var)
+        else:
+            print var, " not found in history files! Not condensing."
+
+    f.close()
+
+    if len(var_found) == 0:
+        raise SystemExit(1)
+
+    cache_keys = {}
+    var_to_condense = []
+    for var in var_found:
+        cache_keys[var] = get_cache_key('condense', file_list, {'vars': ','.join(var_names[var])})
+
+        outfile = get_condensed_filename(outdir, casename, var, begin_yr, end_yr)
+
+        if is_cached(outfile, cache_keys[var]):
+            print "file ", outfile, " is up to date! Not condensing."
+        else:
+            var_to_condense.append(var)
+
+    if len(var_to_condense) == 0:
+        raise SystemExit(int(len(var_found) < len(var_list)))
+
+    n_groups   = min(n_procs, len(var_to_condense))
+    var_groups = [var_to_condense[i::n_groups] for i in range(0, n_groups)]
+
+    print "variable groups: ", var_groups
+
+    group_args = [(file_list, year_list, outdir, casename, var_group, var_names, begin_yr, end_yr, incremental, cache_keys) for var_group in var_groups]
+
+    if n_groups == 1:
+        map(condense_var_group, group_args)
+    else:
+        pool = Pool(processes = n_groups)
+        pool.map(condense_var_group, group_args)
+        pool.close()
+        pool.join()
+
+    if len(var_found) < len(var_list):
+        raise SystemExit(1)
@@ -6,6 +6,18 @@
 # in the LICENSE file in the top level a-prime directory
 #
 # Compute the climatology for a case
+# Reads the condensed field once, computes the 12 monthly climatologies
+# once and writes one climatology file for each requested season.
+# Seasons are given as comma separated lists of begin and end months,
+# for e.g. --begin_month 0,2,5,8,11 --end_month 11,4,7,10,1
+# With --max_memory_mb or --chunk_size the time axis is streamed in
+# bounded chunks instead of reading the whole field at once.
+# With --incremental, the monthly sums and counts are also saved and, if
+# those of an earlier run with the same begin year exist, only the years
+# after that run are read from the condensed file.
+# With --wgt_file, the seasonal means are remapped in memory and only the
+# remapped climatology files (${casename}_${season}_climo.${interp_grid}_${interp_method}...)
+# are written, plus the native grid files if --write_native is given.
 # Uses MPI
 
 import numpy
@@ -17,6 +29,19 @@ import time
 from   optparse import OptionParser
 
 from get_season_name import get_season_name
+from compute_monthly_climo import compute_monthly_climo
+from compute_seasonal_climo import compute_seasonal_climo
+from write_climo_file import write_climo_file
+from get_time_chunk_size import get_time_chunk_size
+from compute_monthly_sums import compute_monthly_sums
+from get_monthly_sums_filename import get_monthly_sums_filename
+from get_previous_file import get_previous_file
+from read_monthly_sums_file import read_monthly_sums_file
+from write_monthly_sums_file import write_monthly_sums_file
+from scratch_cache import get_cache_key, record_cache
+from get_remap_weights import get_remap_weights
+from remap_field import remap_field
+from write_remapped_climo_file import write_remapped_climo_file
 
 #Parse options
 parser = OptionParser(usage = "mpirun [options] python %prog [options]")
@@ -36,11 +61,35 @@ parser.add_option("--begin_yr", dest = "begin_yr", type = "int",
 parser.add_option("--end_yr", dest = "end_yr", type = "int",
                     help = "end year")
 
-parser.add_option("--begin_month", dest = "begin_month", type = "int",
-                    help = "begin_month", default = 0)
+parser.add_option("--begin_month", dest = "begin_month",
+                    help = "begin_month, or comma separated list of begin months", default = "0")
 
-parser.add_option("--end_month", dest = "end_month", type = "int",
-                    help = "end_month", default = 11)
+parser.add_option("--end_month", dest = "end_month",
+                    help = "end_month, or comma separated list of end months", default = "11")
+
+parser.add_option("--chunk_size", dest = "chunk_size", type = "int",
+                    help = "number of time steps read at once", default = None)
+
+parser.add_option("--max_memory_mb", dest = "max_memory_mb", type = "float",
+                    help = "memory budget in MB used to set the chunk size, 0 for no limit", default = 0)
+
+parser.add_option("--incremental", dest = "incremental", action = "store_true",
+                    help = "extend the monthly sums of an earlier, shorter run", default = False)
+
+parser.add_option("--wgt_file", dest = "wgt_file",
+                    help = "remapping weights file to remap the climatologies with", default = None)
+
+parser.add_option("--interp_grid", dest = "interp_grid",
+                    help = "name of the grid remapped to, for e.g. GPCP", default = None)
+
+parser.add_option("--interp_method", dest = "interp_method",
+                    help = "remapping method, for e.g. conservative_mapping", default = None)
+
+parser.add_option("--remap_cache_dir", dest = "remap_cache_dir",
+                    help = "directory of the persistent remapping operator cache", default = None)
+
+parser.add_option("--write_native", dest = "write_native", action = "store_true",
+                    help = "also write native grid climatologies when remapping", default = False)
 
 (options, args) = parser.parse_args()
 
@@ -49,8 +98,20 @@ casename    = options.casename
 field_name  = options.field_name
 begin_yr    = options.begin_yr
 end_yr      = options.end_yr
-begin_month = options.begin_month
-end_month   = options.end_month
+chunk_size  = options.chunk_size
+max_memory_mb = options.max_memory_mb
+incremental = options.incremental
+wgt_file    = options.wgt_file
+interp_grid = options.interp_grid
+interp_method = options.interp_method
+remap_cache_dir = options.remap_cache_dir
+write_native  = options.write_native or wgt_file is None
+
+begin_month_set = [int(month) for month in options.begin_month.split(',')]
+end_month_set   = [int(month) for month in options.end_month.split(',')]
+
+if len(begin_month_set) != len(end_month_set):
+    parser.error("--begin_month and --end_month must list the same number of seasons")
 
 
 #Get filename
@@ -72,92 +133,87 @@ ncol  = field.shape[1]
 print "field.shape: ", field.shape
 print "field.units: ", field.units
 
-t0 = time.clock()
-
-begin_index = 0
-end_index = ncol
+if chunk_size is None:
+    chunk_size = get_time_chunk_size(field, max_memory_mb)
 
-local_field = field[:,begin_index:end_index]
+print "chunk_size: ", chunk_size
 
-print "file read!, time taken: ", str(time.clock()-t0)
+t0 = time.clock()
 
-nyrs = ntime/12
-clim_field = numpy.zeros((12, ncol))
+#Computing the climatology of each month, shared by all seasons
+if incremental:
+    sums_file = get_monthly_sums_filename(indir, casename, field_name, begin_yr, end_yr)
 
+    prev_sums_file, prev_end_yr = get_previous_file(sums_file, begin_yr, end_yr, debug = True)
 
-#Computing the climatology of each month
-for month in range(0, 12):
-    i = numpy.arange(0,nyrs) * 12 + month
-    # print i
-    clim_field[month, :] = numpy.mean(field[i, :], axis = 0)
+    prev_sums = None
+    if prev_sums_file is not None:
+        prev_sums = read_monthly_sums_file(prev_sums_file, field_name)
 
-units_out = field.units
+    if prev_sums is None:
+        t_start = 0
+        sum_field = numpy.zeros((12,) + field.shape[1:])
+        count_field = numpy.zeros((12,) + field.shape[1:])
+    else:
+        print "Extending monthly sums of years ", begin_yr, "-", prev_end_yr
+        t_start = (prev_end_yr - begin_yr + 1) * 12
+        sum_field, count_field = prev_sums
 
-if field_name[0:4] == 'PREC':
-    print 'A precipitation field! Changing units to mm/day!...'
-    clim_field = clim_field * 86400.0 * 1000.0
-    units_out = 'mm/day'
+    new_sum_field, new_count_field = compute_monthly_sums(field, t_start = t_start, chunk_size = chunk_size, debug = True)
 
-seasonal_clim = numpy.zeros((ncol))
-days_in_month = numpy.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    sum_field = sum_field + new_sum_field
+    count_field = count_field + new_count_field
 
-print 'begin_month, end_month:', begin_month, end_month
+    write_monthly_sums_file(sums_file, field_name, sum_field, count_field, field.dimensions[1:])
 
-#Setting up months in the prescribed season
-if (begin_month <= end_month):
-    n_months = end_month - begin_month + 1
-    seasonal_index = numpy.arange(begin_month, end_month+1)
+    clim_field = compute_monthly_climo(sum_field = sum_field, count_field = count_field)
 
 else:
-    n_months = (11 - begin_month + 1) + (end_month + 1)
-    seasonal_index = numpy.zeros((n_months), dtype = numpy.int)
+    clim_field = compute_monthly_climo(field, chunk_size = chunk_size, debug = True)
 
-    seasonal_index[0:11-begin_month+1]       = numpy.arange(begin_month, 12)
-    seasonal_index[11-begin_month+1:n_months]  = numpy.arange(0, end_month+1)
+print "file read and monthly climatology computed!, time taken: ", str(time.clock()-t0)
 
-print "seasonal_index: ", seasonal_index
-print "seasonal_index.shape: ", seasonal_index.shape
-print "clim_field.shape: ", clim_field.shape
+units_out = field.units
 
-weights = numpy.zeros((n_months))
-weights[:] = days_in_month[seasonal_index]
-print "weights: ", weights
+if field_name[0:4] == 'PREC':
+    print 'A precipitation field! Changing units to mm/day!...'
+    clim_field = clim_field * 86400.0 * 1000.0
+    units_out = 'mm/day'
 
-#Computing seasonal mean
-seasonal_clim[:] = numpy.average(clim_field[seasonal_index, :], axis = 0, weights = weights)
+print "clim_field.shape: ", clim_field.shape
 
-season = get_season_name(begin_month, end_month)
+if wgt_file is not None:
+    weights = get_remap_weights(wgt_file, cache_dir = remap_cache_dir)
 
-#Writing netcdf file
-outfile = indir + '/'+ casename + '_' + season \
-            + '_climo.' + field_name + \
-        '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
+for begin_month, end_month in zip(begin_month_set, end_month_set):
 
-print "Writing ", outfile
-print ""
+    print 'begin_month, end_month:', begin_month, end_month
 
-f_write = Dataset(outfile, 'w', format = 'NETCDF3_64BIT')
+    #Computing seasonal mean
+    seasonal_clim = compute_seasonal_climo(clim_field, begin_month, end_month, debug = True)
 
-ncol_outfile = f_write.createDimension('ncol', ncol)
+    season = get_season_name(begin_month, end_month)
 
-field_outfile = f_write.createVariable(field_name, 'f4', ('ncol'))
-lat_outfile = f_write.createVariable('lat', 'float64', ('ncol'))
-lon_outfile = f_write.createVariable('lon', 'float64', ('ncol'))
+    #Writing netcdf file
+    if write_native:
+        outfile = indir + '/'+ casename + '_' + season \
+                    + '_climo.' + field_name + \
+                '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
 
-field_outfile[:] = seasonal_clim
+        write_climo_file(outfile, field_name, seasonal_clim, field, lat, lon, units_out)
 
-for ncattr in field.ncattrs():
-    field_outfile.setncattr(ncattr, field.getncattr(ncattr))
+        record_cache(outfile, get_cache_key('climo', [file_name], {'begin_month': begin_month, 'end_month': end_month}))
 
-field_outfile.units = units_out
+    if wgt_file is not None:
+        interp_outfile = indir + '/'+ casename + '_' + season \
+                    + '_climo.' + interp_grid + '_' + interp_method + '.' + field_name + \
+                '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
 
-lat_outfile[:] = lat[:]
+        interp_seasonal_clim = remap_field(seasonal_clim, weights)
 
-for ncattr in lat.ncattrs():
-    lat_outfile.setncattr(ncattr, lat.getncattr(ncattr))
+        write_remapped_climo_file(interp_outfile, field_name, interp_seasonal_clim, field, weights, units_out)
 
-lon_outfile[:] = lon[:]
-for ncattr in lon.ncattrs():
-    lon_outfile.setncattr(ncattr, lon.getncattr(ncattr))
+        record_cache(interp_outfile, get_cache_key('climo_remap', [file_name, wgt_file],
+                                                   {'begin_month': begin_month, 'end_month': end_month}))
 
-f_write.close()
+f.close()
@@ -0,0 +1,226 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Compute the climatology for a case directly from the monthly
+# history files (*cam.h0.YYYY-MM.nc), without condensing them first.
+# Each history file is opened once and the monthly sums of all
+# requested variables are accumulated in a single sweep over the files.
+# The climatology files written are the same as create_climatology.py's.
+# Variables and seasons are given as comma separated lists,
+# for e.g. --var_list FLUT,FSNT --begin_month 0,11 --end_month 11,1
+# With --max_memory_mb, variables are split into groups whose monthly
+# accumulators fit the budget, with one sweep over the files per group.
+# With --incremental, the monthly sums and counts are also saved and, if
+# those of an earlier run with the same begin year exist, only the
+# history files of the years after that run are read.
+
+import numpy
+from   netCDF4  import Dataset
+import time
+from   optparse import OptionParser
+
+from get_season_name import get_season_name
+from compute_seasonal_climo import compute_seasonal_climo
+from write_climo_file import write_climo_file
+from get_history_file_list import get_history_file_list
+from compute_monthly_climo import compute_monthly_climo
+from get_monthly_sums_filename import get_monthly_sums_filename
+from get_previous_file import get_previous_file
+from read_monthly_sums_file import read_monthly_sums_file
+from write_monthly_sums_file import write_monthly_sums_file
+from scratch_cache import get_cache_key, is_cached, record_cache
+
+#Parse options
+parser = OptionParser(usage = "python %prog [options]")
+
+parser.add_option("--archive_dir", dest = "archive_dir",
+                    help = "directory with the monthly history files")
+
+parser.add_option("--outdir", dest = "outdir",
+                    help = "directory to write climatology files to")
+
+parser.add_option("-c", "--casename", dest = "casename",
+                    help = "casename of the run")
+
+parser.add_option("--var_list", dest = "var_list",
+                    help = "comma separated list of variable names")
+
+parser.add_option("--begin_yr", dest = "begin_yr", type = "int",
+                    help = "begin year")
+
+parser.add_option("--end_yr", dest = "end_yr", type = "int",
+                    help = "end year")
+
+parser.add_option("--begin_month", dest = "begin_month",
+                    help = "comma separated list of begin months", default = "0")
+
+parser.add_option("--end_month", dest = "end_month",
+                    help = "comma separated list of end months", default = "11")
+
+parser.add_option("--max_memory_mb", dest = "max_memory_mb", type = "float",
+                    help = "memory budget in MB for the monthly accumulators, 0 for no limit", default = 0)
+
+parser.add_option("--incremental", dest = "incremental", action = "store_true",
+                    help = "extend the monthly sums of an earlier, shorter run", default = False)
+
+(options, args) = parser.parse_args()
+
+archive_dir   = options.archive_dir
+outdir        = options.outdir
+casename      = options.casename
+begin_yr      = options.begin_yr
+end_yr        = options.end_yr
+max_memory_mb = options.max_memory_mb
+incremental   = options.incremental
+
+var_list        = options.var_list.split(',')
+begin_month_set = [int(month) for month in options.begin_month.split(',')]
+end_month_set   = [int(month) for month in options.end_month.split(',')]
+
+if len(begin_month_set) != len(end_month_set):
+    parser.error("--begin_month and --end_month must list the same number of seasons")
+
+def get_climo_outfile(field_name, begin_month, end_month):
+
+    season = get_season_name(begin_month, end_month)
+
+    outfile = outdir + '/'+ casename + '_' + season \
+                + '_climo.' + field_name + \
+            '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
+
+    return outfile
+
+file_list, year_list, month_list = get_history_file_list(archive_dir, begin_yr, end_yr, debug = True)
+
+if len(file_list) == 0:
+    print "No history files found in ", archive_dir, " for years ", begin_yr, end_yr
+    raise SystemExit(1)
+
+print "first file: ", file_list[0]
+print "last file: ", file_list[-1]
+
+#Checking which variables are available in the history files
+f = Dataset(file_list[0], 'r')
+
+lat = f.variables['lat']
+lon = f.variables['lon']
+
+cache_keys = [get_cache_key('climo_from_history', file_list, {'begin_month': begin_month, 'end_month': end_month}) \
+                for begin_month, end_month in zip(begin_month_set, end_month_set)]
+
+fields_found = []
+for field_name in var_list:
+    if field_name not in f.variables:
+        print field_name, " not found in history files! Not computing climatology."
+        continue
+
+    outfiles = [get_climo_outfile(field_name, begin_month, end_month) \
+                for begin_month, end_month in zip(begin_month_set, end_month_set)]
+
+    if all([is_cached(outfile, key) for outfile, key in zip(outfiles, cache_keys)]):
+        print field_name, " climatology files are up to date! Not computing climatology."
+    else:
+        fields_found.append(field_name)
+
+if len(fields_found) == 0:
+    f.close()
+    raise SystemExit(0)
+
+npts = int(numpy.prod(f.variables[fields_found[0]].shape[1:]))
+
+#Grouping variables so that their monthly accumulators fit the memory budget
+if max_memory_mb > 0:
+    n_var_group = max(1, int(max_memory_mb * 1024.0 * 1024.0 / (12 * npts * 8 * 2)))
+else:
+    n_var_group = len(fields_found)
+
+var_groups = [fields_found[i:i+n_var_group] for i in range(0, len(fields_found), n_var_group)]
+
+print "variable groups: ", var_groups
+
+for var_group in var_groups:
+
+    t0 = time.clock()
+
+    sum_field   = {}
+    count_field = {}
+    prev_end_yr = {}
+
+    for field_name in var_group:
+        sum_field[field_name]   = numpy.zeros((12,) + f.variables[field_name].shape[1:])
+        count_field[field_name] = numpy.zeros((12,) + f.variables[field_name].shape[1:])
+        prev_end_yr[field_name] = begin_yr - 1
+
+        if incremental:
+            sums_file = get_monthly_sums_filename(outdir, casename, field_name, begin_yr, end_yr)
+            prev_sums_file, prev_end_yr_temp = get_previous_file(sums_file, begin_yr, end_yr, debug = True)
+
+            prev_sums = None
+            if prev_sums_file is not None:
+                prev_sums = read_monthly_sums_file(prev_sums_file, field_name)
+
+            if prev_sums is not None:
+                print "Extending ", field_name, " monthly sums of years ", begin_yr, "-", prev_end_yr_temp
+                sum_field[field_name], count_field[field_name] = prev_sums
+                prev_end_yr[field_name] = prev_end_yr_temp
+
+    #Single sweep over the history files for all variables in the group
+    for file_name, year, month in zip(file_list, year_list, month_list):
+
+        fields_to_read = [field_name for field_name in var_group if year > prev_end_yr[field_name]]
+
+        if len(fields_to_read) == 0:
+            continue
+
+        f_in = Dataset(file_name, 'r')
+
+        for field_name in fields_to_read:
+            field_in = f_in.variables[field_name][0:1, ...]
+
+            #Masked values are left out, see compute_monthly_sums
+            sum_field[field_name][month, ...]   += numpy.ma.filled(numpy.ma.sum(field_in, axis = 0, dtype = numpy.float64), 0.0)
+            count_field[field_name][month, ...] += numpy.ma.count(field_in, axis = 0)
+
+        f_in.close()
+
+    print "history files read!, time taken: ", str(time.clock()-t0)
+
+    for field_name in var_group:
+
+        field = f.variables[field_name]
+
+        print field_name, "number of files per month: ", count_field[field_name].reshape(12, -1).max(axis = 1)
+
+        if incremental:
+            sums_file = get_monthly_sums_filename(outdir, casename, field_name, begin_yr, end_yr)
+            write_monthly_sums_file(sums_file, field_name, sum_field[field_name], count_field[field_name], field.dimensions[1:])
+
+        clim_field = compute_monthly_climo(sum_field = sum_field[field_name], count_field = count_field[field_name])
+
+        units_out = field.units
+
+        if field_name[0:4] == 'PREC':
+            print 'A precipitation field! Changing units to mm/day!...'
+            clim_field = clim_field * 86400.0 * 1000.0
+            units_out = 'mm/day'
+
+        for begin_month, end_month, key in zip(begin_month_set, end_month_set, cache_keys):
+
+            print 'begin_month, end_month:', begin_month, end_month
+
+            seasonal_clim = compute_seasonal_climo(clim_field, begin_month, end_month)
+
+            #Writing netcdf file
+            outfile = get_climo_outfile(field_name, begin_month, end_month)
+
+            write_climo_file(outfile, field_name, seasonal_clim, field, lat, lon, units_out)
+
+            record_cache(outfile, key)
+
+        del sum_field[field_name]
+
+f.close()
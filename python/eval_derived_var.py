@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Evaluation of derived variables (see get_derived_var_expr), shared by
+# read_monthly_data_ts and read_climo_file.
+#
+# read_component(name) reads a variable and returns a tuple whose first
+# element is the field, e.g. (field, lat, lon, area, units). Components
+# that cannot be read are derived in turn if they are derived variables
+# themselves (e.g. FLNS from FLUS and FLDS inside RESSURF). Each component
+# is read once per evaluation; readers may cache across calls (time series
+# fields are kept by ts_field_cache).
+#
+# Linear combinations of components, which all current derived variables
+# are, are accumulated in place into one output array, so that no
+# temporary array is allocated per operator, without importing sympy.
+# Other expressions are evaluated with the numpy function compiled by sympy.
+#
+# Returns the tuple of the first component with the derived field as its
+# first element.
+
+import numpy
+
+from get_derived_var_expr import get_derived_var_expr, derived_var_defs
+
+read_errors = (RuntimeError, IOError, OSError, KeyError)
+
+
+def read_or_derive_var(field_name, read_component, components, debug = False):
+
+    if field_name in components:
+        return components[field_name]
+
+    try:
+        components[field_name] = read_component(field_name)
+
+    except read_errors:
+        if field_name not in derived_var_defs:
+            raise
+
+        print
+        print field_name, 'not found! Checking derived variables list for ', field_name
+
+        components[field_name] = eval_derived_var(field_name, read_component, components, debug = debug)
+
+    return components[field_name]
+
+
+def eval_derived_var(field_name, read_component, components = None, debug = False):
+
+    if components is None:
+        components = {}
+
+    component_names, coeffs, var_expr_numpy = get_derived_var_expr(field_name)
+
+    for name in component_names:
+        read_or_derive_var(name, read_component, components, debug = debug)
+
+    first = components[component_names[0]]
+
+    if coeffs is not None:
+
+        field = None
+
+        for name in component_names:
+            coeff = coeffs[name]
+            field_temp = components[name][0]
+
+            if field is None:
+                #Accumulating into a copy of the first component, which may
+                #also be used on its own. Masked, so that the mask of any
+                #component is kept, as by a + b
+                field = numpy.ma.array(field_temp * coeff)
+
+            elif coeff == 1.0:
+                field += field_temp
+            elif coeff == -1.0:
+                field -= field_temp
+            else:
+                field += coeff * field_temp
+
+    else:
+        field = var_expr_numpy(*[components[name][0] for name in component_names])
+
+    if debug: print __name__, field_name, '= ', derived_var_defs[field_name]
+    print __name__, 'field.shape: ', field.shape
+
+    return (field,) + tuple(first[1:])
@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Cached Basemap instances for the map plots.
+#
+# Creating a Basemap (projection setup and reading and clipping the
+# coastline database) takes longer than drawing a panel with it, so one
+# instance is created per projection and bounding box and shared by all
+# the panels and figures of the process (see plot_climo_batch).
+# get_basemap points the shared instance at the axes to draw on.
+#
+# get_basemap_xy returns the map coordinates of a lat/lon grid, i.e.
+# x, y = m(*numpy.meshgrid(lon, lat)), computed once per Basemap and grid.
+# The arrays returned are read only, as they are shared by all callers.
+
+import hashlib
+
+import numpy
+
+basemap_cache = {}
+basemap_xy_cache = {}
+
+
+def get_basemap(projection = 'cyl',
+                llcrnrlat = -90,
+                urcrnrlat = 90,
+                llcrnrlon = 0,
+                urcrnrlon = 360,
+                resolution = 'c',
+                ax = None):
+
+    #Imported here, as Basemap is slow to import
+    from mpl_toolkits.basemap import Basemap
+
+    key = (projection, float(llcrnrlat), float(urcrnrlat), float(llcrnrlon), float(urcrnrlon), resolution)
+
+    if key not in basemap_cache:
+        basemap_cache[key] = Basemap(projection = projection,
+                                     llcrnrlat = llcrnrlat,
+                                     urcrnrlat = urcrnrlat,
+                                     llcrnrlon = llcrnrlon,
+                                     urcrnrlon = urcrnrlon,
+                                     resolution = resolution)
+
+    m = basemap_cache[key]
+
+    #Drawing methods draw on m.ax, or on the current axes if m.ax is None
+    m.ax = ax
+
+    return m
+
+
+def get_basemap_xy(m, lat, lon):
+
+    lat = numpy.ma.getdata(lat[:])
+    lon = numpy.ma.getdata(lon[:])
+
+    key = (id(m), hashlib.md5(lat.tobytes()).hexdigest(), hashlib.md5(lon.tobytes()).hexdigest())
+
+    if key not in basemap_xy_cache:
+        lons, lats = numpy.meshgrid(lon, lat)
+        x, y = m(lons, lats)
+
+        x = numpy.asarray(x)
+        y = numpy.asarray(y)
+        x.flags.writeable = False
+        y.flags.writeable = False
+
+        #Keeping m with its coordinates, so that id(m) is not reused by
+        #another Basemap while the entry exists
+        basemap_xy_cache[key] = (m, x, y)
+
+    m, x, y = basemap_xy_cache[key]
+
+    return x, y
@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Contour levels shared by all the plots using the same reference field,
+# e.g. the climatology plots of several test cases compared to one
+# reference case.
+#
+# get_contour_levels(key, field, compute_levels, n_stddev, num_levels,
+# input_files) returns the levels computed by compute_levels
+# (compute_contour_levels or compute_climo_contour_levels) from the
+# statistics of field (get_field_stats, one pass over the field), and these
+# statistics. key identifies the reference field, e.g. (ref_case,
+# field_name, season, ref_begin_yr, ref_end_yr, ref_interp_grid,
+# ref_interp_method), and input_files are the files it was read from (see
+# read_climo_file).
+#
+# Levels are kept per process, and, if contour_levels_dir is set in the
+# environment, in small sidecar files in that directory
+# (<key>_<compute_levels>_<n_stddev>_<num_levels>.json), which later plots
+# and other processes load instead of computing the statistics again.
+# Levels are computed again when the size or modification time of an input
+# file changed (or its checksum, see scratch_cache.get_cache_key).
+
+import json
+import os
+
+import numpy
+
+from get_field_stats import get_field_stats
+from scratch_cache   import get_cache_key, get_temp_filename
+
+contour_levels_cache = {}
+
+
+def get_contour_levels_file(key):
+
+    contour_levels_dir = os.environ.get('contour_levels_dir', '')
+
+    if contour_levels_dir == '':
+        return None
+
+    file_name = '_'.join(str(x) for x in key).replace('/', '-').replace(' ', '') + '.json'
+
+    return os.path.join(contour_levels_dir, file_name)
+
+
+def read_contour_levels_file(file_name, key, inputs_key):
+
+    try:
+        with open(file_name) as f:
+            sidecar = json.load(f)
+    except (IOError, ValueError):
+        return None
+
+    if sidecar.get('key') != [str(x) for x in key]:
+        return None
+
+    #Reference field read from files which changed since
+    if sidecar.get('inputs_key') != inputs_key:
+        print __name__, 'Input files changed since: ', file_name
+        return None
+
+    return numpy.array(sidecar['levels']), sidecar['stats']
+
+
+def write_contour_levels_file(file_name, key, inputs_key, levels, stats):
+
+    contour_levels_dir = os.path.dirname(file_name)
+
+    if not os.path.isdir(contour_levels_dir):
+        try:
+            os.makedirs(contour_levels_dir)
+        except OSError:
+            #Created by another process meanwhile
+            if not os.path.isdir(contour_levels_dir):
+                raise
+
+    sidecar = {'key':        [str(x) for x in key],
+               'inputs_key': inputs_key,
+               'levels':     [float(x) for x in levels],
+               'stats':      dict((k, float(v)) for k, v in stats.items())}
+
+    #Written to a temporary file first, so that other processes never read
+    #a partial file
+    temp_file_name = get_temp_filename(file_name)
+
+    with open(temp_file_name, 'w') as f:
+        json.dump(sidecar, f, indent = 1, sort_keys = True)
+
+    os.rename(temp_file_name, file_name)
+
+
+def get_contour_levels(key, field, compute_levels, n_stddev, num_levels, input_files, debug = False):
+
+    key = tuple(key) + (compute_levels.__name__, n_stddev, num_levels)
+
+    inputs_key = get_cache_key('contour_levels', input_files)
+
+    if key in contour_levels_cache and contour_levels_cache[key][0] == inputs_key:
+        levels, stats = contour_levels_cache[key][1:]
+        return levels.copy(), dict(stats)
+
+    file_name = get_contour_levels_file(key)
+
+    sidecar = None
+    if file_name is not None:
+        sidecar = read_contour_levels_file(file_name, key, inputs_key)
+
+    if sidecar is not None:
+        levels, stats = sidecar
+        print __name__, 'Contour levels read from: ', file_name
+
+    else:
+        stats  = get_field_stats(field, debug = debug)
+        levels = compute_levels(field, n_stddev, num_levels, stats = stats)
+
+        if file_name is not None:
+            write_contour_levels_file(file_name, key, inputs_key, levels, stats)
+
+    if debug: print __name__, 'key: ', key
+    if debug: print __name__, 'levels: ', levels
+
+    contour_levels_cache[key] = (inputs_key, levels, stats)
+
+    return levels.copy(), dict(stats)
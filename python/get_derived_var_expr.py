@@ -1,37 +1,92 @@
 #
 # Copyright (c) 2017, UT-BATTELLE, LLC
 # All rights reserved.
-# 
+#
 # This software is released under the BSD license detailed
 # in the LICENSE file in the top level a-prime directory
 #
-import numpy
-from sympy import *
+import re
+
+#Derived variables and their expressions in terms of variables read from
+#files. Components may be derived variables themselves (e.g. FLNS in RESSURF).
+
+derived_var_defs = {
+    'PRECT':   'PRECC + PRECL',
+    'RESTOM':  'FSNT - FLNT',
+    'FLNS':    'FLUS - FLDS',
+    'RESSURF': 'FLNS - FSNS + LHFLX + SHFLX',
+}
+
+#One term of a linear combination of variables, e.g. '- FSNS' or '+ 0.5*LHFLX'
+linear_term = re.compile(r'\s*([+-])?\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?)\s*\*\s*)?([A-Za-z_]\w*)\s*')
+
+#Expressions are compiled once per process
+derived_var_exprs = {}
+
+
+def get_linear_coeffs(expr):
+
+    #Coefficients of the variables of expr if it is a linear combination of
+    #variables, None otherwise
+    coeffs = {}
+
+    pos = 0
+    while pos < len(expr):
+        match = linear_term.match(expr, pos)
+
+        if match is None or match.end() == pos or (pos > 0 and match.group(1) is None):
+            return None
+
+        sign, coeff, name = match.groups()
+
+        value = float(coeff) if coeff is not None else 1.0
+        if sign == '-':
+            value = -value
+
+        coeffs[name] = coeffs.get(name, 0.0) + value
+
+        pos = match.end()
+
+    return coeffs
+
 
 def get_derived_var_expr (field_name):
 
+    #Returns the names of the components of field_name, sorted, and either
+    #their coefficients if field_name is a linear combination of them (all
+    #current derived variables), or a numpy function of the components, in
+    #the order of their names
 
-    if field_name == 'PRECT':
-        PRECC, PRECL = symbols('PRECC, PRECL')
-        var_expr = PRECC + PRECL
-    elif field_name == 'RESTOM':
-        FSNT, FLNT = symbols('FSNT, FLNT')
-        var_expr = FSNT - FLNT
-    elif field_name == 'FLNS':
-        FLUS, FLDS = symbols('FLUS, FLDS')
-        var_expr = FLUS - FLDS
-    elif field_name == 'RESSURF':
-        FLNS, FSNS, LHFLX, SHFLX = symbols('FLNS, FSNS, LHFLX, SHFLX')
-        var_expr = FLNS - FSNS + LHFLX + SHFLX
-    else:
+    if field_name in derived_var_exprs:
+        return derived_var_exprs[field_name]
+
+    if field_name not in derived_var_defs:
         print
         print 'No derived variable list found for ', field_name
+        raise KeyError('No derived variable list found for ' + field_name)
 
-    print
-    print field_name, 'derived from: ', var_expr.atoms(Symbol)
+    coeffs = get_linear_coeffs(derived_var_defs[field_name])
 
-    var_expr_numpy = lambdify(var_expr.atoms(Symbol), var_expr, "numpy")
+    if coeffs is not None:
+        component_names = sorted(coeffs.keys())
+        var_expr_numpy  = None
 
-    return var_expr, var_expr_numpy
+    else:
+        #sympy is imported here, only by runs that need a derived variable
+        #which is not a linear combination, as it takes a large part of the
+        #start-up time of the scripts
+        from sympy import sympify, lambdify, Symbol
+
+        var_expr = sympify(derived_var_defs[field_name])
+
+        symbols = sorted(var_expr.atoms(Symbol), key = str)
+
+        component_names = [str(symbol) for symbol in symbols]
+        var_expr_numpy  = lambdify(symbols, var_expr, "numpy")
+
+    print
+    print field_name, 'derived from: ', component_names
 
+    derived_var_exprs[field_name] = (component_names, coeffs, var_expr_numpy)
 
+    return derived_var_exprs[field_name]
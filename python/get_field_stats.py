@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+import numpy
+
+#Statistics of the valid (unmasked, finite) values of a field, as used to
+#compute contour levels: number of values, min, max, mean and standard
+#deviation (as numpy.ma.std, i.e. divided by n).
+#
+#The field is traversed once: min, max, sum and sum of squares are
+#accumulated over blocks of block_size values, which stay in cache for all
+#four reductions. Sums are computed in double precision about the first
+#valid value, to keep the standard deviation of fields with a large mean
+#accurate.
+
+def get_field_stats(field, block_size = 65536, debug = False):
+
+    data = numpy.ma.getdata(field).reshape(-1)
+    mask = numpy.ma.getmaskarray(field).reshape(-1)
+
+    n         = 0
+    field_min = numpy.inf
+    field_max = -numpy.inf
+    shift     = None
+    sum_x     = 0.0
+    sum_xx    = 0.0
+
+    for i in range(0, data.size, block_size):
+        block = data[i:i+block_size].astype(numpy.float64)
+
+        valid = numpy.logical_not(mask[i:i+block_size])
+        valid &= numpy.isfinite(block)
+
+        if not valid.all():
+            block = block[valid]
+
+        if block.size == 0:
+            continue
+
+        if shift is None:
+            shift = block[0]
+
+        block -= shift
+
+        n         += block.size
+        field_min  = min(field_min, block.min())
+        field_max  = max(field_max, block.max())
+        sum_x     += block.sum()
+        sum_xx    += numpy.dot(block, block)
+
+    if n == 0:
+        stats = {'n': 0, 'min': numpy.nan, 'max': numpy.nan, 'mean': numpy.nan, 'std': numpy.nan}
+    else:
+        mean_shifted = sum_x / n
+
+        stats = {'n':    n,
+                 'min':  field_min + shift,
+                 'max':  field_max + shift,
+                 'mean': mean_shifted + shift,
+                 'std':  numpy.sqrt(max(sum_xx / n - mean_shifted**2, 0.0))}
+
+    if debug: print __name__, 'stats: ', stats
+
+    return stats
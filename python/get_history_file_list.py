@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to get the sorted list of monthly atmosphere history files
+# (*cam.h0.YYYY-MM.nc) between begin_yr and end_yr in archive_dir,
+# along with the year and month index (0-11) of each file.
+
+import glob
+import os
+import re
+
+def get_history_file_list(archive_dir, begin_yr, end_yr, debug = False):
+
+    file_list  = []
+    year_list  = []
+    month_list = []
+
+    for yr in range(begin_yr, end_yr+1):
+        yr_files = sorted(glob.glob(archive_dir + '/*cam.h0.' + '%04d' % yr + '*.nc'))
+
+        for file_name in yr_files:
+            match = re.search(r'cam\.h0\.(\d{4})-(\d{2})\.nc$', os.path.basename(file_name))
+
+            if match is None:
+                if debug: print __name__, 'skipping: ', file_name
+                continue
+
+            file_list.append(file_name)
+            year_list.append(int(match.group(1)))
+            month_list.append(int(match.group(2)) - 1)
+
+    if debug: print __name__, 'number of files: ', len(file_list)
+
+    return file_list, year_list, month_list
@@ -0,0 +1,18 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+
+def get_monthly_sums_filename(indir,
+                              casename,
+                              field_name,
+                              begin_yr,
+                              end_yr):
+
+    file_name = indir + '/' + casename + '_monthly_sums.' + field_name + \
+                '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
+
+    return file_name
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+import numpy
+
+from read_monthly_data_ts import read_monthly_data_ts
+from get_season_months_index import get_season_months_index
+from get_days_in_season_months import get_days_in_season_months
+from get_reg_area_avg import get_reg_area_avg
+from aggregate_ts_weighted import aggregate_ts_weighted
+from get_reg_grid import get_reg_grid_index, read_reg_slab
+
+#Same as get_reg_seasonal_avg for a list of regions: the field is read once
+#for the union of the regions and the area averages of each region are
+#computed from it. Returns a (n_regions, nt) array of area (seasonal) averages.
+
+def get_multiple_reg_seasonal_avg (indir,
+              casename,
+              field_name,
+              interp_grid,
+              interp_method,
+              begin_yr,
+              end_yr,
+              begin_month,
+              end_month,
+              regs,
+              aggregate,
+              skip_yrs = 0,
+              debug = False):
+
+
+    field, lat_reg, lon_reg, area_reg, units_out = read_monthly_data_ts(indir = indir,
+                 casename = casename,
+                 field_name = field_name,
+                 interp_grid = interp_grid,
+                 interp_method = interp_method,
+                 begin_yr = begin_yr,
+                 end_yr = end_yr,
+                 begin_month = begin_month,
+                 end_month = end_month,
+                 reg = list(regs),
+                 skip_yrs = skip_yrs,
+                 debug = debug)
+
+    a, n_months_season = get_season_months_index(begin_month, end_month)
+
+    day_wgts = get_days_in_season_months(begin_month, end_month)
+    if debug: print __name__, 'day_wgts: ', day_wgts
+
+    for i, reg in enumerate(regs):
+
+        #Region subset of the union of regions read
+        reg_grid_index = get_reg_grid_index(lat_reg, lon_reg, reg, debug = debug)
+
+        area_average = get_reg_area_avg(field = read_reg_slab(field, reg_grid_index, leading = (slice(None),)),
+                        lat = reg_grid_index['lat_reg'],
+                        lon = reg_grid_index['lon_reg'],
+                        area_wgts = read_reg_slab(area_reg, reg_grid_index),
+                        debug = debug)
+
+        if aggregate == 1:
+            area_average = aggregate_ts_weighted(ts = area_average,
+                              bw = n_months_season,
+                              wgts = day_wgts,
+                              debug = debug)
+
+        if i == 0: area_seasonal_avg = numpy.zeros((len(regs), area_average.shape[0]))
+
+        area_seasonal_avg[i, :] = area_average
+
+    return area_seasonal_avg, n_months_season, units_out
@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to find the product of an earlier, shorter run of the same case,
+# i.e. the file named as file_name but with the years
+# begin_yr-prev_end_yr, prev_end_yr < end_yr, with the largest prev_end_yr.
+# Used to extend products incrementally when a run is extended.
+# Returns (None, None) if there is no such file.
+
+import glob
+import os
+import re
+
+def get_previous_file(file_name, begin_yr, end_yr, debug = False):
+
+    suffix = '.' + str(begin_yr) + '-' + str(end_yr) + '.nc'
+
+    if not file_name.endswith(suffix):
+        return None, None
+
+    prefix = file_name[:-len(suffix)]
+
+    prev_file   = None
+    prev_end_yr = None
+
+    for candidate in glob.glob(prefix + '.' + str(begin_yr) + '-*.nc'):
+        match = re.match(r'^(\d+)\.nc$', candidate[len(prefix + '.' + str(begin_yr) + '-'):])
+
+        if match is None:
+            continue
+
+        candidate_end_yr = int(match.group(1))
+
+        if candidate_end_yr >= begin_yr and candidate_end_yr < end_yr and \
+           (prev_end_yr is None or candidate_end_yr > prev_end_yr):
+            prev_file   = candidate
+            prev_end_yr = candidate_end_yr
+
+    if debug: print __name__, 'previous file: ', prev_file, prev_end_yr
+
+    return prev_file, prev_end_yr
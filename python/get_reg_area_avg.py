@@ -7,24 +7,19 @@
 #
 import numpy
 
+from get_weighted_avg import get_weighted_avg
+
 def get_reg_area_avg(field, lat, lon, area_wgts, debug = False):
     nlon = lon.shape[0]
     nlat = lat.shape[0]
-    if field.ndim == 2:
-        nt = 1
-    else:
-        nt   = field.shape[0]
 
     if debug: print __name__, 'nlon, nlat: ', nlon, nlat
 
+    #Masked points (e.g. land for SST) are left out of the normalization.
+    #Time steps without valid points are set to NaN
+    area_average = get_weighted_avg(field, area_wgts, axis = (-2, -1), debug = debug)
 
-    area_average = numpy.zeros(nt)
-
-    if field.ndim == 2:
-        area_average[0] = numpy.sum(field[:, :] * area_wgts[:, :])/numpy.sum(area_wgts)
-    else:
-        for i in range(0,nt):
-            area_average[i] = numpy.sum(field[i, :, :] * area_wgts[:, :])/numpy.sum(area_wgts)
+    area_average = numpy.ma.filled(area_average, numpy.nan).reshape(-1)
 
     print __name__, 'area_average.shape: ', area_average.shape
     if debug: print __name__, 'area weights: ', area_wgts
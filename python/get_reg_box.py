@@ -5,53 +5,32 @@
 # This software is released under the BSD license detailed
 # in the LICENSE file in the top level a-prime directory
 #
-def get_reg_box(reg):
-
-    if reg == "global":
-        lat_ll, lat_ul, lon_ll, lon_ul = -90, 90, 0, 360
-
-    if reg == "NH":
-        lat_ll, lat_ul, lon_ll, lon_ul = 0, 90, 0, 360
-        
-    if reg == "SH":
-        lat_ll, lat_ul, lon_ll, lon_ul = -90, 0, 0, 360
-
-    if reg == "SH_high_lats":
-        lat_ll, lat_ul, lon_ll, lon_ul = -90, -50, 0, 360
-
-    if reg == "SH_mid_lats":
-        lat_ll, lat_ul, lon_ll, lon_ul = -50, -20, 0, 360
-
-    if reg == "tropics":
-        lat_ll, lat_ul, lon_ll, lon_ul = -20, 20, 0, 360
-
-    if reg == "NH_mid_lats":
-        lat_ll, lat_ul, lon_ll, lon_ul = 20, 50, 0, 360
+#Registry of regions: (lat_ll, lat_ul, lon_ll, lon_ul), with lon_ll > lon_ul
+#for regions crossing the prime meridian
+
+reg_boxes = {
+    'global':                   (-90,  90,   0, 360),
+    'NH':                       (  0,  90,   0, 360),
+    'SH':                       (-90,   0,   0, 360),
+    'SH_high_lats':             (-90, -50,   0, 360),
+    'SH_mid_lats':              (-50, -20,   0, 360),
+    'tropics':                  (-20,  20,   0, 360),
+    'NH_mid_lats':              ( 20,  50,   0, 360),
+    'NH_high_lats':             ( 50,  90,   0, 360),
+    'Nino3':                    ( -5,   5, 210, 270),
+    'Nino3.4':                  ( -5,   5, 190, 240),
+    'Nino4':                    ( -5,   5, 160, 210),
+    'Tropical_Pacific':         ( -5,   5, 160, 270),
+    'Greater_Tropical_Pacific': (-30,  30, 120, 290),
+    'EPAC':                     ( -5,   5, 230, 280),
+    'INDO':                     ( -5,   5,  90, 140),
+}
 
-    if reg == "NH_high_lats":
-        lat_ll, lat_ul, lon_ll, lon_ul = 50, 90, 0, 360
-
-    if reg == "Nino3":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 210, 270
-
-    if reg == "Nino3.4":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 190, 240
-
-    if reg == "Nino4":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 160, 210
-
-    if reg == "Tropical_Pacific":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 160, 270
-        
-    if reg == "Greater_Tropical_Pacific":
-        lat_ll, lat_ul, lon_ll, lon_ul = -30, 30, 120, 290
+def get_reg_box(reg):
 
-    if reg == "EPAC":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 230, 280
+    if reg not in reg_boxes:
+        raise KeyError('Unknown region: ' + str(reg) + ', known regions: ' + ', '.join(sorted(reg_boxes)))
 
-    if reg == "INDO":
-        lat_ll, lat_ul, lon_ll, lon_ul = -5, 5, 90, 140
+    lat_ll, lat_ul, lon_ll, lon_ul = reg_boxes[reg]
 
     return (lat_ll, lat_ul, lon_ll, lon_ul)
-
-
@@ -0,0 +1,152 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Precomputed region subsets of lat/lon grids, used by the readers
+# (read_climo_file, read_monthly_data_ts_field) instead of rebuilding
+# the region masks and index arrays for every field read.
+#
+# get_reg_grid_index returns, for a grid (its lat and lon values) and a
+# region of get_reg_box, the region lat/lon values and index arrays and
+# the same indices as lists of contiguous slices: one slice for lat and
+# one slice for lon, or two for regions wrapping around the end of the
+# lon axis. Results are cached per grid and region. A list of regions
+# selects the union of the regions, e.g. to read a field once for all the
+# regions of a plot (see get_multiple_reg_seasonal_avg).
+#
+# get_reg_grid adds the region area weights (from "area", or from "gw"
+# if the file has no "area"), read with slices and cached per grid file
+# and region.
+#
+# read_reg_slab reads a region from a netCDF variable or numpy array
+# with at most one contiguous read per slab.
+
+import hashlib
+import os
+
+import numpy
+
+from get_reg_box import get_reg_box
+
+reg_grid_index_cache = {}
+reg_grid_cache = {}
+
+
+def get_index_slices(index):
+
+    #Runs of consecutive indices, e.g. [0, 1, 2, 7, 8] -> [0:3, 7:9]
+    if index.size == 0:
+        return []
+
+    breaks = numpy.where(numpy.diff(index) != 1)[0] + 1
+    starts = numpy.concatenate(([0], breaks))
+    ends   = numpy.concatenate((breaks, [index.size]))
+
+    return [slice(index[s], index[e-1] + 1) for s, e in zip(starts, ends)]
+
+
+def get_reg_grid_index(lat, lon, reg, debug = False):
+
+    lat = numpy.ma.getdata(lat[:])
+    lon = numpy.ma.getdata(lon[:])
+
+    if isinstance(reg, list):
+        reg = tuple(reg)
+
+    grid_key = (hashlib.md5(lat.tobytes()).hexdigest(),
+                hashlib.md5(lon.tobytes()).hexdigest(), reg)
+
+    if grid_key in reg_grid_index_cache:
+        return reg_grid_index_cache[grid_key]
+
+    if isinstance(reg, tuple):
+        regs = reg
+    else:
+        regs = (reg,)
+
+    lat_reg_boolean = numpy.zeros(lat.shape, dtype = bool)
+    lon_reg_boolean = numpy.zeros(lon.shape, dtype = bool)
+
+    for reg_temp in regs:
+        lat_ll, lat_ul, lon_ll, lon_ul = get_reg_box(reg_temp)
+
+        print __name__, reg_temp, 'lat_ll, lat_ul, lon_ll, lon_ul: ', lat_ll, lat_ul, lon_ll, lon_ul
+
+        lat_reg_boolean |= numpy.logical_and(lat >= lat_ll, lat <= lat_ul)
+
+        if lon_ll > lon_ul:
+            lon_reg_boolean |= numpy.logical_or(lon >= lon_ll, lon <= lon_ul)
+        else:
+            lon_reg_boolean |= numpy.logical_and(lon >= lon_ll, lon <= lon_ul)
+
+    lat_index_reg = numpy.where(lat_reg_boolean)[0]
+    lon_index_reg = numpy.where(lon_reg_boolean)[0]
+
+    reg_grid_index = {'lat_reg':       lat[lat_index_reg],
+                      'lon_reg':       lon[lon_index_reg],
+                      'lat_index_reg': lat_index_reg,
+                      'lon_index_reg': lon_index_reg,
+                      'lat_slices':    get_index_slices(lat_index_reg),
+                      'lon_slices':    get_index_slices(lon_index_reg)}
+
+    if debug: print __name__, 'lat_slices: ', reg_grid_index['lat_slices']
+    if debug: print __name__, 'lon_slices: ', reg_grid_index['lon_slices']
+
+    reg_grid_index_cache[grid_key] = reg_grid_index
+
+    return reg_grid_index
+
+
+def read_reg_slab(var, reg_grid_index, leading = ()):
+
+    #Reads var[leading + (lat region, lon region)], one read per lat/lon slab
+    if not reg_grid_index['lat_slices'] or not reg_grid_index['lon_slices']:
+        return var[leading + (slice(0, 0), slice(0, 0))]
+
+    lat_slabs = []
+
+    for lat_slice in reg_grid_index['lat_slices']:
+        lon_slabs = [var[leading + (lat_slice, lon_slice)] for lon_slice in reg_grid_index['lon_slices']]
+
+        if len(lon_slabs) == 1:
+            lat_slabs.append(lon_slabs[0])
+        else:
+            lat_slabs.append(numpy.ma.concatenate(lon_slabs, axis = -1))
+
+    if len(lat_slabs) == 1:
+        return lat_slabs[0]
+    else:
+        return numpy.ma.concatenate(lat_slabs, axis = -2)
+
+
+def get_reg_grid(f, file_name, reg, debug = False):
+
+    file_name = os.path.abspath(file_name)
+    file_key  = (file_name, os.path.getmtime(file_name), tuple(reg) if isinstance(reg, list) else reg)
+
+    if file_key not in reg_grid_cache:
+        reg_grid_cache[file_key] = read_reg_grid(f, reg, debug = debug)
+
+    #Copies, so that callers may modify the arrays they get
+    return dict((k, v.copy() if isinstance(v, numpy.ndarray) else v)
+                for k, v in reg_grid_cache[file_key].items())
+
+
+def read_reg_grid(f, reg, debug = False):
+
+    reg_grid = dict(get_reg_grid_index(f.variables['lat'], f.variables['lon'], reg, debug = debug))
+
+    if 'area' in f.variables:
+        reg_grid['area_reg'] = read_reg_slab(f.variables['area'], reg_grid)
+    else:
+        #Getting area weights from gw if "area" is not available in the file
+        print __name__, 'Computing area weights from gw'
+
+        gw = f.variables['gw'][:]
+        reg_grid['area_reg'] = numpy.outer(gw[reg_grid['lat_index_reg']],
+                                           numpy.ones(reg_grid['lon_index_reg'].size))
+
+    return reg_grid
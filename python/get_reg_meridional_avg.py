@@ -7,13 +7,16 @@
 #
 import numpy
 
+from get_weighted_avg import get_weighted_avg
+
 def get_reg_meridional_avg(field, area_wgts, debug = False):
 
     #The following should work for both 2 dimensions as well as 3 dimensions
     #since model variables are stored as (time, lat, lon) or (lat, lon) in netcdf files,
     #lat is the second axis from the end (-2)
+    #Masked points are left out of the normalization
 
-    meridional_avg = numpy.sum(field * area_wgts, axis = -2)/numpy.sum(area_wgts, axis = -2)
+    meridional_avg = get_weighted_avg(field, area_wgts, axis = -2, debug = debug)
 
     print __name__, 'meridional_avg.shape: ', meridional_avg.shape
     if debug: print __name__, 'area weighted meridional avg.: ', meridional_avg
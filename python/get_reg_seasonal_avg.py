@@ -25,6 +25,7 @@ def get_reg_seasonal_avg (indir,
                 end_month,
               reg,
               aggregate,
+              skip_yrs = 0,
               debug = False):
 
 
@@ -38,6 +39,7 @@ def get_reg_seasonal_avg (indir,
                  begin_month = begin_month,
                  end_month = end_month,
                  reg = reg,
+                 skip_yrs = skip_yrs,
                  debug = debug)
 
 
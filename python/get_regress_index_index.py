@@ -6,7 +6,6 @@
 # in the LICENSE file in the top level a-prime directory
 #
 import numpy
-from scipy import stats
 from netCDF4 import Dataset
 
 from read_monthly_data_ts import read_monthly_data_ts
@@ -95,6 +94,8 @@ def get_regress_index_index (indir,
         field = field_seasonal_avg
 
 
+    from scipy import stats
+
     regr_coef, intercept, r_value, p_value, std_err = stats.linregress(index, field)
 
     units = units_field + '/' + units_index
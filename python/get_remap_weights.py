@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to get the remapping operator of a weights file (see read_remap_weights)
+# through a persistent cache shared by all variables, seasons and cases.
+#
+# The CSR arrays and destination grid of each weights file are saved as .npy
+# files in cache_dir/<md5 checksum of the weights file>/ and memory-mapped
+# on later calls, so that the weights file is parsed only once. The checksum
+# of each weights file version (path, size, modification time) is itself
+# kept in cache_dir/<sha1 of path, size and mtime>.md5 so that it is only
+# computed once. cache_dir = None reads the weights file directly.
+
+import hashlib
+import os
+import numpy
+from scipy import sparse
+
+from read_remap_weights import read_remap_weights
+from scratch_cache import get_file_checksum, get_temp_filename
+
+operator_arrays = ['S_data', 'S_indices', 'S_indptr', 'S_shape', 'lat', 'lon', 'area', 'frac']
+
+
+def get_remap_weights(wgt_file, cache_dir = None, debug = False):
+
+    if cache_dir is None:
+        return read_remap_weights(wgt_file, debug = debug)
+
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            pass
+
+    stat = os.stat(wgt_file)
+    stat_key = hashlib.sha1(os.path.abspath(wgt_file) + '|' + str(stat.st_size) + '|' + \
+                            str(int(stat.st_mtime))).hexdigest()
+
+    checksum_file = os.path.join(cache_dir, stat_key + '.md5')
+
+    if os.path.isfile(checksum_file):
+        with open(checksum_file, 'r') as f:
+            checksum = f.read().strip()
+    else:
+        checksum = get_file_checksum(wgt_file)
+
+        temp_file = get_temp_filename(checksum_file)
+        with open(temp_file, 'w') as f:
+            f.write(checksum)
+        os.rename(temp_file, checksum_file)
+
+    operator_dir = os.path.join(cache_dir, checksum)
+
+    if os.path.isdir(operator_dir):
+        print __name__, 'using cached remapping operator: ', operator_dir
+
+        arrays = {}
+        for name in operator_arrays:
+            arrays[name] = numpy.load(os.path.join(operator_dir, name + '.npy'), mmap_mode = 'r')
+
+        weights = {'S':    sparse.csr_matrix((arrays['S_data'], arrays['S_indices'], arrays['S_indptr']),
+                                             shape = tuple(arrays['S_shape']), copy = False),
+                   'lat':  arrays['lat'],
+                   'lon':  arrays['lon'],
+                   'area': arrays['area'],
+                   'frac': arrays['frac']}
+
+        return weights
+
+    weights = read_remap_weights(wgt_file, debug = debug)
+
+    S = weights['S']
+
+    arrays = {'S_data':    S.data,
+              'S_indices': S.indices,
+              'S_indptr':  S.indptr,
+              'S_shape':   numpy.array(S.shape),
+              'lat':       weights['lat'],
+              'lon':       weights['lon'],
+              'area':      numpy.ma.filled(weights['area']),
+              'frac':      numpy.ma.filled(weights['frac'])}
+
+    #Writing to a temporary directory renamed once complete
+    temp_dir = get_temp_filename(operator_dir)
+    os.makedirs(temp_dir)
+
+    for name in operator_arrays:
+        numpy.save(os.path.join(temp_dir, name + '.npy'), numpy.asarray(arrays[name]))
+
+    try:
+        os.rename(temp_dir, operator_dir)
+        print __name__, 'cached remapping operator: ', operator_dir
+    except OSError:
+        #Another process cached the same operator first
+        for name in operator_arrays:
+            os.remove(os.path.join(temp_dir, name + '.npy'))
+        os.rmdir(temp_dir)
+
+    return weights
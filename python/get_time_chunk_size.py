@@ -0,0 +1,32 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to get the number of time steps of a (time, ...) field that can be
+# read at once within a memory budget given in MB. The budget also
+# covers the 12 monthly float64 accumulators and a factor of two on
+# each chunk for masks and temporaries. Returns None if
+# max_memory_mb <= 0, i.e. no limit.
+
+import numpy
+
+def get_time_chunk_size(field, max_memory_mb, debug = False):
+
+    if max_memory_mb is None or max_memory_mb <= 0:
+        return None
+
+    npts_per_time = int(numpy.prod(field.shape[1:]))
+
+    bytes_accumulators = 2 * 12 * npts_per_time * 8
+    bytes_per_time     = 2 * npts_per_time * field.dtype.itemsize
+
+    bytes_chunks = max_memory_mb * 1024.0 * 1024.0 - bytes_accumulators
+
+    chunk_size = max(1, int(bytes_chunks/bytes_per_time))
+
+    if debug: print __name__, 'chunk_size: ', chunk_size
+
+    return chunk_size
@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+import numpy
+
+#Weighted average of field**power over the given axes (area average: the
+#last two axes, lat and lon; meridional average: axis -2, lat), shared by
+#get_reg_area_avg, get_reg_area_avg_rmse and get_reg_meridional_avg.
+#
+#wgts has the shape of the trailing dimensions of field, e.g. (lat, lon)
+#for a (time, lat, lon) field. Masked points of field are left out of both
+#the weighted sum and the sum of weights used to normalize it, so averages
+#over e.g. land masked SST only count ocean points. The sum of weights is
+#computed once for all time steps if field has no masked points.
+#
+#Returns a masked array, masked where no valid weights were left, if field
+#is a masked array; a numpy array otherwise.
+
+def get_weighted_avg(field, wgts, axis = (-2, -1), power = 1, debug = False):
+
+    if numpy.isscalar(axis):
+        axis = (axis,)
+
+    axis = tuple(sorted(a % field.ndim for a in axis))
+
+    wgts = numpy.ma.filled(wgts, 0.0).astype(numpy.float64)
+
+    mask  = numpy.ma.getmask(field)
+    field = numpy.ma.getdata(field)
+
+    if power != 1:
+        field = numpy.power(field, power)
+
+    if mask is not numpy.ma.nomask:
+        valid = numpy.logical_not(mask).astype(numpy.float64)
+        field = numpy.where(mask, 0.0, field)
+
+    #Weights cover all reduced axes and the axes after them: contract with
+    #tensordot, without forming the weighted field (time, lat, lon) array
+    trailing = tuple(range(field.ndim - wgts.ndim, field.ndim))
+
+    if axis == trailing:
+        wgts_axes = range(wgts.ndim)
+        wgts_sum  = numpy.tensordot(field, wgts, axes = (axis, wgts_axes))
+
+        if mask is numpy.ma.nomask:
+            norm = wgts.sum()
+        else:
+            norm = numpy.tensordot(valid, wgts, axes = (axis, wgts_axes))
+    else:
+        wgts_sum = numpy.sum(field * wgts, axis = axis)
+
+        if mask is numpy.ma.nomask:
+            norm = numpy.sum(wgts, axis = tuple(a - field.ndim + wgts.ndim for a in axis))
+        else:
+            norm = numpy.sum(valid * wgts, axis = axis)
+
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        weighted_avg = wgts_sum / norm
+
+    if mask is not numpy.ma.nomask:
+        weighted_avg = numpy.ma.masked_where(norm == 0, weighted_avg)
+
+    if debug: print __name__, 'weighted_avg.shape: ', numpy.shape(weighted_avg)
+
+    return weighted_avg
@@ -6,12 +6,6 @@
 # in the LICENSE file in the top level a-prime directory
 #
 
-import matplotlib as mpl
-#changing the default backend to agg to resolve contouring issue on rhea
-mpl.use('Agg')
-
-from   mpl_toolkits.basemap import Basemap
-import matplotlib.pyplot as plt
 import math
 import numpy
 
@@ -22,6 +16,12 @@ from round_to_first        import round_to_first
 from get_reg_area_avg      import get_reg_area_avg
 from get_reg_area_avg_rmse import get_reg_area_avg_rmse
 from read_climo_file       import read_climo_file
+from get_basemap           import get_basemap, get_basemap_xy
+from get_field_stats       import get_field_stats
+from get_contour_levels    import get_contour_levels
+from compute_contour_levels import compute_climo_contour_levels
+from save_plot             import save_plot
+from plot_data_file        import write_plot_data_file, read_plot_data_file
 from optparse            import OptionParser
 
 parser = OptionParser(usage = "python %prog [options]")
@@ -74,196 +74,308 @@ parser.add_option("--ref_interp_method", dest = "ref_interp_method",
 parser.add_option("--plots_dir", dest = "plots_dir",
                     help = "filepath to plots directory")
 
-(options, args) = parser.parse_args()
-
-indir                = options.indir
-casename            = options.casename
-field_name            = options.field_name
-begin_yr            = options.begin_yr
-end_yr                = options.end_yr
-begin_month            = options.begin_month
-end_month            = options.end_month
-interp_grid            = options.interp_grid
-interp_method             = options.interp_method
-ref_case_dir           = options.ref_case_dir
-ref_case           = options.ref_case
-ref_begin_yr            = options.ref_begin_yr
-ref_end_yr        = options.ref_end_yr
-ref_interp_grid         = options.ref_interp_grid
-ref_interp_method       = options.ref_interp_method
-plots_dir              = options.plots_dir
-
-#Get filename
-season = get_season_name(begin_month, end_month)
-
-print
-print 'Reading climo file for case: ', casename
-print
-
-field, lat, lon, area, units = read_climo_file(indir = indir, \
-                     casename = casename, \
-                     season = season, \
-                     field_name = field_name, \
-                     begin_yr = begin_yr, \
-                     end_yr = end_yr, \
-                     interp_grid = interp_grid, \
-                     interp_method = interp_method, \
-                     reg = 'global')
-
-print
-print 'Reading climo file for case: ', ref_case
-print
-
-field_ref_case, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
-                         casename = ref_case, \
+parser.add_option("--replot", dest = "replot",
+                    help = "plot data file (see plot_data_file.py) to plot again, without reading the climo files")
+
+
+def plot_climo (indir,
+                casename,
+                field_name,
+                begin_yr,
+                end_yr,
+                begin_month,
+                end_month,
+                interp_grid,
+                interp_method,
+                ref_case_dir,
+                ref_case,
+                ref_begin_yr,
+                ref_end_yr,
+                ref_interp_grid,
+                ref_interp_method,
+                plots_dir,
+                debug = False):
+
+    #Get filename
+    season = get_season_name(begin_month, end_month)
+
+    print
+    print 'Reading climo file for case: ', casename
+    print
+
+    field, lat, lon, area, units = read_climo_file(indir = indir, \
+                         casename = casename, \
                          season = season, \
                          field_name = field_name, \
-                         begin_yr = ref_begin_yr, \
-                         end_yr = ref_end_yr, \
-                         interp_grid = ref_interp_grid, \
-                         interp_method = ref_interp_method,
+                         begin_yr = begin_yr, \
+                         end_yr = end_yr, \
+                         interp_grid = interp_grid, \
+                         interp_method = interp_method, \
                          reg = 'global')
 
+    print
+    print 'Reading climo file for case: ', ref_case
+    print
+
+    #Files the reference field is read from, to recompute its contour levels
+    #if they change (see get_contour_levels)
+    ref_input_files = []
+
+    field_ref_case, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
+                             casename = ref_case, \
+                             season = season, \
+                             field_name = field_name, \
+                             begin_yr = ref_begin_yr, \
+                             end_yr = ref_end_yr, \
+                             interp_grid = ref_interp_grid, \
+                             interp_method = ref_interp_method,
+                             reg = 'global',
+                             input_files = ref_input_files)
+
+
+
+    field_stats = get_field_stats(field)
+
+    field_max = field_stats['max']
+    field_min = field_stats['min']
+    field_avg = get_reg_area_avg(field, lat, lon, area)
+
+    #Computing levels using mean and standard deviation, once per reference
+    #field for all the test cases plotted against it (see get_contour_levels)
+    num = 11
+
+    levels_key = (ref_case, field_name, season, ref_begin_yr, ref_end_yr, ref_interp_grid, ref_interp_method)
+
+    levels, ref_stats = get_contour_levels(levels_key, field_ref_case, compute_climo_contour_levels,
+                                           n_stddev = 4.0, num_levels = num,
+                                           input_files = ref_input_files)
+
+    field_ref_case_max = ref_stats['max']
+    field_ref_case_min = ref_stats['min']
+    field_ref_case_avg = get_reg_area_avg(field_ref_case, lat, lon, area)
+
+    print
+    print 'For climatology plots: '
+    print 'mean, stddev, min_plot, max_plot ref_case: ', \
+            ref_stats['mean'], ref_stats['std'], levels[0], levels[-1]
+    print 'min, max field: ', field_min, field_max
+    print 'levels:', levels
+    print
+
+
+    #Computing levels for diff plot using mean and standard deviation
+    field_diff      = field[:, :] - field_ref_case[:, :]
+    field_diff_mean = field_avg - field_ref_case_avg
+    field_diff_rmse = get_reg_area_avg_rmse(field_diff, lat, lon, area)
+    diff_stats      = get_field_stats(field_diff)
+    field_diff_min  = diff_stats['min']
+    field_diff_max  = diff_stats['max']
+
+    num         = 11
+    max_plot    = round_to_first(4.0 * diff_stats['std'])
+    levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+
+    print
+    print 'For difference plot: '
+    print 'mean, stddev, max_plot: ', \
+            diff_stats['mean'], diff_stats['std'], max_plot
+    print 'min, max: ', field_diff_min, field_diff_max
+    print 'contour levels: ', levels_diff
+
+
+    outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
+                       + field_name + '_climo_' + season
+
+    #Arrays and numbers drawn, saved to redraw the plot (see plot_data_file)
+    plot_data = {'casename':           casename,
+                 'ref_case':           ref_case,
+                 'field_name':         field_name,
+                 'units':              units,
+                 'season':             season,
+                 'lat':                lat,
+                 'lon':                lon,
+                 'field':              field,
+                 'field_ref_case':     field_ref_case,
+                 'field_diff':         field_diff,
+                 'levels':             levels,
+                 'levels_diff':        levels_diff,
+                 'field_avg':          field_avg,
+                 'field_min':          field_min,
+                 'field_max':          field_max,
+                 'field_ref_case_avg': field_ref_case_avg,
+                 'field_ref_case_min': field_ref_case_min,
+                 'field_ref_case_max': field_ref_case_max,
+                 'field_diff_mean':    field_diff_mean,
+                 'field_diff_rmse':    field_diff_rmse,
+                 'field_diff_min':     field_diff_min,
+                 'field_diff_max':     field_diff_max}
 
+    write_plot_data_file(outfile, 'plot_climo', plot_data)
 
-field_max = numpy.max(field[:])
-field_min = numpy.min(field[:])
-field_avg = get_reg_area_avg(field, lat, lon, area)
-
-field_ref_case_max = numpy.max(field_ref_case[:])
-field_ref_case_min = numpy.min(field_ref_case[:])
-field_ref_case_avg = get_reg_area_avg(field_ref_case, lat, lon, area)
-
-
-#Computing levels using mean and standard deviation
-num = 11
+    draw_climo(plot_data, outfile)
 
-max_plot_temp = numpy.ma.mean(field_ref_case[:]) + \
-                          4.0 * numpy.ma.std(field_ref_case[:])
-if max_plot_temp > numpy.ma.max(field_ref_case[:]):
-        max_plot_temp = numpy.ma.max(field_ref_case[:])
 
-max_plot      = round_to_first(max_plot_temp)
+def draw_climo(plot_data, outfile):
 
-min_plot_temp = numpy.ma.mean(field_ref_case[:]) - \
-                          4.0 * numpy.ma.std(field_ref_case[:])
+    #Imported here, as pyplot is slow to import: --help returns without it
+    #and batch workers (plot_climo_batch) import it once
+    import matplotlib as mpl
+    #changing the default backend to agg to resolve contouring issue on rhea
+    #(already set if pyplot was imported, e.g. by plot_climo_batch)
+    mpl.use('Agg', warn = False)
+    import matplotlib.pyplot as plt
 
-if min_plot_temp < numpy.ma.min(field_ref_case[:]):
-        min_plot_temp = numpy.ma.min(field_ref_case[:])
+    casename    = plot_data['casename']
+    ref_case    = plot_data['ref_case']
+    field_name  = plot_data['field_name']
+    units       = plot_data['units']
+    season      = plot_data['season']
+    lat         = plot_data['lat']
+    lon         = plot_data['lon']
+    levels      = plot_data['levels']
+    levels_diff = plot_data['levels_diff']
 
-min_plot      = round_to_first(min_plot_temp)
+    field          = plot_data['field']
+    field_ref_case = plot_data['field_ref_case']
+    field_diff     = plot_data['field_diff']
 
-levels = numpy.linspace(min_plot, max_plot, num = num)
+    field_avg          = plot_data['field_avg']
+    field_min          = plot_data['field_min']
+    field_max          = plot_data['field_max']
+    field_ref_case_avg = plot_data['field_ref_case_avg']
+    field_ref_case_min = plot_data['field_ref_case_min']
+    field_ref_case_max = plot_data['field_ref_case_max']
+    field_diff_mean    = plot_data['field_diff_mean']
+    field_diff_rmse    = plot_data['field_diff_rmse']
+    field_diff_min     = plot_data['field_diff_min']
+    field_diff_max     = plot_data['field_diff_max']
 
-print
-print 'For climatology plots: '
-print 'mean, stddev, min_plot, max_plot ref_case: ', \
-        numpy.ma.mean(field_ref_case[:]), numpy.ma.std(field_ref_case[:]), min_plot, max_plot
-print 'min, max field: ', field_min, field_max
-print 'levels:', levels
-print
+    #Plot climotology
+    f = plt.figure(figsize=(8.5, 11))
 
+    plt.suptitle(field_name + ' (' + units + ') ' + season, fontsize = 20)
 
-#Plot climotology
-f = plt.figure(figsize=(8.5, 11))
+    #Plot test_case
+    ax = f.add_subplot(3,1,1)
 
-plt.suptitle(field_name + ' (' + units + ') ' + season, fontsize = 20)
+    ax.set_title(casename)
 
-#Plot test_case
-ax = f.add_subplot(3,1,1)
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
-ax.set_title(casename)
+    m.drawcoastlines()
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    x, y = get_basemap_xy(m, lat, lon)
 
-m.drawcoastlines()
+    c = m.contourf(x, y, field[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
+    cb = m.colorbar(c)
 
-lons, lats = numpy.meshgrid(lon,lat)
-x, y = m(lons,lats)
+    text_data = 'mean = ' + str(round(field_avg, 2)) + ', ' + \
+                                   'min = '  + str(round(field_min, 2)) + ', ' + \
+                                   'max = '  + str(round(field_max, 2))
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
-c = m.contourf(x, y, field[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
-cb = m.colorbar(c)
 
-text_data = 'mean = ' + str(round(field_avg, 2)) + ', ' + \
-                               'min = '  + str(round(field_min, 2)) + ', ' + \
-                               'max = '  + str(round(field_max, 2))
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+    #Plot ref_case
+    ax = f.add_subplot(3,1,2)
 
+    ax.set_title(ref_case)
 
-#Plot ref_case
-ax = f.add_subplot(3,1,2)
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
+
+    m.drawcoastlines()
 
-ax.set_title(ref_case)
+    c = m.contourf(x, y, field_ref_case[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
+    cb = m.colorbar(c)
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    text_data = 'mean = ' + str(round(field_ref_case_avg, 2)) + ', ' + \
+                'min = '  + str(round(field_ref_case_min, 2)) + ', ' + \
+                'max = '  + str(round(field_ref_case_max, 2))
 
-m.drawcoastlines()
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
-c = m.contourf(x, y, field_ref_case[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
-cb = m.colorbar(c)
 
-text_data = 'mean = ' + str(round(field_ref_case_avg, 2)) + ', ' + \
-            'min = '  + str(round(field_ref_case_min, 2)) + ', ' + \
-            'max = '  + str(round(field_ref_case_max, 2))
+    #Plot difference plot
+    ax = f.add_subplot(3,1,3)
 
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+    #ax.set_title(casename + ' - ' + ref_case)
+    ax.set_title('Difference')
 
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
+    m.drawcoastlines()
 
-#Computing levels for diff plot using mean and standard deviation
-field_diff      = field[:, :] - field_ref_case[:, :]
-field_diff_mean = field_avg - field_ref_case_avg
-field_diff_rmse = get_reg_area_avg_rmse(field_diff, lat, lon, area)
-field_diff_min  = numpy.min(field_diff)
-field_diff_max  = numpy.max(field_diff)
+    c = m.contourf(x, y, field_diff[:, :], cmap = 'seismic', levels = levels_diff, extend = 'both')
+    cb = m.colorbar()
 
-num         = 11
-max_plot    = round_to_first(4.0 * numpy.ma.std(field_diff))
-levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+    text_data = 'RMSE = ' + str(round(field_diff_rmse, 2))+ ', ' + \
+            'mean bias = ' + str(round(field_diff_mean, 2))+ ', ' + \
+                'min = '  + str(round(field_diff_min, 2)) + ', ' + \
+                'max = '  + str(round(field_diff_max, 2))
 
-print
-print 'For difference plot: '
-print 'mean, stddev, max_plot: ', \
-        numpy.ma.mean(field_diff), numpy.ma.std(field_diff), max_plot
-print 'min, max: ', numpy.ma.min(field_diff), numpy.ma.max(field_diff)
-print 'contour levels: ', levels_diff
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
-#Plot difference plot
-ax = f.add_subplot(3,1,3)
+    #Fill contour was buggy when plotting negative values, so we use image plots with line contours overlayed as another option
+    #Contour seems to be fixed now with a different backend
+    #c = m.imshow(field_diff, cmap = 'seismic', vmin = -max_abs, vmax = max_abs, filternorm = 0, interpolation = 'nearest')
+    #cb = m.colorbar(extend = 'both')
+    #c = m.contour(x, y, field_diff, levels = levels_diff, colors = 'k', extend = 'both', linewidths = 0.25)
 
-#ax.set_title(casename + ' - ' + ref_case)
-ax.set_title('Difference')
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
-m.drawcoastlines()
 
-c = m.contourf(x, y, field_diff[:, :], cmap = 'seismic', levels = levels_diff, extend = 'both')
-cb = m.colorbar()
+    save_plot(outfile)
 
-text_data = 'RMSE = ' + str(round(field_diff_rmse, 2))+ ', ' + \
-        'mean bias = ' + str(round(field_diff_mean, 2))+ ', ' + \
-            'min = '  + str(round(field_diff_min, 2)) + ', ' + \
-            'max = '  + str(round(field_diff_max, 2))
+    #plt.show()
 
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+    #Closing the figure, which would otherwise be kept by batch workers
+    plt.close(f)
 
-#Fill contour was buggy when plotting negative values, so we use image plots with line contours overlayed as another option
-#Contour seems to be fixed now with a different backend
-#c = m.imshow(field_diff, cmap = 'seismic', vmin = -max_abs, vmax = max_abs, filternorm = 0, interpolation = 'nearest')
-#cb = m.colorbar(extend = 'both')
-#c = m.contour(x, y, field_diff, levels = levels_diff, colors = 'k', extend = 'both', linewidths = 0.25)
 
+def replot_climo(plot_data_file, plots_dir):
 
-mpl.rcParams['savefig.dpi']=300
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_climo')
 
-outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
-                   + field_name + '_climo_' + season + '.png'
+    draw_climo(plot_data, plots_dir + '/' + plot_name)
 
-plt.savefig(outfile)
 
-#plt.show()
+if __name__ == "__main__":
+    (options, args) = parser.parse_args()
 
+    if options.replot is not None:
+        replot_climo(options.replot, options.plots_dir)
 
+    else:
+        indir                = options.indir
+        casename            = options.casename
+        field_name            = options.field_name
+        begin_yr            = options.begin_yr
+        end_yr                = options.end_yr
+        begin_month            = options.begin_month
+        end_month            = options.end_month
+        interp_grid            = options.interp_grid
+        interp_method             = options.interp_method
+        ref_case_dir           = options.ref_case_dir
+        ref_case           = options.ref_case
+        ref_begin_yr            = options.ref_begin_yr
+        ref_end_yr        = options.ref_end_yr
+        ref_interp_grid         = options.ref_interp_grid
+        ref_interp_method       = options.ref_interp_method
+        plots_dir              = options.plots_dir
 
+        plot_climo (indir = indir,
+                    casename = casename,
+                    field_name = field_name,
+                    begin_yr = begin_yr,
+                    end_yr = end_yr,
+                    begin_month = begin_month,
+                    end_month = end_month,
+                    interp_grid = interp_grid,
+                    interp_method = interp_method,
+                    ref_case_dir = ref_case_dir,
+                    ref_case = ref_case,
+                    ref_begin_yr = ref_begin_yr,
+                    ref_end_yr = ref_end_yr,
+                    ref_interp_grid = ref_interp_grid,
+                    ref_interp_method = ref_interp_method,
+                    plots_dir = plots_dir)
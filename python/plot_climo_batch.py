@@ -0,0 +1,174 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+#python script to plot a list of climatology figures (plot_climo.py and
+#plot_climo_vector.py jobs) from a pool of worker processes, instead of
+#starting one python process per field and season.
+#
+#Each line of the job file is one figure:
+#
+#   <script> <log file> <options of the script>
+#
+#e.g.
+#   plot_climo.py plot_climo_case-obs.PRECT.ANN.log --indir ... -f PRECT ...
+#
+#Workers are forked once matplotlib and Basemap are imported and the global
+#map projection is set up (see get_basemap), so that all figures share them.
+#Jobs plotting the same field and season (i.e. the same reference field) are
+#run by the same worker, which reads the reference field once (see
+#ts_field_cache).
+#
+#Jobs with the --replot option of the scripts draw a figure again from its
+#plot data file (see plot_data_file).
+
+import matplotlib as mpl
+#changing the default backend to agg to resolve contouring issue on rhea
+mpl.use('Agg')
+
+#Imported before the workers are forked, not used here directly
+from   mpl_toolkits.basemap import Basemap
+import matplotlib.pyplot as plt
+
+import multiprocessing
+import shlex
+import sys
+import traceback
+
+from collections import OrderedDict
+from optparse    import OptionParser
+
+import plot_climo
+import plot_climo_vector
+
+from get_basemap import get_basemap
+from save_plot   import wait_for_saved_plots
+
+plot_scripts = {'plot_climo.py':        (plot_climo.plot_climo,               plot_climo.replot_climo,
+                                         plot_climo.parser),
+                'plot_climo_vector.py': (plot_climo_vector.plot_climo_vector, plot_climo_vector.replot_climo_vector,
+                                         plot_climo_vector.parser)}
+
+
+def read_plot_jobs(job_file):
+
+    jobs = []
+
+    for line in open(job_file):
+        words = shlex.split(line)
+
+        if not words or words[0].startswith('#'):
+            continue
+
+        script   = words[0].split('/')[-1]
+        log_file = words[1]
+
+        if script not in plot_scripts:
+            raise ValueError('Unknown plot script in ' + job_file + ': ' + words[0])
+
+        (options, args) = plot_scripts[script][2].parse_args(words[2:])
+
+        jobs.append((script, log_file, vars(options)))
+
+    return jobs
+
+
+def run_plot_job(job):
+
+    script, log_file, options = job
+
+    #Output of each figure goes to its own log file, as with one process per figure
+    stdout, stderr = sys.stdout, sys.stderr
+    log = open(log_file, 'w')
+
+    sys.stdout = log
+    sys.stderr = log
+
+    try:
+        options = dict(options)
+        replot  = options.pop('replot')
+
+        if replot is not None:
+            plot_scripts[script][1](replot, options['plots_dir'])
+        else:
+            plot_scripts[script][0](**options)
+
+        status = 0
+
+    except Exception:
+        traceback.print_exc()
+        status = 1
+
+    finally:
+        #Plots written in the background (see save_plot) report their errors
+        #to the log of their job, and pool workers exit without waiting for
+        #them
+        try:
+            wait_for_saved_plots()
+        except IOError as e:
+            print e
+            status = 1
+
+        sys.stdout, sys.stderr = stdout, stderr
+        log.close()
+
+    return log_file, status
+
+
+def run_plot_jobs(jobs):
+
+    return [run_plot_job(job) for job in jobs]
+
+
+if __name__ == "__main__":
+    parser = OptionParser(usage = "python %prog [options] job_file")
+
+    parser.add_option("-n", "--n_workers", dest = "n_workers", type = "int",
+                        help = "number of worker processes (0: number of cores)", default = 0)
+
+    (options, args) = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error('one job file expected')
+
+    n_workers = options.n_workers
+    job_file  = args[0]
+
+    if n_workers <= 0:
+        n_workers = multiprocessing.cpu_count()
+
+    jobs = read_plot_jobs(job_file)
+
+    #Grouping jobs by reference field: script, field, season
+    groups = OrderedDict()
+
+    for job in jobs:
+        script, log_file, job_options = job
+        key = (script, job_options['field_name'], job_options['begin_month'], job_options['end_month'])
+        groups.setdefault(key, []).append(job)
+
+    #Projection and coastlines of the climatology maps, set up before forking
+    get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
+
+    print 'Plotting', len(jobs), 'figures with', min(n_workers, len(groups)), 'worker processes'
+
+    n_failed = 0
+
+    if groups:
+        pool = multiprocessing.Pool(min(n_workers, len(groups)))
+
+        for results in pool.imap_unordered(run_plot_jobs, groups.values()):
+            for log_file, status in results:
+                if status != 0:
+                    print 'Failed plotting, see', log_file
+                    n_failed += 1
+
+        pool.close()
+        pool.join()
+
+    if n_failed > 0:
+        sys.exit(1)
@@ -8,12 +8,6 @@
 #python script to plot wind stress vectors and magnitude over the oceans using
 #CF variables TAUX and TAUY
 
-import matplotlib as mpl
-#changing the default backend to agg to resolve contouring issue on rhea
-mpl.use('Agg')
-
-from   mpl_toolkits.basemap import Basemap
-import matplotlib.pyplot as plt
 import math
 import numpy
 
@@ -24,6 +18,10 @@ from round_to_first        import round_to_first
 from get_reg_area_avg      import get_reg_area_avg
 from get_reg_area_avg_rmse import get_reg_area_avg_rmse
 from read_climo_file       import read_climo_file
+from get_basemap           import get_basemap, get_basemap_xy
+from get_field_stats       import get_field_stats
+from save_plot             import save_plot
+from plot_data_file        import write_plot_data_file, read_plot_data_file
 from optparse              import OptionParser
 
 parser = OptionParser(usage = "python %prog [options]")
@@ -76,264 +74,384 @@ parser.add_option("--ref_interp_method", dest = "ref_interp_method",
 parser.add_option("--plots_dir", dest = "plots_dir",
                     help = "filepath to plots directory")
 
-(options, args) = parser.parse_args()
-
-indir                   = options.indir
-casename                = options.casename
-field_name              = options.field_name
-begin_yr                = options.begin_yr
-end_yr                  = options.end_yr
-begin_month             = options.begin_month
-end_month               = options.end_month
-interp_grid             = options.interp_grid
-interp_method           = options.interp_method
-ref_case_dir            = options.ref_case_dir
-ref_case                = options.ref_case
-ref_begin_yr            = options.ref_begin_yr
-ref_end_yr              = options.ref_end_yr
-ref_interp_grid         = options.ref_interp_grid
-ref_interp_method       = options.ref_interp_method
-plots_dir               = options.plots_dir
-
-
-#Getting season name from begin_month and end_month
-season = get_season_name(begin_month, end_month)
-
-if field_name == 'TAU':
-    field_X_name    = 'TAUX'
-    field_Y_name    = 'TAUY'
-    field_mask_name = 'OCNFRAC'
-
-#Read x and y components of vector field and mask field
-#Reading mask field
-field_mask, lat, lon, area, units = read_climo_file(indir = indir, \
-                     casename = casename, \
-                     season = season, \
-                     field_name = field_mask_name, \
-                     begin_yr = begin_yr, \
-                     end_yr = end_yr, \
-                     interp_grid = interp_grid, \
-                     interp_method = interp_method, \
-                     reg = 'global')
-
-#Reading X component and masking grid boxes
-field_X, lat, lon, area, units = read_climo_file(indir = indir, \
-                     casename = casename, \
-                     season = season, \
-                     field_name = field_X_name, \
-                     begin_yr = begin_yr, \
-                     end_yr = end_yr, \
-                     interp_grid = interp_grid, \
-                     interp_method = interp_method, \
-                     reg = 'global')
-
-
-field_X_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
-field_X_plot[:,:] = field_X[:,:]
-field_X_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
-
-#Reading Y component and masking grid boxes
-field_Y, lat, lon, area, units = read_climo_file(indir = indir, \
-                     casename = casename, \
-                     season = season, \
-                     field_name = field_Y_name, \
-                     begin_yr = begin_yr, \
-                     end_yr = end_yr, \
-                     interp_grid = interp_grid, \
-                     interp_method = interp_method, \
-                     reg = 'global')
-
-
-field_Y_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
-field_Y_plot[:,:] = field_Y[:,:]
-field_Y_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
-
-#Computing an approximation of field magnitude from monthly averages
-field_XY = numpy.ma.sqrt(numpy.ma.power(field_X_plot, 2.0) + numpy.ma.power(field_Y_plot, 2.0))
-
-
-print
-print 'Reading climo file for case: ', ref_case
-print
-
-field_ref_case_X, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
-                     casename = ref_case, \
-                     season = season, \
-                     field_name = field_X_name, \
-                     begin_yr = ref_begin_yr, \
-                     end_yr = ref_end_yr, \
-                     interp_grid = ref_interp_grid, \
-                     interp_method = ref_interp_method, \
-                     reg = 'global')
-
-field_ref_case_Y, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
-                     casename = ref_case, \
-                     season = season, \
-                     field_name = field_Y_name, \
-                     begin_yr = ref_begin_yr, \
-                     end_yr = ref_end_yr, \
-                     interp_grid = ref_interp_grid, \
-                     interp_method = ref_interp_method, \
-                     reg = 'global')
-
-
-
-field_ref_case_X_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
-field_ref_case_Y_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
-
-field_ref_case_X_plot[:,:] = field_ref_case_X[:,:]
-field_ref_case_Y_plot[:,:] = field_ref_case_Y[:,:]
-
-#Masking if the ref_case is also a model output
-if ref_case != 'ERS':
-    field_ref_case_X_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
-    field_ref_case_Y_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
+parser.add_option("--replot", dest = "replot",
+                    help = "plot data file (see plot_data_file.py) to plot again, without reading the climo files")
+
+
+def plot_climo_vector (indir,
+                       casename,
+                       field_name,
+                       begin_yr,
+                       end_yr,
+                       begin_month,
+                       end_month,
+                       interp_grid,
+                       interp_method,
+                       ref_case_dir,
+                       ref_case,
+                       ref_begin_yr,
+                       ref_end_yr,
+                       ref_interp_grid,
+                       ref_interp_method,
+                       plots_dir,
+                       debug = False):
+
+    #Getting season name from begin_month and end_month
+    season = get_season_name(begin_month, end_month)
+
+    if field_name == 'TAU':
+        field_X_name    = 'TAUX'
+        field_Y_name    = 'TAUY'
+        field_mask_name = 'OCNFRAC'
+
+    #Read x and y components of vector field and mask field
+    #Reading mask field
+    field_mask, lat, lon, area, units = read_climo_file(indir = indir, \
+                         casename = casename, \
+                         season = season, \
+                         field_name = field_mask_name, \
+                         begin_yr = begin_yr, \
+                         end_yr = end_yr, \
+                         interp_grid = interp_grid, \
+                         interp_method = interp_method, \
+                         reg = 'global')
+
+    #Reading X component and masking grid boxes
+    field_X, lat, lon, area, units = read_climo_file(indir = indir, \
+                         casename = casename, \
+                         season = season, \
+                         field_name = field_X_name, \
+                         begin_yr = begin_yr, \
+                         end_yr = end_yr, \
+                         interp_grid = interp_grid, \
+                         interp_method = interp_method, \
+                         reg = 'global')
+
+
+    field_X_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
+    field_X_plot[:,:] = field_X[:,:]
+    field_X_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
+
+    #Reading Y component and masking grid boxes
+    field_Y, lat, lon, area, units = read_climo_file(indir = indir, \
+                         casename = casename, \
+                         season = season, \
+                         field_name = field_Y_name, \
+                         begin_yr = begin_yr, \
+                         end_yr = end_yr, \
+                         interp_grid = interp_grid, \
+                         interp_method = interp_method, \
+                         reg = 'global')
+
+
+    field_Y_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
+    field_Y_plot[:,:] = field_Y[:,:]
+    field_Y_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
+
+    #Computing an approximation of field magnitude from monthly averages
+    field_XY = numpy.ma.sqrt(numpy.ma.power(field_X_plot, 2.0) + numpy.ma.power(field_Y_plot, 2.0))
+
+
+    print
+    print 'Reading climo file for case: ', ref_case
+    print
+
+    field_ref_case_X, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
+                         casename = ref_case, \
+                         season = season, \
+                         field_name = field_X_name, \
+                         begin_yr = ref_begin_yr, \
+                         end_yr = ref_end_yr, \
+                         interp_grid = ref_interp_grid, \
+                         interp_method = ref_interp_method, \
+                         reg = 'global')
+
+    field_ref_case_Y, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
+                         casename = ref_case, \
+                         season = season, \
+                         field_name = field_Y_name, \
+                         begin_yr = ref_begin_yr, \
+                         end_yr = ref_end_yr, \
+                         interp_grid = ref_interp_grid, \
+                         interp_method = ref_interp_method, \
+                         reg = 'global')
+
+
+
+    field_ref_case_X_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
+    field_ref_case_Y_plot      = numpy.ma.zeros((lat.shape[0], lon.shape[0]))
+
+    field_ref_case_X_plot[:,:] = field_ref_case_X[:,:]
+    field_ref_case_Y_plot[:,:] = field_ref_case_Y[:,:]
+
+    #Masking if the ref_case is also a model output
+    if ref_case != 'ERS':
+        field_ref_case_X_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
+        field_ref_case_Y_plot.mask = numpy.where(field_mask[:,:] < 0.5, 1, 0)
+
+    #Computing an approximation of field magnitude
+    field_ref_case_XY = numpy.ma.sqrt(numpy.ma.power(field_ref_case_X_plot, 2.0) + numpy.ma.power(field_ref_case_Y_plot, 2.0))
+
+    #Computing levels using mean and standard deviation
+    num = 11
+
+    field_stats          = get_field_stats(field_XY)
+    field_ref_case_stats = get_field_stats(field_ref_case_XY)
+
+    max_plot = round_to_first(field_stats['mean'] + \
+                  3.0 * field_stats['std'])
+    min_plot = 0.0
+
+    levels = numpy.linspace(min_plot, max_plot, num = num)
+
+    field_max_TAU       = field_stats['max']
+    field_min_TAU       = field_stats['min']
+
+    field_max_ERS_TAU = field_ref_case_stats['max']
+    field_min_ERS_TAU = field_ref_case_stats['min']
+
+    print 'mean, stddev, min_plot, max_plot: ', \
+        field_stats['mean'], field_stats['std'], min_plot, max_plot
+    print 'min, max: ', field_min_TAU, field_max_TAU
+    print 'levels:', levels
+
+
+
+    #Computing difference field
+    field_diff_XY = field_XY - field_ref_case_XY
+
+    diff_stats = get_field_stats(field_diff_XY)
+
+    field_diff_max_TAU = diff_stats['max']
+    field_diff_min_TAU = diff_stats['min']
+
+
+    #Computing levels using mean and standard deviation
+    num         = 11
+    max_plot    = round_to_first(3.0 * diff_stats['std'])
+    levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+
+    print 'For difference plot: '
+    print 'mean, stddev, max_plot: ', \
+        diff_stats['mean'], diff_stats['std'], max_plot
+    print 'min, max: ', field_diff_min_TAU, field_diff_max_TAU
+    print 'contour levels: ', levels
+
+    #Computing difference vectors
+    field_diff_X = field_X_plot - field_ref_case_X_plot
+    field_diff_Y = field_Y_plot - field_ref_case_Y_plot
 
-#Computing an approximation of field magnitude
-field_ref_case_XY = numpy.ma.sqrt(numpy.ma.power(field_ref_case_X_plot, 2.0) + numpy.ma.power(field_ref_case_Y_plot, 2.0))
+    outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
+                       + field_name + '_climo_' + season
 
-#Computing levels using mean and standard deviation
-num = 11
+    #Arrays and numbers drawn, saved to redraw the plot (see plot_data_file)
+    plot_data = {'casename':              casename,
+                 'ref_case':              ref_case,
+                 'field_name':            field_name,
+                 'units':                 units,
+                 'season':                season,
+                 'lat':                   lat,
+                 'lon':                   lon,
+                 'field_XY':              field_XY,
+                 'field_X_plot':          field_X_plot,
+                 'field_Y_plot':          field_Y_plot,
+                 'field_ref_case_XY':     field_ref_case_XY,
+                 'field_ref_case_X_plot': field_ref_case_X_plot,
+                 'field_ref_case_Y_plot': field_ref_case_Y_plot,
+                 'field_diff_XY':         field_diff_XY,
+                 'field_diff_X':          field_diff_X,
+                 'field_diff_Y':          field_diff_Y,
+                 'levels':                levels,
+                 'levels_diff':           levels_diff,
+                 'field_min_TAU':         field_min_TAU,
+                 'field_max_TAU':         field_max_TAU,
+                 'field_min_ERS_TAU':     field_min_ERS_TAU,
+                 'field_max_ERS_TAU':     field_max_ERS_TAU,
+                 'field_diff_min_TAU':    field_diff_min_TAU,
+                 'field_diff_max_TAU':    field_diff_max_TAU}
 
-max_plot = round_to_first(numpy.ma.mean(field_XY) + \
-              3.0 * numpy.ma.std(field_XY))
-min_plot = 0.0
+    write_plot_data_file(outfile, 'plot_climo_vector', plot_data)
 
-levels = numpy.linspace(min_plot, max_plot, num = num)
+    draw_climo_vector(plot_data, outfile)
 
-field_max_TAU       = numpy.ma.max(field_XY)
-field_min_TAU       = numpy.ma.min(field_XY)
 
-field_max_ERS_TAU = numpy.ma.max(field_ref_case_XY)
-field_min_ERS_TAU = numpy.ma.min(field_ref_case_XY)
+def draw_climo_vector(plot_data, outfile):
 
-print 'mean, stddev, min_plot, max_plot: ', \
-    numpy.ma.mean(field_XY), numpy.ma.std(field_XY), min_plot, max_plot
-print 'min, max: ', field_min_TAU, field_max_TAU
-print 'levels:', levels
+    #Imported here, as pyplot is slow to import: --help returns without it
+    #and batch workers (plot_climo_batch) import it once
+    import matplotlib as mpl
+    #changing the default backend to agg to resolve contouring issue on rhea
+    #(already set if pyplot was imported, e.g. by plot_climo_batch)
+    mpl.use('Agg', warn = False)
+    import matplotlib.pyplot as plt
 
+    casename    = plot_data['casename']
+    field_name  = plot_data['field_name']
+    units       = plot_data['units']
+    season      = plot_data['season']
+    lat         = plot_data['lat']
+    lon         = plot_data['lon']
+    levels      = plot_data['levels']
+    levels_diff = plot_data['levels_diff']
 
+    field_XY              = plot_data['field_XY']
+    field_X_plot          = plot_data['field_X_plot']
+    field_Y_plot          = plot_data['field_Y_plot']
+    field_ref_case_XY     = plot_data['field_ref_case_XY']
+    field_ref_case_X_plot = plot_data['field_ref_case_X_plot']
+    field_ref_case_Y_plot = plot_data['field_ref_case_Y_plot']
+    field_diff_XY         = plot_data['field_diff_XY']
+    field_diff_X          = plot_data['field_diff_X']
+    field_diff_Y          = plot_data['field_diff_Y']
 
-#PLOT CASE DATA
-f = plt.figure(figsize=(8.5, 11))
+    field_min_TAU      = plot_data['field_min_TAU']
+    field_max_TAU      = plot_data['field_max_TAU']
+    field_min_ERS_TAU  = plot_data['field_min_ERS_TAU']
+    field_max_ERS_TAU  = plot_data['field_max_ERS_TAU']
+    field_diff_min_TAU = plot_data['field_diff_min_TAU']
+    field_diff_max_TAU = plot_data['field_diff_max_TAU']
 
-plt.suptitle(field_name + ' (' + units + ') ' + season, fontsize = 20)
+    #PLOT CASE DATA
+    f = plt.figure(figsize=(8.5, 11))
 
-ax = f.add_subplot(3,1,1)
+    plt.suptitle(field_name + ' (' + units + ') ' + season, fontsize = 20)
 
-ax.set_title(casename)
+    ax = f.add_subplot(3,1,1)
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    ax.set_title(casename)
 
-m.drawcoastlines()
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
-lons, lats = numpy.meshgrid(lon,lat)
-x, y       = m(lons,lats)
+    m.drawcoastlines()
 
-c = m.contourf(    x, y, field_XY, \
-           cmap = 'gnuplot2_r', \
-        levels = levels, \
-        extend = 'both')
+    x, y       = get_basemap_xy(m, lat, lon)
 
-cb = m.colorbar(c)
+    c = m.contourf(    x, y, field_XY, \
+               cmap = 'gnuplot2_r', \
+            levels = levels, \
+            extend = 'both')
 
-q = m.quiver(    x[::3,::3], y[::3,::3], \
-        field_X_plot[::3, ::3], field_Y_plot[::3, ::3], \
-        scale = 3.0)
+    cb = m.colorbar(c)
 
-text_data = 'min = '  + str(round(field_min_TAU, 2)) + ', ' + \
-            'max = '  + str(round(field_max_TAU, 2))
+    q = m.quiver(    x[::3,::3], y[::3,::3], \
+            field_X_plot[::3, ::3], field_Y_plot[::3, ::3], \
+            scale = 3.0)
 
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+    text_data = 'min = '  + str(round(field_min_TAU, 2)) + ', ' + \
+                'max = '  + str(round(field_max_TAU, 2))
 
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
 
-#PLOT REF CASE DATA
-ax = f.add_subplot(3,1,2)
 
-ax.set_title('ERS')
+    #PLOT REF CASE DATA
+    ax = f.add_subplot(3,1,2)
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    ax.set_title('ERS')
 
-m.drawcoastlines()
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
-c  = m.contourf(    x, y, field_ref_case_XY, \
-        cmap = 'gnuplot2_r', \
-        levels = levels, \
-        extend = 'both')
+    m.drawcoastlines()
 
-cb = m.colorbar(c)
+    c  = m.contourf(    x, y, field_ref_case_XY, \
+            cmap = 'gnuplot2_r', \
+            levels = levels, \
+            extend = 'both')
 
-q  = m.quiver(    x[::3,::3], y[::3,::3], \
-        field_ref_case_X_plot[::3, ::3], field_ref_case_Y_plot[::3, ::3], \
-        scale = 3.0)
+    cb = m.colorbar(c)
 
-text_data = 'min = '  + str(round(field_min_ERS_TAU, 2)) + ', ' + \
-            'max = '  + str(round(field_max_ERS_TAU, 2))
+    q  = m.quiver(    x[::3,::3], y[::3,::3], \
+            field_ref_case_X_plot[::3, ::3], field_ref_case_Y_plot[::3, ::3], \
+            scale = 3.0)
 
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+    text_data = 'min = '  + str(round(field_min_ERS_TAU, 2)) + ', ' + \
+                'max = '  + str(round(field_max_ERS_TAU, 2))
 
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
 
-#PLOT DIFFERENCE
-ax = f.add_subplot(3,1,3)
 
-#ax.set_title(casename + ' - ' + ref_case)
-ax.set_title('Difference')
+    #PLOT DIFFERENCE
+    ax = f.add_subplot(3,1,3)
 
-field_diff_XY = field_XY - field_ref_case_XY
+    #ax.set_title(casename + ' - ' + ref_case)
+    ax.set_title('Difference')
 
-field_diff_max_TAU = numpy.ma.max(field_diff_XY)
-field_diff_min_TAU = numpy.ma.min(field_diff_XY)
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
+    m.drawcoastlines()
 
-#Computing levels using mean and standard deviation
-num         = 11
-max_plot    = round_to_first(3.0 * numpy.ma.std(field_diff_XY))
-levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+    c  = m.contourf(x, y, field_diff_XY, \
+            cmap = 'seismic', \
+            levels = levels_diff, \
+            extend = 'both')
 
-print 'For difference plot: '
-print 'mean, stddev, max_plot: ', \
-    numpy.ma.mean(field_diff_XY), numpy.ma.std(field_diff_XY), max_plot
-print 'min, max: ', numpy.ma.min(field_diff_XY), numpy.ma.max(field_diff_XY)
-print 'contour levels: ', levels
+    cb = m.colorbar(c)
 
-#Computing difference vectors
-field_diff_X = field_X_plot - field_ref_case_X_plot
-field_diff_Y = field_Y_plot - field_ref_case_Y_plot
+    q  = m.quiver(    x[::3,::3], y[::3,::3], \
+            field_diff_X[::3, ::3], field_diff_Y[::3, ::3], \
+            scale = 1.0)
 
-m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    text_data = 'min = '  + str(round(field_diff_min_TAU, 2)) + ', ' + \
+                'max = '  + str(round(field_diff_max_TAU, 2))
 
-m.drawcoastlines()
+    ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
 
-c  = m.contourf(x, y, field_diff_XY, \
-        cmap = 'seismic', \
-        levels = levels_diff, \
-        extend = 'both')
+    save_plot(outfile)
 
-cb = m.colorbar(c)
+    #plt.show()
 
-q  = m.quiver(    x[::3,::3], y[::3,::3], \
-        field_diff_X[::3, ::3], field_diff_Y[::3, ::3], \
-        scale = 1.0)
+    #Closing the figure, which would otherwise be kept by batch workers
+    plt.close(f)
 
-text_data = 'min = '  + str(round(field_diff_min_TAU, 2)) + ', ' + \
-            'max = '  + str(round(field_diff_max_TAU, 2))
 
-ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+def replot_climo_vector(plot_data_file, plots_dir):
 
-#SAVING PLOT
-mpl.rcParams['savefig.dpi']=300
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_climo_vector')
 
-outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
-                   + field_name + '_climo_' + season + '.png'
+    draw_climo_vector(plot_data, plots_dir + '/' + plot_name)
 
-plt.savefig(outfile)
 
-#plt.show()
+if __name__ == "__main__":
+    (options, args) = parser.parse_args()
 
+    if options.replot is not None:
+        replot_climo_vector(options.replot, options.plots_dir)
 
+    else:
+        indir                   = options.indir
+        casename                = options.casename
+        field_name              = options.field_name
+        begin_yr                = options.begin_yr
+        end_yr                  = options.end_yr
+        begin_month             = options.begin_month
+        end_month               = options.end_month
+        interp_grid             = options.interp_grid
+        interp_method           = options.interp_method
+        ref_case_dir            = options.ref_case_dir
+        ref_case                = options.ref_case
+        ref_begin_yr            = options.ref_begin_yr
+        ref_end_yr              = options.ref_end_yr
+        ref_interp_grid         = options.ref_interp_grid
+        ref_interp_method       = options.ref_interp_method
+        plots_dir               = options.plots_dir
 
+        plot_climo_vector (indir = indir,
+                           casename = casename,
+                           field_name = field_name,
+                           begin_yr = begin_yr,
+                           end_yr = end_yr,
+                           begin_month = begin_month,
+                           end_month = end_month,
+                           interp_grid = interp_grid,
+                           interp_method = interp_method,
+                           ref_case_dir = ref_case_dir,
+                           ref_case = ref_case,
+                           ref_begin_yr = ref_begin_yr,
+                           ref_end_yr = ref_end_yr,
+                           ref_interp_grid = ref_interp_grid,
+                           ref_interp_method = ref_interp_method,
+                           plots_dir = plots_dir)
@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Data files of the plots: the arrays a plot script draws (fields,
+# differences, regression maps, index series, contour levels) and the
+# numbers and names shown in the figure, so that a plot can be drawn again,
+# e.g. with another style, without computing the diagnostics again.
+#
+# write_plot_data_file(outfile, plot_script, plot_data) writes plot_data, a
+# dict of numpy arrays, numbers and strings, to
+# $plot_data_dir/<basename of outfile>.nc if plot_data_dir is set in the
+# environment (run_aprime.bash). Arrays are compressed NetCDF variables,
+# masked values included; numbers and strings are global attributes. Masked
+# numbers (e.g. the area average of a fully masked field) are written as
+# NaN, and listed in the masked_attributes attribute.
+#
+# read_plot_data_file(file_name, plot_script) returns the dict, and the
+# name of the plot. The plot scripts use it with their --replot option:
+#
+#   python python/plot_climo.py --replot <data file> --plots_dir <dir>
+
+import os
+
+import numpy
+from netCDF4 import Dataset
+
+from scratch_cache import get_temp_filename
+
+
+def get_plot_data_filename(outfile):
+
+    plot_data_dir = os.environ.get('plot_data_dir', '')
+
+    if plot_data_dir == '':
+        return None
+
+    return plot_data_dir + '/' + os.path.basename(outfile) + '.nc'
+
+
+def write_plot_data_file(outfile, plot_script, plot_data):
+
+    file_name = get_plot_data_filename(outfile)
+
+    if file_name is None:
+        return None
+
+    plot_data_dir = os.path.dirname(file_name)
+
+    if not os.path.isdir(plot_data_dir):
+        try:
+            os.makedirs(plot_data_dir)
+        except OSError:
+            #Created by another process meanwhile
+            if not os.path.isdir(plot_data_dir):
+                raise
+
+    print __name__, 'Writing plot data: ', file_name
+
+    temp_file = get_temp_filename(file_name)
+
+    f_write = Dataset(temp_file, 'w', format = 'NETCDF4_CLASSIC')
+
+    f_write.plot_script = plot_script
+    f_write.plot_name   = os.path.basename(outfile)
+
+    masked_attributes = []
+
+    for name in sorted(plot_data.keys()):
+        value = plot_data[name]
+
+        if isinstance(value, basestring):
+            f_write.setncattr(name, value)
+            continue
+
+        if numpy.ndim(value) == 0:
+            #Attributes cannot be masked
+            if numpy.ma.is_masked(value):
+                masked_attributes.append(name)
+                value = numpy.nan
+            f_write.setncattr(name, numpy.ma.getdata(value))
+            continue
+
+        data = numpy.ma.asarray(value)
+
+        #Types of the classic data model
+        if data.dtype == numpy.bool_:
+            data = data.astype('i1')
+        elif numpy.issubdtype(data.dtype, numpy.integer):
+            data = data.astype('i4')
+
+        #Dimensions are named by size, so that e.g. the fields share lat
+        #and lon dimensions
+        dims = []
+        for size in data.shape:
+            dim = 'n' + str(size)
+            if dim not in f_write.dimensions:
+                f_write.createDimension(dim, size)
+            dims.append(dim)
+
+        if numpy.ma.is_masked(data):
+            fill_value = numpy.ma.default_fill_value(data)
+            var = f_write.createVariable(name, data.dtype, tuple(dims), zlib = True,
+                                         fill_value = fill_value)
+            var[:] = data.filled(fill_value)
+        else:
+            var = f_write.createVariable(name, data.dtype, tuple(dims), zlib = True)
+            var[:] = numpy.ma.getdata(data)
+
+    if masked_attributes:
+        f_write.masked_attributes = ' '.join(masked_attributes)
+
+    f_write.close()
+
+    os.rename(temp_file, file_name)
+
+    return file_name
+
+
+def read_plot_data_file(file_name, plot_script):
+
+    f = Dataset(file_name, 'r')
+
+    if f.plot_script != plot_script:
+        raise ValueError(file_name + ' was written by ' + f.plot_script + ', not ' + plot_script)
+
+    plot_data = {}
+
+    for name in f.ncattrs():
+        value = f.getncattr(name)
+
+        if isinstance(value, unicode):
+            value = str(value)
+
+        plot_data[name] = value
+
+    for name in f.variables:
+        data = f.variables[name][:]
+
+        #Plain arrays, as computed by the plot scripts, unless values are
+        #masked
+        if not numpy.ma.is_masked(data):
+            data = numpy.ma.getdata(data)
+
+        plot_data[name] = data
+
+    f.close()
+
+    plot_name = plot_data.pop('plot_name')
+    del plot_data['plot_script']
+
+    for name in plot_data.pop('masked_attributes', '').split():
+        plot_data[name] = numpy.ma.masked
+
+    return plot_data, plot_name
@@ -9,7 +9,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator, LinearLocator, FixedLocator
 
@@ -26,6 +25,8 @@ from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from get_reg_meridional_avg_climo import get_reg_meridional_avg_climo
 from round_to_first import round_to_first
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 import argparse
 
@@ -101,17 +102,43 @@ def plot_meridional_avg_climo (indir,
 
     nlon = lon_reg.shape[0]
 
+    season = get_season_name(begin_month, end_month)
+
+    outfile = plots_dir + '/' + casename + '-' + ref_case + '_' + field_name \
+           + '_meridional_avg_' + reg + '_' + season
+
+    #Meridional averages and names drawn, saved to redraw the plot (see
+    #plot_data_file)
+    plot_data = {'casename':       casename,
+                 'ref_case':       ref_case,
+                 'field_name':     field_name,
+                 'units':          units,
+                 'reg_name':       reg_name,
+                 'season':         season,
+                 'lon_reg':        lon_reg,
+                 'plot_field':     plot_field,
+                 'ref_plot_field': ref_plot_field}
+
+    write_plot_data_file(outfile, 'plot_meridional_avg_climo', plot_data)
+
+    draw_meridional_avg_climo(plot_data, outfile)
+
+
+def draw_meridional_avg_climo(plot_data, outfile):
+
+    field_name     = plot_data['field_name']
+    lon_reg        = plot_data['lon_reg']
+    plot_field     = plot_data['plot_field']
+    ref_plot_field = plot_data['ref_plot_field']
+
     f = plt.figure(figsize=(11, 8.5))
     f.text(0.5, 0.04, 'Longitude (E)', ha='center', fontsize = 16)
-    f.text(0.04, 0.5, field_name + ' (' + units + ')', va='center', rotation='vertical', fontsize = 16)
+    f.text(0.04, 0.5, field_name + ' (' + plot_data['units'] + ')', va='center', rotation='vertical', fontsize = 16)
 
     ax = f.add_subplot(111)
 
-    season = get_season_name(begin_month, end_month)
-    plt.suptitle(reg_name + ' Meridional Avg. ' + season, fontsize = 20)
-
+    plt.suptitle(plot_data['reg_name'] + ' Meridional Avg. ' + plot_data['season'], fontsize = 20)
 
-    ref_case_text = ref_case + ' ' + field_name_ref + ' climo'
 
     #min_plot = min(numpy.amin(plot_field), numpy.amin(ref_plot_field))
     #max_plot = max(numpy.amax(plot_field), numpy.amax(ref_plot_field))
@@ -131,8 +158,8 @@ def plot_meridional_avg_climo (indir,
     print 'lon_reg.shape, plot_field.shape, ref_plot_field.shape: ', \
         lon_reg.shape, plot_field.shape, ref_plot_field.shape
 
-    test_line, = ax.plot(lon_reg, plot_field, color = 'green', linewidth = 2.0, label = casename)
-    ref_line, = ax.plot(lon_reg, ref_plot_field, color = 'black', linewidth = 2.0, label = ref_case)
+    test_line, = ax.plot(lon_reg, plot_field, color = 'green', linewidth = 2.0, label = plot_data['casename'])
+    ref_line, = ax.plot(lon_reg, ref_plot_field, color = 'black', linewidth = 2.0, label = plot_data['ref_case'])
 
     ax.legend(bbox_to_anchor = (1.0,1.0), handles=[ref_line, test_line], fontsize = 10)
 
@@ -147,18 +174,20 @@ def plot_meridional_avg_climo (indir,
     for tick in ax.xaxis.get_major_ticks():
             tick.label.set_fontsize(10)
 
+    save_plot(outfile)
+    #plt.show()
+    plt.close(f)
 
-    mpl.rcParams['savefig.dpi']=300
 
-    outfile = plots_dir + '/' + casename + '-' + ref_case + '_' + field_name \
-           + '_meridional_avg_' + reg + '_' + season + '.png'
+def replot_meridional_avg_climo(plot_data_file, plots_dir):
 
-    plt.savefig(outfile)
-    #plt.show()
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_meridional_avg_climo')
+
+    draw_meridional_avg_climo(plot_data, plots_dir + '/' + plot_name)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -214,6 +243,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the meridional averages")
+
     args = parser.parse_args()
 
     debug               = args.debug
@@ -234,6 +266,7 @@ if __name__ == "__main__":
     reg                 = args.reg
     reg_name            = args.reg_name
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
@@ -241,20 +274,24 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_meridional_avg_climo(indir = indir,
-                              casename = casename,
-                              field_name = field_name,
-                              interp_grid = interp_grid,
-                              interp_method = interp_method,
-                              ref_case_dir = ref_case_dir,
-                              ref_case = ref_case,
-                              ref_interp_grid = ref_interp_grid,
-                              ref_interp_method = ref_interp_method,
-                              begin_yr = begin_yr,
-                              end_yr = end_yr,
-                              begin_month = begin_month,
-                              end_month = end_month,
-                              reg = reg,
-                              reg_name = reg_name,
-                              aggregate = aggregate,
-                              debug = debug)
+    if replot is not None:
+        replot_meridional_avg_climo(replot, plots_dir)
+
+    else:
+        plot_meridional_avg_climo(indir = indir,
+                                  casename = casename,
+                                  field_name = field_name,
+                                  interp_grid = interp_grid,
+                                  interp_method = interp_method,
+                                  ref_case_dir = ref_case_dir,
+                                  ref_case = ref_case,
+                                  ref_interp_grid = ref_interp_grid,
+                                  ref_interp_method = ref_interp_method,
+                                  begin_yr = begin_yr,
+                                  end_yr = end_yr,
+                                  begin_month = begin_month,
+                                  end_month = end_month,
+                                  reg = reg,
+                                  reg_name = reg_name,
+                                  aggregate = aggregate,
+                                  debug = debug)
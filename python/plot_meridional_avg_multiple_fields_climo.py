@@ -12,7 +12,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -27,6 +26,7 @@ from aggregate_ts_weighted import aggregate_ts_weighted
 from get_reg_seasonal_avg import get_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
+from save_plot import save_plot
 from optparse import OptionParser
 import argparse
 
@@ -154,17 +154,16 @@ def plot_meridional_avg_multiple_fields_climo (indir,
 
     plt.subplots_adjust(hspace=0.3)
 
-    mpl.rcParams['savefig.dpi']=300
 
     outfile = plots_dir + '/' + casename + '_' \
-           + meridional_avg + '_' + reg + '_' + season + '.png'
+           + meridional_avg + '_' + reg + '_' + season
 
-    plt.savefig(outfile)
+    save_plot(outfile)
     #plt.show()
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -13,7 +13,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -29,6 +28,7 @@ from get_reg_seasonal_avg import get_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from get_reg_meridional_avg_climo import get_reg_meridional_avg_climo
+from save_plot import save_plot
 from optparse import OptionParser
 import argparse
 
@@ -152,17 +152,16 @@ def plot_meridional_avg_reg_seasonal_cycle(indir,
                 tick.label.set_fontsize(10)
 
 
-    mpl.rcParams['savefig.dpi']=300
 
     outfile = plots_dir + '/' + casename + '-' + ref_case + '_' + field_name \
-           + '_meridional_avg_seasonal_cycle_' + reg + '.png'
+           + '_meridional_avg_seasonal_cycle_' + reg
 
-    plt.savefig(outfile)
+    save_plot(outfile)
     #plt.show()
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -10,12 +10,10 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
 import numpy
-from scipy import stats
 from netCDF4 import Dataset
 
 from read_monthly_data_ts import read_monthly_data_ts
@@ -29,6 +27,8 @@ from get_reg_avg_climo import get_reg_avg_climo
 from remove_seasonal_cycle_monthly_data import remove_seasonal_cycle_monthly_data
 from standardize_time_series import standardize_time_series
 from read_index_file import read_index_file
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 import argparse
 
@@ -110,12 +110,59 @@ def plot_multiple_index_same_plot   (indir,
 
     ref_corr_matrix = numpy.corrcoef(ref_plot_ts)
 
-    f, ax = plt.subplots(n_index, 2, figsize=(11,8.5))
-
-
     season = get_season_name(begin_month, end_month)
     z, n_months_season = get_season_months_index(begin_month, end_month)
 
+    index_names_text = '_'.join(index_names)
+
+    outfile = plots_dir + '/' + casename[0] + '_' + season + '_' + index_names_text
+
+    #Index series, correlations and names drawn, saved to redraw the plot
+    #(see plot_data_file). Lists of names are one string, a name per line
+    plot_data = {'casename':         '\n'.join(casename),
+                 'ref_case':         '\n'.join(ref_case),
+                 'field_names':      '\n'.join(field_names),
+                 'index_names':      '\n'.join(index_names),
+                 'units':            units,
+                 'begin_month':      begin_month,
+                 'end_month':        end_month,
+                 'aggregate':        numpy.array(aggregate),
+                 'n_months_season':  n_months_season,
+                 'begin_yr':         begin_yr,
+                 'ref_begin_yr':     ref_begin_yr,
+                 'test_plot_ts':     test_plot_ts,
+                 'ref_plot_ts':      ref_plot_ts,
+                 'test_corr_matrix': test_corr_matrix,
+                 'ref_corr_matrix':  ref_corr_matrix}
+
+    write_plot_data_file(outfile, 'plot_multiple_index_same_plot', plot_data)
+
+    draw_multiple_index_same_plot(plot_data, outfile, debug = debug)
+
+
+def draw_multiple_index_same_plot(plot_data, outfile, debug = False):
+
+    casename         = plot_data['casename'].split('\n')
+    ref_case         = plot_data['ref_case'].split('\n')
+    field_names      = plot_data['field_names'].split('\n')
+    index_names      = plot_data['index_names'].split('\n')
+    units            = plot_data['units']
+    begin_month      = plot_data['begin_month']
+    end_month        = plot_data['end_month']
+    aggregate        = list(numpy.atleast_1d(plot_data['aggregate']))
+    n_months_season  = plot_data['n_months_season']
+    begin_yr         = plot_data['begin_yr']
+    ref_begin_yr     = plot_data['ref_begin_yr']
+    test_plot_ts     = plot_data['test_plot_ts']
+    ref_plot_ts      = plot_data['ref_plot_ts']
+    test_corr_matrix = plot_data['test_corr_matrix']
+    ref_corr_matrix  = plot_data['ref_corr_matrix']
+
+    n_index = len(index_names)
+
+    f, ax = plt.subplots(n_index, 2, figsize=(11,8.5))
+
+
     plt.suptitle('Monthly Indices', fontsize = 20)
 
 
@@ -234,20 +281,22 @@ def plot_multiple_index_same_plot   (indir,
     plt.subplots_adjust(hspace=0.3)
     plt.subplots_adjust(wspace=0.3)
 
-    mpl.rcParams['savefig.dpi']=300
+    print __name__, 'Plot file: ', outfile
 
-    index_names_text = '_'.join(index_names)
+    save_plot(outfile)
+    #plt.show()
+    plt.close(f)
 
-    outfile = plots_dir + '/' + casename[0] + '_' + season + '_' + index_names_text + '.png'
 
-    print __name__, 'Plot file: ', outfile
+def replot_multiple_index_same_plot(plot_data_file, plots_dir, debug = False):
 
-    plt.savefig(outfile)
-    #plt.show()
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_multiple_index_same_plot')
+
+    draw_multiple_index_same_plot(plot_data, plots_dir + '/' + plot_name, debug = debug)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -312,6 +361,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without reading the indices")
+
     args = parser.parse_args()
 
     debug               = args.debug
@@ -335,6 +387,7 @@ if __name__ == "__main__":
     no_ann              = args.no_ann
     stdize              = args.stdize
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
 
 
@@ -343,23 +396,27 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_multiple_index_same_plot(indir = indir,
-                                  casename = casename,
-                                  field_names = field_names,
-                                  interp_grid = interp_grid,
-                                  interp_method = interp_method,
-                                  ref_case_dir = ref_case_dir,
-                                  ref_case = ref_case,
-                                  ref_interp_grid = ref_interp_grid,
-                                  ref_interp_method = ref_interp_method,
-                                  begin_yr = begin_yr,
-                                  end_yr = end_yr,
-                                  ref_begin_yr = ref_begin_yr,
-                                  ref_end_yr = ref_end_yr,
-                                  begin_month = begin_month,
-                                  end_month = end_month,
-                                  index_names = index_names,
-                                  aggregate = aggregate,
-                                  no_ann = no_ann,
-                                  stdize = stdize,
-                                  debug = debug)
+    if replot is not None:
+        replot_multiple_index_same_plot(replot, plots_dir, debug = debug)
+
+    else:
+        plot_multiple_index_same_plot(indir = indir,
+                                      casename = casename,
+                                      field_names = field_names,
+                                      interp_grid = interp_grid,
+                                      interp_method = interp_method,
+                                      ref_case_dir = ref_case_dir,
+                                      ref_case = ref_case,
+                                      ref_interp_grid = ref_interp_grid,
+                                      ref_interp_method = ref_interp_method,
+                                      begin_yr = begin_yr,
+                                      end_yr = end_yr,
+                                      ref_begin_yr = ref_begin_yr,
+                                      ref_end_yr = ref_end_yr,
+                                      begin_month = begin_month,
+                                      end_month = end_month,
+                                      index_names = index_names,
+                                      aggregate = aggregate,
+                                      no_ann = no_ann,
+                                      stdize = stdize,
+                                      debug = debug)
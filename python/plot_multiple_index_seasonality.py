@@ -10,7 +10,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -22,11 +21,13 @@ from get_season_months_index import get_season_months_index
 from get_days_in_season_months import get_days_in_season_months
 from get_reg_area_avg import get_reg_area_avg
 from aggregate_ts_weighted import aggregate_ts_weighted
-from get_reg_seasonal_avg import get_reg_seasonal_avg
+from get_multiple_reg_seasonal_avg import get_multiple_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from remove_seasonal_cycle_monthly_data import remove_seasonal_cycle_monthly_data
 from standardize_time_series import standardize_time_series
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 import argparse
 
@@ -56,21 +57,24 @@ def plot_multiple_index_seasonality   (indir,
 
     n_reg = len(regs)
 
+    #Reading the field once for all regions
+    reg_seasonal_avg, n_months_season, units = get_multiple_reg_seasonal_avg (
+                              indir     = indir,
+                              casename     = casename,
+                              field_name     = field_name,
+                              interp_grid     = interp_grid,
+                              interp_method = interp_method,
+                              begin_yr     = begin_yr,
+                              end_yr     = end_yr,
+                              begin_month     = begin_month,
+                              end_month     = end_month,
+                              regs         = regs,
+                              aggregate     = aggregate,
+                              debug     = debug)
+
     for i,reg in enumerate(regs):
         print __name__, 'casename: ', casename
-        area_seasonal_avg, n_months_season, units = get_reg_seasonal_avg (
-                                  indir     = indir,
-                                  casename     = casename,
-                                  field_name     = field_name,
-                                  interp_grid     = interp_grid,
-                                  interp_method = interp_method,
-                                  begin_yr     = begin_yr,
-                                  end_yr     = end_yr,
-                                  begin_month     = begin_month,
-                                  end_month     = end_month,
-                                  reg         = reg,
-                                  aggregate     = aggregate,
-                                  debug     = debug)
+        area_seasonal_avg = reg_seasonal_avg[i, :]
 
         if i == 0:
             test_ts = numpy.zeros((n_reg, area_seasonal_avg.shape[0]))
@@ -90,21 +94,24 @@ def plot_multiple_index_seasonality   (indir,
         if debug: print __name__, 'test_ts: ', test_ts
 
 
+    #Reading the field once for all regions
+    reg_seasonal_avg, n_months_season, units = get_multiple_reg_seasonal_avg (
+                              indir     = ref_case_dir,
+                              casename     = ref_case,
+                              field_name     = field_name,
+                              interp_grid     = ref_interp_grid,
+                              interp_method = ref_interp_method,
+                              begin_yr     = ref_begin_yr,
+                              end_yr     = ref_end_yr,
+                              begin_month     = begin_month,
+                              end_month     = end_month,
+                              regs         = regs,
+                              aggregate     = aggregate,
+                              debug     = debug)
+
     for i,reg in enumerate(regs):
         print __name__, 'casename: ', casename
-        area_seasonal_avg, n_months_season, units = get_reg_seasonal_avg (
-                                  indir     = ref_case_dir,
-                                  casename     = ref_case,
-                                  field_name     = field_name,
-                                  interp_grid     = ref_interp_grid,
-                                  interp_method = ref_interp_method,
-                                  begin_yr     = ref_begin_yr,
-                                  end_yr     = ref_end_yr,
-                                  begin_month     = begin_month,
-                                  end_month     = end_month,
-                                  reg         = reg,
-                                  aggregate     = aggregate,
-                                  debug     = debug)
+        area_seasonal_avg = reg_seasonal_avg[i, :]
 
 
         if i == 0:
@@ -121,11 +128,40 @@ def plot_multiple_index_seasonality   (indir,
         if debug: print __name__, 'ref_stddev_ts: ', ref_stddev_ts
 
 
+    outfile = plots_dir + '/' + casename + '_' \
+           + field_name + '_seasonality_' + index_set_name
+
+    #Std. dev. of each month and names drawn, saved to redraw the plot (see
+    #plot_data_file). Region names are one string, a name per line
+    plot_data = {'casename':       casename,
+                 'ref_case':       ref_case,
+                 'field_name':     field_name,
+                 'units':          units,
+                 'index_set_name': index_set_name,
+                 'names':          '\n'.join(names),
+                 'test_stddev_ts': test_stddev_ts,
+                 'ref_stddev_ts':  ref_stddev_ts}
+
+    write_plot_data_file(outfile, 'plot_multiple_index_seasonality', plot_data)
+
+    draw_multiple_index_seasonality(plot_data, outfile)
+
+
+def draw_multiple_index_seasonality(plot_data, outfile):
+
+    casename       = plot_data['casename']
+    ref_case       = plot_data['ref_case']
+    test_stddev_ts = plot_data['test_stddev_ts']
+    ref_stddev_ts  = plot_data['ref_stddev_ts']
+
+    names = plot_data['names'].split('\n')
+    n_reg = len(names)
+
     f, ax = plt.subplots(n_reg, 1, figsize=(4,8.5))
 
-    f.text(0.0, 0.5, 'Std. dev. ' + field_name + ' (' + units + ')', va='center', rotation='vertical', fontsize = 12)
+    f.text(0.0, 0.5, 'Std. dev. ' + plot_data['field_name'] + ' (' + plot_data['units'] + ')', va='center', rotation='vertical', fontsize = 12)
 
-    plt.suptitle('ENSO Seasonality: ' + index_set_name + ' index', fontsize = 16)
+    plt.suptitle('ENSO Seasonality: ' + plot_data['index_set_name'] + ' index', fontsize = 16)
 
     plot_time = numpy.arange(1,13)
     plot_time_ticks = ['J', 'F', 'M', 'A', 'M', 'J', 'J', 'A', 'S', 'O', 'N', 'D']
@@ -181,17 +217,20 @@ def plot_multiple_index_seasonality   (indir,
 
     plt.subplots_adjust(left = 0.15)
 
-    mpl.rcParams['savefig.dpi']=300
+    save_plot(outfile)
+    #plt.show()
+    plt.close(f)
 
-    outfile = plots_dir + '/' + casename + '_' \
-           + field_name + '_seasonality_' + index_set_name + '.png'
 
-    plt.savefig(outfile)
-    #plt.show()
+def replot_multiple_index_seasonality(plot_data_file, plots_dir):
+
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_multiple_index_seasonality')
+
+    draw_multiple_index_seasonality(plot_data, plots_dir + '/' + plot_name)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -262,6 +301,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the indices")
+
     args = parser.parse_args()
 
     debug               = args.debug
@@ -287,6 +329,7 @@ if __name__ == "__main__":
     no_ann              = args.no_ann
     stdize              = args.stdize
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
     #regs = ['global', 'NH_high_lats', 'NH_mid_lats', 'tropics', 'SH_mid_lats', 'SH_high_lats']
     #names = ['Global', '90N-50N', '50N-20N', '20N-20S', '20S-50S', '50S-90S']
@@ -299,25 +342,29 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_multiple_index_seasonality(indir = indir,
-                                    casename = casename,
-                                    field_name = field_name,
-                                    interp_grid = interp_grid,
-                                    interp_method = interp_method,
-                                    ref_case_dir = ref_case_dir,
-                                    ref_case = ref_case,
-                                    ref_interp_grid = ref_interp_grid,
-                                    ref_interp_method = ref_interp_method,
-                                    begin_yr = begin_yr,
-                                    end_yr = end_yr,
-                                    ref_begin_yr = ref_begin_yr,
-                                    ref_end_yr = ref_end_yr,
-                                    begin_month = begin_month,
-                                    end_month = end_month,
-                                    regs = regs,
-                                    names = names,
-                                    index_set_name = index_set_name,
-                                    aggregate = aggregate,
-                                    no_ann = no_ann,
-                                    stdize = stdize,
-                                    debug = debug)
+    if replot is not None:
+        replot_multiple_index_seasonality(replot, plots_dir)
+
+    else:
+        plot_multiple_index_seasonality(indir = indir,
+                                        casename = casename,
+                                        field_name = field_name,
+                                        interp_grid = interp_grid,
+                                        interp_method = interp_method,
+                                        ref_case_dir = ref_case_dir,
+                                        ref_case = ref_case,
+                                        ref_interp_grid = ref_interp_grid,
+                                        ref_interp_method = ref_interp_method,
+                                        begin_yr = begin_yr,
+                                        end_yr = end_yr,
+                                        ref_begin_yr = ref_begin_yr,
+                                        ref_end_yr = ref_end_yr,
+                                        begin_month = begin_month,
+                                        end_month = end_month,
+                                        regs = regs,
+                                        names = names,
+                                        index_set_name = index_set_name,
+                                        aggregate = aggregate,
+                                        no_ann = no_ann,
+                                        stdize = stdize,
+                                        debug = debug)
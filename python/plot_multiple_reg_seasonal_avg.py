@@ -10,7 +10,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -23,10 +22,12 @@ from get_season_months_index import get_season_months_index
 from get_days_in_season_months import get_days_in_season_months
 from get_reg_area_avg import get_reg_area_avg
 from aggregate_ts_weighted import aggregate_ts_weighted
-from get_reg_seasonal_avg import get_reg_seasonal_avg
+from get_multiple_reg_seasonal_avg import get_multiple_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from round_to_first_given_range import round_to_first_given_range
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 import argparse
 
@@ -50,21 +51,24 @@ def plot_multiple_reg_seasonal_avg (indir,
     n_reg = len(regs)
 
 
+    #Reading the field once for all regions
+    reg_seasonal_avg, n_months_season, units = get_multiple_reg_seasonal_avg (
+                              indir     = indir,
+                              casename     = casename,
+                              field_name     = field_name,
+                              interp_grid     = interp_grid,
+                              interp_method = interp_method,
+                              begin_yr     = begin_yr,
+                              end_yr     = end_yr,
+                              begin_month     = begin_month,
+                              end_month     = end_month,
+                              regs         = regs,
+                              aggregate     = aggregate,
+                              debug     = debug)
+
     for i,reg in enumerate(regs):
         print __name__, 'casename: ', casename
-        area_seasonal_avg, n_months_season, units = get_reg_seasonal_avg (
-                                  indir     = indir,
-                                  casename     = casename,
-                                  field_name     = field_name,
-                                  interp_grid     = interp_grid,
-                                  interp_method = interp_method,
-                                  begin_yr     = begin_yr,
-                                  end_yr     = end_yr,
-                                  begin_month     = begin_month,
-                                  end_month     = end_month,
-                                  reg         = reg,
-                                  aggregate     = aggregate,
-                                  debug     = debug)
+        area_seasonal_avg = reg_seasonal_avg[i, :]
 
         if i == 0: plot_ts = numpy.zeros((n_reg, area_seasonal_avg.shape[0]))
 
@@ -103,29 +107,66 @@ def plot_multiple_reg_seasonal_avg (indir,
 
         if debug: print __name__, 'plot_ts: ', plot_ts
 
+    season = get_season_name(begin_month, end_month)
+
+    outfile = plots_dir + '/' + casename + '_' \
+           + field_name + '_' + season + '_reg_ts'
+
+    #Regional averages, climatologies and names drawn, saved to redraw the
+    #plot (see plot_data_file). Region names are one string, a name per line
+    plot_data = {'field_name':      field_name,
+                 'units':           units,
+                 'season':          season,
+                 'ref_case_text':   ref_case + ' ' + field_name_ref + ' climo',
+                 'names':           '\n'.join(names),
+                 'begin_month':     begin_month,
+                 'end_month':       end_month,
+                 'aggregate':       aggregate,
+                 'n_months_season': n_months_season,
+                 'begin_yr':        begin_yr,
+                 'plot_ts':         plot_ts,
+                 'ref_plot_ts':     ref_plot_ts}
+
+    write_plot_data_file(outfile, 'plot_multiple_reg_seasonal_avg', plot_data)
+
+    draw_multiple_reg_seasonal_avg(plot_data, outfile)
+
+
+def draw_multiple_reg_seasonal_avg(plot_data, outfile):
+
+    field_name      = plot_data['field_name']
+    begin_month     = plot_data['begin_month']
+    end_month       = plot_data['end_month']
+    aggregate       = plot_data['aggregate']
+    n_months_season = plot_data['n_months_season']
+    begin_yr        = plot_data['begin_yr']
+    plot_ts         = plot_data['plot_ts']
+    ref_plot_ts     = plot_data['ref_plot_ts']
+    ref_case_text   = plot_data['ref_case_text']
+
+    names = plot_data['names'].split('\n')
+    n_reg = plot_ts.shape[0]
+
     plot_ts_mean = numpy.mean(plot_ts, axis = 1)
 
     print __name__, 'int(math.ceil(n_reg/2)):', int(math.ceil(n_reg/2))
 
     f, ax = plt.subplots(int(math.ceil(n_reg/2)), 2, sharex = True, figsize=(8.5,11))
 
-    nt = area_seasonal_avg.shape[0]
+    nt = plot_ts.shape[1]
 
 
     f.text(0.5, 0.04, 'Model Year', ha='center', fontsize = 24)
 
-    f.text(0.04, 0.5, field_name + ' (' + units + ')', va='center', rotation='vertical', fontsize = 16)
+    f.text(0.04, 0.5, field_name + ' (' + plot_data['units'] + ')', va='center', rotation='vertical', fontsize = 16)
 
-    season = get_season_name(begin_month, end_month)
-    plt.suptitle(field_name + ' ' + season, fontsize = 24)
+    plt.suptitle(field_name + ' ' + plot_data['season'], fontsize = 24)
 
     if aggregate == 1:
             plot_time = numpy.arange(0,nt) + begin_yr
     else:
             plot_time = numpy.arange(0,nt)
 
-    ref_case_text = ref_case + ' ' + field_name_ref + ' climo'
-
     for i,name in enumerate(names):
         j = numpy.unravel_index(i, ax.shape)
         print __name__, 'i and unraveled index, j: ', i, j
@@ -179,17 +220,20 @@ def plot_multiple_reg_seasonal_avg (indir,
 
     plt.subplots_adjust(hspace=0.3)
 
-    mpl.rcParams['savefig.dpi']=300
+    save_plot(outfile)
+    #plt.show()
+    plt.close(f)
 
-    outfile = plots_dir + '/' + casename + '_' \
-           + field_name + '_' + season + '_reg_ts.png'
 
-    plt.savefig(outfile)
-    #plt.show()
+def replot_multiple_reg_seasonal_avg(plot_data_file, plots_dir):
+
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_multiple_reg_seasonal_avg')
+
+    draw_multiple_reg_seasonal_avg(plot_data, plots_dir + '/' + plot_name)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -245,6 +289,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the regional averages")
+
     args = parser.parse_args()
 
     debug               = args.debug
@@ -265,6 +312,7 @@ if __name__ == "__main__":
     names               = args.names
     aggregate           = args.aggregate
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
     #regs = ['global', 'NH_high_lats', 'NH_mid_lats', 'tropics', 'SH_mid_lats', 'SH_high_lats']
     #names = ['Global', '90N-50N', '50N-20N', '20N-20S', '20S-50S', '50S-90S']
@@ -277,18 +325,22 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_multiple_reg_seasonal_avg(indir = indir,
-                                   casename = casename,
-                                   field_name = field_name,
-                                   interp_grid = interp_grid,
-                                   interp_method = interp_method,
-                                   ref_case = ref_case,
-                                   ref_interp_grid = ref_interp_grid,
-                                   ref_interp_method = ref_interp_method,
-                                   begin_yr = begin_yr,
-                                   end_yr = end_yr,
-                                   begin_month = begin_month,
-                                   end_month = end_month,
-                                   regs = regs,
-                                   aggregate = aggregate,
-                                   debug = debug)
+    if replot is not None:
+        replot_multiple_reg_seasonal_avg(replot, plots_dir)
+
+    else:
+        plot_multiple_reg_seasonal_avg(indir = indir,
+                                       casename = casename,
+                                       field_name = field_name,
+                                       interp_grid = interp_grid,
+                                       interp_method = interp_method,
+                                       ref_case = ref_case,
+                                       ref_interp_grid = ref_interp_grid,
+                                       ref_interp_method = ref_interp_method,
+                                       begin_yr = begin_yr,
+                                       end_yr = end_yr,
+                                       begin_month = begin_month,
+                                       end_month = end_month,
+                                       regs = regs,
+                                       aggregate = aggregate,
+                                       debug = debug)
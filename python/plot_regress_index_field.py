@@ -9,7 +9,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -25,8 +24,11 @@ from get_reg_seasonal_avg import get_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from get_regress_index_field import get_regress_index_field
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 from round_to_first import round_to_first
+from get_basemap import get_basemap, get_basemap_xy
 from get_season_name import get_season_name
 import argparse
 
@@ -54,7 +56,6 @@ def plot_regress_index_field (indir,
                reg_name,
                debug = False):
 
-
     print __name__, 'casename: ', casename
     print __name__, 'field_name: ', field_name
 
@@ -123,8 +124,6 @@ def plot_regress_index_field (indir,
 
 
 
-    f = plt.figure(figsize=(8.5, 11))
-
     title_txt = field_name[0] + ' (' + season_field + ') on ' \
                    + reg_name[1] + ' ' + field_name[1] + ' index' + ' (' + season_index + ')'
 
@@ -133,7 +132,59 @@ def plot_regress_index_field (indir,
                 + reg_name[1] + ' ' + field_name[1] + ' index' + ' (' + season_index + \
                 ', standardized (mean = 0, std. dev. = 1))' \
 
-    f.suptitle('Regression Coefficients:' + field_name[0], fontsize = 14, color = 'blue')
+    #Computing levels of the difference plot
+    diff_regr_matrix = regr_matrix - ref_regr_matrix
+
+    num      = 21
+    #max_plot = round_to_first(5.0 * numpy.ma.std(diff_regr_matrix))
+    max_plot = round_to_first(5.0 * numpy.nanstd(ref_regr_matrix))
+    levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+
+    outfile = plots_dir + '/' + casename[0] + '_regr_' \
+               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
+               + field_name[1] + '_' + reg[1] + '_' + season_index
+
+    #Arrays and names drawn, saved to redraw the plot (see plot_data_file)
+    plot_data = {'casename':          casename[0],
+                 'ref_case':          ref_case[0],
+                 'field_name':        field_name[0],
+                 'units':             units,
+                 'title_txt':         title_txt,
+                 'lat_reg':           lat_reg,
+                 'lon_reg':           lon_reg,
+                 'regr_matrix':       regr_matrix,
+                 't_test_matrix':     t_test_matrix,
+                 'ref_regr_matrix':   ref_regr_matrix,
+                 'ref_t_test_matrix': ref_t_test_matrix,
+                 'diff_regr_matrix':  diff_regr_matrix,
+                 'levels':            levels,
+                 'levels_diff':       levels_diff}
+
+    write_plot_data_file(outfile, 'plot_regress_index_field', plot_data)
+
+    draw_regress_index_field(plot_data, outfile)
+
+
+def draw_regress_index_field(plot_data, outfile):
+
+    casename          = plot_data['casename']
+    ref_case          = plot_data['ref_case']
+    field_name        = plot_data['field_name']
+    units             = plot_data['units']
+    title_txt         = plot_data['title_txt']
+    lat_reg           = plot_data['lat_reg']
+    lon_reg           = plot_data['lon_reg']
+    regr_matrix       = plot_data['regr_matrix']
+    t_test_matrix     = plot_data['t_test_matrix']
+    ref_regr_matrix   = plot_data['ref_regr_matrix']
+    ref_t_test_matrix = plot_data['ref_t_test_matrix']
+    diff_regr_matrix  = plot_data['diff_regr_matrix']
+    levels            = plot_data['levels']
+    levels_diff       = plot_data['levels_diff']
+
+    f = plt.figure(figsize=(8.5, 11))
+
+    f.suptitle('Regression Coefficients:' + field_name, fontsize = 14, color = 'blue')
 
     f.text(0.5, 0.95, title_txt, ha = 'center', va='center', rotation='horizontal', fontsize = 12)
 
@@ -147,15 +198,14 @@ def plot_regress_index_field (indir,
     plot_field_min  = numpy.nanmin(plot_field)
     plot_field_max  = numpy.nanmax(plot_field)
 
-    ax.set_title(casename[0], fontsize = 12)
+    ax.set_title(casename, fontsize = 12)
 
-    m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
     m.drawcoastlines()
 
-    lons, lats = numpy.meshgrid(lon_reg,lat_reg)
-    x, y = m(lons,lats)
+    x, y = get_basemap_xy(m, lat_reg, lon_reg)
 
     c = m.contourf(x, y, plot_field[:, :], cmap = 'seismic', levels = levels, extend = 'both')
     cb = m.colorbar(c)
@@ -183,15 +233,14 @@ def plot_regress_index_field (indir,
 
     ax = f.add_subplot(3,1,2)
 
-    ax.set_title(ref_case[0], fontsize = 12)
+    ax.set_title(ref_case, fontsize = 12)
 
-    m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
     m.drawcoastlines()
 
-    lons, lats = numpy.meshgrid(lon_reg,lat_reg)
-    x, y = m(lons,lats)
+    x, y = get_basemap_xy(m, lat_reg, lon_reg)
 
     c = m.contourf(x, y, plot_field[:, :], cmap = 'seismic', levels = levels, extend = 'both')
     cb = m.colorbar(c)
@@ -211,29 +260,23 @@ def plot_regress_index_field (indir,
 
     #Plot diff plots
 
-    plot_field = regr_matrix - ref_regr_matrix
+    plot_field = diff_regr_matrix
 
     plot_field_min  = numpy.nanmin(plot_field)
     plot_field_max  = numpy.nanmax(plot_field)
 
-    num      = 21
-    #max_plot = round_to_first(5.0 * numpy.ma.std(plot_field))
-    max_plot = round_to_first(5.0 * numpy.nanstd(ref_regr_matrix))
-    levels      = numpy.linspace(-max_plot, max_plot, num = num)
-
     ax = f.add_subplot(3,1,3)
 
     ax.set_title('Difference', fontsize = 12)
 
-    m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                    llcrnrlon = 0, urcrnrlon = 360, resolution = 'c')
 
     m.drawcoastlines()
 
-    lons, lats = numpy.meshgrid(lon_reg,lat_reg)
-    x, y = m(lons,lats)
+    x, y = get_basemap_xy(m, lat_reg, lon_reg)
 
-    c = m.contourf(x, y, plot_field[:, :], cmap = 'seismic', levels = levels, extend = 'both')
+    c = m.contourf(x, y, plot_field[:, :], cmap = 'seismic', levels = levels_diff, extend = 'both')
     cb = m.colorbar(c)
 
 
@@ -245,17 +288,19 @@ def plot_regress_index_field (indir,
 
     f.subplots_adjust(wspace = 0.4)
 
-    #Saving plots
-    mpl.rcParams['savefig.dpi']=300
+    save_plot(outfile)
 
-    outfile = plots_dir + '/' + casename[0] + '_regr_' \
-               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
-               + field_name[1] + '_' + reg[1] + '_' + season_index + '.png'
+    plt.close(f)
+
+
+def replot_regress_index_field(plot_data_file, plots_dir):
 
-    plt.savefig(outfile)
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_regress_index_field')
+
+    draw_regress_index_field(plot_data, plots_dir + '/' + plot_name)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -326,6 +371,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the regressions")
+
     args = parser.parse_args()
 
     debug                = args.debug
@@ -351,6 +399,7 @@ if __name__ == "__main__":
     reg                  = args.reg
     reg_name             = args.reg_name
     plots_dir            = args.plots_dir
+    replot               = args.replot
 
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
@@ -358,25 +407,29 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_regress_index_field(indir = indir,
-                             casename = casename,
-                             field_name = field_name,
-                             interp_grid = interp_grid,
-                             interp_method = interp_method,
-                             ref_case_dir = ref_case_dir,
-                             ref_case = ref_case,
-                             ref_interp_grid = ref_interp_grid,
-                             ref_interp_method = ref_interp_method,
-                             begin_yr = begin_yr,
-                             end_yr = end_yr,
-                             ref_begin_yr = ref_begin_yr,
-                             ref_end_yr = ref_end_yr,
-                             begin_month = begin_month,
-                             end_month = end_month,
-                             reg = reg,
-                             reg_name = reg_name,
-                             aggregate = aggregate,
-                             lag = lag,
-                             no_ann = no_ann,
-                             stdize = stdize,
-                             debug = debug)
+    if replot is not None:
+        replot_regress_index_field(replot, plots_dir)
+
+    else:
+        plot_regress_index_field(indir = indir,
+                                 casename = casename,
+                                 field_name = field_name,
+                                 interp_grid = interp_grid,
+                                 interp_method = interp_method,
+                                 ref_case_dir = ref_case_dir,
+                                 ref_case = ref_case,
+                                 ref_interp_grid = ref_interp_grid,
+                                 ref_interp_method = ref_interp_method,
+                                 begin_yr = begin_yr,
+                                 end_yr = end_yr,
+                                 ref_begin_yr = ref_begin_yr,
+                                 ref_end_yr = ref_end_yr,
+                                 begin_month = begin_month,
+                                 end_month = end_month,
+                                 reg = reg,
+                                 reg_name = reg_name,
+                                 aggregate = aggregate,
+                                 lag = lag,
+                                 no_ann = no_ann,
+                                 stdize = stdize,
+                                 debug = debug)
@@ -9,7 +9,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -26,6 +25,8 @@ from get_reg_seasonal_avg import get_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from get_regress_index_index import get_regress_index_index
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 from round_to_first import round_to_first
 from get_season_name import get_season_name
@@ -183,25 +184,82 @@ def plot_regress_index_index (indir,
     max_index_plot = 1.2 * numpy.max(abs(ref_index))
     max_field_plot = 1.2 * numpy.max(abs(ref_field))
 
-
-    f = plt.figure(figsize=(8.5, 11))
-
     title_txt = 'Monthly Anomalies (' + season_index + ')'
 
     if stdize == 1:
         title_txt = 'Standardized (mean = 0, std. dev. = 1) Monthly Anomalies (' + season_index + ')'
 
+    suptitle_txt = 'Scatter Plot: ' + field_name[0] + ' (' + reg[0] + ') vs. ' + \
+            field_name[1] + ' (' + reg[1] + ')'
+
+    print __name__, 'begin_month: ', begin_month
+    print __name__, 'end_month: ', end_month
+
+    outfile = plots_dir + '/' + casename[0] + '-' + ref_case[0] + '_feedback_' \
+               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
+               + field_name[1] + '_' + reg[1] + '_' + season_index
+
+    #Index series, fits and names drawn, saved to redraw the plot (see
+    #plot_data_file)
+    plot_data = {'casename':       casename[0],
+                 'ref_label':      ref_case[0] + ' (' + field_name[0] + ') vs. ' + ref_case[1] + ' (' + field_name[1] + ')',
+                 'index_name':     field_name[1],
+                 'index_label':    field_name[1] + ' (' + units_index + ')',
+                 'field_label':    field_name[0] + ' (' + units_field + ')',
+                 'title_txt':      title_txt,
+                 'suptitle_txt':   suptitle_txt,
+                 'split_yfit_x_0': split_yfit_x_0,
+                 'max_index_plot': max_index_plot,
+                 'max_field_plot': max_field_plot,
+                 'index':          index,
+                 'field':          field,
+                 'ref_index':      ref_index,
+                 'ref_field':      ref_field}
+
+    if split_yfit_x_0 == 1:
+        plot_data.update({'posit_index':     posit_index,
+                          'yfit_posit':      yfit_posit,
+                          'slope_posit':     m[0],
+                          'neg_index':       neg_index,
+                          'yfit_neg':        yfit_neg,
+                          'slope_neg':       n[0],
+                          'posit_ref_index': posit_ref_index,
+                          'ref_yfit_posit':  ref_yfit_posit,
+                          'ref_slope_posit': m_ref[0],
+                          'neg_ref_index':   neg_ref_index,
+                          'ref_yfit_neg':    ref_yfit_neg,
+                          'ref_slope_neg':   n_ref[0]})
+    else:
+        plot_data.update({'yfit':      yfit,
+                          'slope':     m[0],
+                          'ref_yfit':  ref_yfit,
+                          'ref_slope': m_ref[0]})
+
+    write_plot_data_file(outfile, 'plot_regress_index_index', plot_data)
+
+    draw_regress_index_index(plot_data, outfile)
 
 
-    f.suptitle('Scatter Plot: ' + field_name[0] + ' (' + reg[0] + ') vs. ' + \
-            field_name[1] + ' (' + reg[1] + ')', fontsize = 14, color = 'blue')
+def draw_regress_index_index(plot_data, outfile):
 
-    f.text(0.5, 0.95, title_txt, ha = 'center', va='center', rotation='horizontal', fontsize = 12)
+    index          = plot_data['index']
+    field          = plot_data['field']
+    ref_index      = plot_data['ref_index']
+    ref_field      = plot_data['ref_field']
+    index_name     = plot_data['index_name']
+    max_index_plot = plot_data['max_index_plot']
+    max_field_plot = plot_data['max_field_plot']
 
-    f.text(0.5, 0.05, field_name[1] + ' (' + units_index + ')', \
+    f = plt.figure(figsize=(8.5, 11))
+
+    f.suptitle(plot_data['suptitle_txt'], fontsize = 14, color = 'blue')
+
+    f.text(0.5, 0.95, plot_data['title_txt'], ha = 'center', va='center', rotation='horizontal', fontsize = 12)
+
+    f.text(0.5, 0.05, plot_data['index_label'], \
         ha = 'center', va='center', rotation='horizontal', fontsize = 14)
 
-    f.text(0.05, 0.5, field_name[0] + ' (' + units_field + ')', \
+    f.text(0.05, 0.5, plot_data['field_label'], \
         ha = 'center', va='center', rotation='vertical', fontsize = 14)
 
 
@@ -213,31 +271,31 @@ def plot_regress_index_index (indir,
 
 
     test_scatter = plt.scatter(index, field, s = 10, c = 'red', marker = 's', \
-                    alpha = 0.7, edgecolors = 'face', label = casename[0])
+                    alpha = 0.7, edgecolors = 'face', label = plot_data['casename'])
 
     ref_scatter  = plt.scatter(ref_index, ref_field, s = 20, c = 'black', \
                     alpha = 0.3, edgecolors = 'face', \
-                    label = ref_case[0] + ' (' + field_name[0] + ') vs. ' + ref_case[1] + ' (' + field_name[1] + ')')
+                    label = plot_data['ref_label'])
 
 
-    if split_yfit_x_0 == 1:
+    if plot_data['split_yfit_x_0'] == 1:
 
-        posit_index_line, = plt.plot(posit_index, yfit_posit, c = 'red', linewidth = 3, \
-                        label = 'Linear fit for positive ' + field_name[1] + \
-                        ' anomalies (slope = ' + str(round(m[0], 2)) + ')')
+        posit_index_line, = plt.plot(plot_data['posit_index'], plot_data['yfit_posit'], c = 'red', linewidth = 3, \
+                        label = 'Linear fit for positive ' + index_name + \
+                        ' anomalies (slope = ' + str(round(plot_data['slope_posit'], 2)) + ')')
 
-        neg_index_line,   = plt.plot(neg_index, yfit_neg, c = 'red', linewidth = 4, alpha = 0.7, \
-                        label = 'Linear fit for negative ' + field_name[1] + \
-                        ' anomalies (slope = ' + str(round(n[0], 2)) + ')')
+        neg_index_line,   = plt.plot(plot_data['neg_index'], plot_data['yfit_neg'], c = 'red', linewidth = 4, alpha = 0.7, \
+                        label = 'Linear fit for negative ' + index_name + \
+                        ' anomalies (slope = ' + str(round(plot_data['slope_neg'], 2)) + ')')
 
-        ref_posit_line,   = plt.plot(posit_ref_index, ref_yfit_posit, c = 'black', linewidth = 3, \
-                        label = 'Linear fit for positive ' + field_name[1] + \
-                        ' anomalies (slope = ' + str(round(m_ref[0], 2)) + ')')
+        ref_posit_line,   = plt.plot(plot_data['posit_ref_index'], plot_data['ref_yfit_posit'], c = 'black', linewidth = 3, \
+                        label = 'Linear fit for positive ' + index_name + \
+                        ' anomalies (slope = ' + str(round(plot_data['ref_slope_posit'], 2)) + ')')
 
 
-        ref_neg_line,     = plt.plot(neg_ref_index, ref_yfit_neg, c = 'black', linewidth = 4, alpha = 0.7, \
-                        label = 'Linear fit for negative ' + field_name[1] + \
-                        ' anomalies (slope = ' + str(round(n_ref[0], 2)) + ')')
+        ref_neg_line,     = plt.plot(plot_data['neg_ref_index'], plot_data['ref_yfit_neg'], c = 'black', linewidth = 4, alpha = 0.7, \
+                        label = 'Linear fit for negative ' + index_name + \
+                        ' anomalies (slope = ' + str(round(plot_data['ref_slope_neg'], 2)) + ')')
 
         plt.legend(handles = [test_scatter, ref_scatter, posit_index_line, neg_index_line, ref_posit_line, ref_neg_line],
                loc = 'upper left',
@@ -245,30 +303,29 @@ def plot_regress_index_index (indir,
 
     else:
 
-        yfit_line, = plt.plot(index, yfit, c = 'red', linewidth = 3, \
-                        label = 'Linear fit (slope = ' + str(round(m[0], 2)) + ')')
+        yfit_line, = plt.plot(index, plot_data['yfit'], c = 'red', linewidth = 3, \
+                        label = 'Linear fit (slope = ' + str(round(plot_data['slope'], 2)) + ')')
 
-        ref_yfit_line, = plt.plot(ref_index, ref_yfit, c = 'black', linewidth = 3, \
-                        label = 'Linear fit (slope = ' + str(round(m_ref[0], 2)) + ')')
+        ref_yfit_line, = plt.plot(ref_index, plot_data['ref_yfit'], c = 'black', linewidth = 3, \
+                        label = 'Linear fit (slope = ' + str(round(plot_data['ref_slope'], 2)) + ')')
 
         plt.legend(handles = [test_scatter, ref_scatter, yfit_line, ref_yfit_line],
                loc = 'upper left',
                fontsize = 10)
 
-    mpl.rcParams['savefig.dpi']=300
+    save_plot(outfile)
 
+    plt.close(f)
 
-    print __name__, 'begin_month: ', begin_month
-    print __name__, 'end_month: ', end_month
 
-    outfile = plots_dir + '/' + casename[0] + '-' + ref_case[0] + '_feedback_' \
-               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
-               + field_name[1] + '_' + reg[1] + '_' + season_index + '.png'
+def replot_regress_index_index(plot_data_file, plots_dir):
+
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_regress_index_index')
 
-    plt.savefig(outfile)
+    draw_regress_index_index(plot_data, plots_dir + '/' + plot_name)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -342,6 +399,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to GPCP directory")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the regressions")
+
     args = parser.parse_args()
 
     debug                = args.debug
@@ -368,6 +428,7 @@ if __name__ == "__main__":
     reg_name        = args.reg_name
     split_yfit_x_0        = args.split_yfit_x_0
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
@@ -375,27 +436,31 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_regress_index_index (indir = indir,
-                   casename = casename,
-                               field_name = field_name,
-                   interp_grid = interp_grid,
-                   interp_method = interp_method,
-                   ref_case_dir = ref_case_dir,
-                   ref_case = ref_case,
-                   ref_interp_grid = ref_interp_grid,
-                   ref_interp_method = ref_interp_method,
-                               begin_yr = begin_yr,
-                               end_yr = end_yr,
-                   ref_begin_yr = ref_begin_yr,
-                   ref_end_yr = ref_end_yr,
-                               begin_month = begin_month,
-                               end_month = end_month,
-                               reg = reg,
-                   reg_name = reg_name,
-                   aggregate = aggregate,
-                   lag = lag,
-                   no_ann = no_ann,
-                   stdize = stdize,
-                   split_yfit_x_0 = split_yfit_x_0,
-                   plots_dir = plots_dir,
-                               debug = debug)
+    if replot is not None:
+        replot_regress_index_index(replot, plots_dir)
+
+    else:
+        plot_regress_index_index (indir = indir,
+                       casename = casename,
+                                   field_name = field_name,
+                       interp_grid = interp_grid,
+                       interp_method = interp_method,
+                       ref_case_dir = ref_case_dir,
+                       ref_case = ref_case,
+                       ref_interp_grid = ref_interp_grid,
+                       ref_interp_method = ref_interp_method,
+                                   begin_yr = begin_yr,
+                                   end_yr = end_yr,
+                       ref_begin_yr = ref_begin_yr,
+                       ref_end_yr = ref_end_yr,
+                                   begin_month = begin_month,
+                                   end_month = end_month,
+                                   reg = reg,
+                       reg_name = reg_name,
+                       aggregate = aggregate,
+                       lag = lag,
+                       no_ann = no_ann,
+                       stdize = stdize,
+                       split_yfit_x_0 = split_yfit_x_0,
+                       plots_dir = plots_dir,
+                                   debug = debug)
@@ -9,7 +9,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -24,9 +23,12 @@ from aggregate_ts_weighted import aggregate_ts_weighted
 from get_reg_seasonal_avg import get_reg_seasonal_avg
 from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
-from get_regress_index_field import get_regress_index_field
+from get_regress_index_field_lags import get_regress_index_field_lags
+from save_plot import save_plot
+from plot_data_file import write_plot_data_file, read_plot_data_file
 from optparse import OptionParser
 from round_to_first import round_to_first
+from get_basemap import get_basemap, get_basemap_xy
 from get_season_name import get_season_name
 import argparse
 
@@ -51,7 +53,6 @@ def plot_regress_lead_lag_index_field (indir,
                reg_name,
                debug = False):
 
-
     print __name__, 'casename: ', casename
     print __name__, 'field_name: ', field_name
 
@@ -59,8 +60,7 @@ def plot_regress_lead_lag_index_field (indir,
 #    lags = range(-4, 4, 4)
     n_lags = len(lags)
 
-    for i, lag in enumerate(lags):
-        regr_matrix, corr_matrix, t_test_matrix, lat_reg, lon_reg, units = get_regress_index_field (
+    regr_matrix_lag, corr_matrix_lag, t_test_matrix_lag, lat_reg, lon_reg, units = get_regress_index_field_lags (
                                   indir     = indir,
                                   casename     = casename,
                                   field_name     = field_name,
@@ -73,20 +73,11 @@ def plot_regress_lead_lag_index_field (indir,
                                   aggregate    = 0,
                                   no_ann    = 1,
                                   stdize    = stdize,
-                                  lag         = lag,
+                                  lags         = lags,
                                   reg         = reg,
                                   reg_name    = reg_name,
                                   debug     = debug)
 
-        if i == 0:
-            regr_matrix_lag   = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
-            corr_matrix_lag   = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
-            t_test_matrix_lag = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
-
-        regr_matrix_lag[i, ::]   = regr_matrix
-        corr_matrix_lag[i, ::]   = corr_matrix
-        t_test_matrix_lag[i, ::] = t_test_matrix
-
 
     plot_field =  regr_matrix_lag
     plot_t_test = t_test_matrix_lag
@@ -101,8 +92,7 @@ def plot_regress_lead_lag_index_field (indir,
     if debug: print __name__, 'field_name_ref: ', field_name_ref
 
 
-    for i, lag in enumerate(lags):
-        ref_regr_matrix, ref_corr_matrix, ref_t_test_matrix, lat_reg, lon_reg, units = get_regress_index_field (
+    ref_regr_matrix_lag, ref_corr_matrix_lag, ref_t_test_matrix_lag, lat_reg, lon_reg, units = get_regress_index_field_lags (
                                   indir         = ref_case_dir,
                                   casename      = ref_case,
                                   field_name    = field_name_ref,
@@ -113,27 +103,18 @@ def plot_regress_lead_lag_index_field (indir,
                                   begin_month   = begin_month,
                                   end_month     = end_month,
                                   aggregate     = 0,
-                                  lag           = lag,
+                                  lags          = lags,
                                   no_ann        = 1,
                                   stdize        = stdize,
                                   reg           = reg,
                                   reg_name       = reg_name,
                                   debug         = debug)
 
-        if i == 0:
-            ref_regr_matrix_lag   = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
-            ref_corr_matrix_lag   = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
-            ref_t_test_matrix_lag = numpy.ma.zeros((n_lags, lat_reg.shape[0], lon_reg.shape[0]))
+    ref_plot_field = ref_regr_matrix_lag
+    ref_plot_t_test = ref_t_test_matrix_lag
 
-        ref_regr_matrix_lag[i, ::]   = ref_regr_matrix
-        ref_corr_matrix_lag[i, ::]   = ref_corr_matrix
-        ref_t_test_matrix_lag[i, ::] = ref_t_test_matrix
-
-        ref_plot_field = ref_regr_matrix_lag
-        ref_plot_t_test = ref_t_test_matrix_lag
-
-        if debug: print __name__, 'plot_field: ', plot_field
-        if debug: print __name__, 'ref_plot_field: ', ref_plot_field
+    if debug: print __name__, 'plot_field: ', plot_field
+    if debug: print __name__, 'ref_plot_field: ', ref_plot_field
 
     season_field = get_season_name(begin_month[0], end_month[0])
     season_index = get_season_name(begin_month[1], end_month[1])
@@ -161,8 +142,13 @@ def plot_regress_lead_lag_index_field (indir,
     print 'contour levels: ', levels
 
 
+    print __name__, 'begin_month: ', begin_month
+    print __name__, 'end_month: ', end_month
+
     #PLOT REGRESSIONS
-    f, ax = plt.subplots(n_lags, 3, figsize=(12, 11))
+    outfile = plots_dir + '/' + casename[0] + '_ENSO_evolution_regr_' \
+               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
+               + field_name[1] + '_' + reg[1] + '_' + season_index
 
     title_txt = 'Lead-lag Regression Coefficients: ' + field_name[0] + ' on ' \
                    + reg_name[1] + ' (' + field_name[1] + ') index'
@@ -172,149 +158,137 @@ def plot_regress_lead_lag_index_field (indir,
                 'standardized ' + reg_name[1] + ' (' + field_name[1] + ') index'  + \
                 ' (mean = 0, std. dev. = 1)'
 
-    f.suptitle('ENSO Evolution: ' +  field_name[0], fontsize = 12, color = 'blue')
-
-    f.text(0.5, 0.95, title_txt, ha = 'center', va='center', rotation='horizontal', fontsize = 10)
-
-    lons, lats = numpy.meshgrid(lon_reg,lat_reg)
-
-    for k in [0, 1, 2]:
-        if k == 0:
-            plot_case = casename[0]
-            plot_field = regr_matrix_lag
-            plot_t_test = t_test_matrix_lag
-
-        if k == 1:
-            plot_case = ref_case[0]
-            plot_field = ref_regr_matrix_lag
-            plot_t_test = ref_t_test_matrix_lag
-
-        if k == 2:
-            plot_case = 'Difference'
-            plot_field = regr_matrix_lag - ref_regr_matrix_lag
+    #Arrays and names drawn, saved to redraw the plot (see plot_data_file)
+    plot_data = {'kind':              'regr',
+                 'casename':          casename[0],
+                 'ref_case':          ref_case[0],
+                 'field_name':        field_name[0],
+                 'units':             units,
+                 'title_txt':         title_txt,
+                 'lags':              numpy.array(lags),
+                 'lat_reg':           lat_reg,
+                 'lon_reg':           lon_reg,
+                 'plot_field':        regr_matrix_lag,
+                 'ref_plot_field':    ref_regr_matrix_lag,
+                 'diff_plot_field':   regr_matrix_lag - ref_regr_matrix_lag,
+                 't_test_matrix':     t_test_matrix_lag,
+                 'ref_t_test_matrix': ref_t_test_matrix_lag,
+                 'levels':            levels}
 
+    write_plot_data_file(outfile, 'plot_regress_lead_lag_index_field', plot_data)
 
+    draw_regress_lead_lag_index_field(plot_data, outfile)
 
 
-        for i, lag in enumerate(lags):
-            ax[i, k].set_title('lag = ' + str(lag) + ' months', fontsize = 10)
-
-            m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-                llcrnrlon=0,urcrnrlon=360,resolution='c', ax = ax[i, k])
-
-            m.drawcoastlines()
-
-            x, y = m(lons,lats)
-
-            c = m.contourf(x, y, plot_field[i, :, :], cmap = 'seismic', levels = levels, extend = 'both')
-
-            #plotting hatches representing statistical significance
-            if k != 2:
-                m.contourf(x, y, plot_t_test[i, :, :], 2, colors = 'none', extend = 'both', hatches = [None, '////'])
-
-            if i == 0:
-                ax[i, k].text(0.5, 1.2, plot_case, ha='center', \
-                    fontsize = 10, transform=ax[i, k].transAxes, color = 'green')
-
-            text_data = 'min = '  + str(round(numpy.nanmin(plot_field[i, :, :]), 2)) + ', ' + \
-                    'max = '  + str(round(numpy.nanmax(plot_field[i, :, :]), 2))
-
-            ax[i, k].text(0, -100, text_data, transform = ax[i, k].transData, fontsize = 6)
-
-    text_data = 'Units = ' + units + '. ' + \
-            'Hatched areas: Significant at 95% confidence level. ' + \
-            'Positive lags indicate Nino 3.4 index leading.'
-
-    f.text(0.05, 0.05, text_data, va='center', rotation='horizontal', fontsize = 8)
-
-
-    plt.subplots_adjust(hspace=0.25)
+    #PLOT CORRELATIONS
+    max_plot = round_to_first(5.0 * numpy.nanstd(ref_corr_matrix_lag))
+    levels      = numpy.linspace(-max_plot, max_plot, num = num)
 
-    f.subplots_adjust(right = 0.85)
+    outfile = plots_dir + '/' + casename[0] + '_ENSO_evolution_corr_' \
+               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
+               + field_name[1] + '_' + reg[1] + '_' + season_index
 
-    cbar_ax = f.add_axes([0.9, 0.25, 0.01, 0.5])
+    title_txt = 'Lead-lag Correlations: ' + field_name[0] + ' on ' \
+                   + reg_name[1] + ' (' + field_name[1] + ') index'
 
-    cb = f.colorbar(c, cax=cbar_ax)
-    cb.set_label('Regression Coefficient (' + units + ')')
+    if stdize == 1:
+        title_txt = 'Lead-lag Correlations: ' + field_name[0] + ' on ' \
+                'standardized ' + reg_name[1] + ' (' + field_name[1] + ') index'  + \
+                ' (mean = 0, std. dev. = 1)'
 
-    mpl.rcParams['savefig.dpi']=300
+    plot_data = {'kind':            'corr',
+                 'casename':        casename[0],
+                 'ref_case':        ref_case[0],
+                 'field_name':      field_name[0],
+                 'units':           units,
+                 'title_txt':       title_txt,
+                 'lags':            numpy.array(lags),
+                 'lat_reg':         lat_reg,
+                 'lon_reg':         lon_reg,
+                 'plot_field':      corr_matrix_lag,
+                 'ref_plot_field':  ref_corr_matrix_lag,
+                 'diff_plot_field': corr_matrix_lag - ref_corr_matrix_lag,
+                 'levels':          levels}
 
+    write_plot_data_file(outfile, 'plot_regress_lead_lag_index_field', plot_data)
 
-    print __name__, 'begin_month: ', begin_month
-    print __name__, 'end_month: ', end_month
+    draw_regress_lead_lag_index_field(plot_data, outfile)
 
-    outfile = plots_dir + '/' + casename[0] + '_ENSO_evolution_regr_' \
-               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
-               + field_name[1] + '_' + reg[1] + '_' + season_index + '.png'
 
-    plt.savefig(outfile)
+#Draws the lead-lag regressions (kind = 'regr', hatching significant
+#regressions) or correlations (kind = 'corr') of a field on an index
 
+def draw_regress_lead_lag_index_field(plot_data, outfile):
 
+    kind       = plot_data['kind']
+    field_name = plot_data['field_name']
+    units      = plot_data['units']
+    title_txt  = plot_data['title_txt']
+    lags       = plot_data['lags']
+    lat_reg    = plot_data['lat_reg']
+    lon_reg    = plot_data['lon_reg']
+    levels     = plot_data['levels']
 
-    #PLOT CORRELATIONS
-    max_plot = round_to_first(5.0 * numpy.nanstd(ref_corr_matrix_lag))
-    levels      = numpy.linspace(-max_plot, max_plot, num = num)
+    n_lags = len(lags)
 
     f, ax = plt.subplots(n_lags, 3, figsize=(12, 11))
 
-    title_txt = 'Lead-lag Correlations: ' + field_name[0] + ' on ' \
-                   + reg_name[1] + ' (' + field_name[1] + ') index'
-
-    if stdize == 1:
-        title_txt = 'Lead-lag Correlations: ' + field_name[0] + ' on ' \
-                'standardized ' + reg_name[1] + ' (' + field_name[1] + ') index'  + \
-                ' (mean = 0, std. dev. = 1)'
-
-    f.suptitle('ENSO Evolution: ' +  field_name[0], fontsize = 12, color = 'blue')
+    f.suptitle('ENSO Evolution: ' +  field_name, fontsize = 12, color = 'blue')
 
     f.text(0.5, 0.95, title_txt, ha = 'center', va='center', rotation='horizontal', fontsize = 10)
 
-    lons, lats = numpy.meshgrid(lon_reg,lat_reg)
-
     for k in [0, 1, 2]:
         if k == 0:
-            plot_case = casename[0]
-            plot_field = corr_matrix_lag
-            plot_t_test = t_test_matrix_lag
+            plot_case = plot_data['casename']
+            plot_field = plot_data['plot_field']
+            if kind == 'regr': plot_t_test = plot_data['t_test_matrix']
 
         if k == 1:
-            plot_case = ref_case[0]
-            plot_field = ref_corr_matrix_lag
-            plot_t_test = ref_t_test_matrix_lag
+            plot_case = plot_data['ref_case']
+            plot_field = plot_data['ref_plot_field']
+            if kind == 'regr': plot_t_test = plot_data['ref_t_test_matrix']
 
         if k == 2:
             plot_case = 'Difference'
-            plot_field = corr_matrix_lag - ref_corr_matrix_lag
+            plot_field = plot_data['diff_plot_field']
 
 
         for i, lag in enumerate(lags):
             ax[i, k].set_title('lag = ' + str(lag) + ' months', fontsize = 10)
 
-            m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-                llcrnrlon=0,urcrnrlon=360,resolution='c', ax = ax[i, k])
+            m = get_basemap(projection = 'cyl', llcrnrlat = -90, urcrnrlat = 90,
+                            llcrnrlon = 0, urcrnrlon = 360, resolution = 'c', ax = ax[i, k])
 
             m.drawcoastlines()
 
-            x, y = m(lons,lats)
+            x, y = get_basemap_xy(m, lat_reg, lon_reg)
 
             c = m.contourf(x, y, plot_field[i, :, :], cmap = 'seismic', levels = levels, extend = 'both')
 
             #plotting hatches representing statistical significance
-        #    m.contourf(x, y, plot_t_test[i, :, :], 2, colors = 'none', extend = 'both', hatches = [None, '////'])
+            if kind == 'regr' and k != 2:
+                m.contourf(x, y, plot_t_test[i, :, :], 2, colors = 'none', extend = 'both', hatches = [None, '////'])
+
+            if i == 0:
+                ax[i, k].text(0.5, 1.2, plot_case, ha='center', \
+                    fontsize = 10, transform=ax[i, k].transAxes, color = 'green')
 
             text_data = 'min = '  + str(round(numpy.nanmin(plot_field[i, :, :]), 2)) + ', ' + \
                     'max = '  + str(round(numpy.nanmax(plot_field[i, :, :]), 2))
 
             ax[i, k].text(0, -100, text_data, transform = ax[i, k].transData, fontsize = 6)
 
-            if i == 0:
-                ax[i, k].text(0.5, 1.2, plot_case, ha='center', \
-                    fontsize = 10, transform=ax[i, k].transAxes, color = 'green')
+    if kind == 'regr':
+        text_data = 'Units = ' + units + '. ' + \
+                'Hatched areas: Significant at 95% confidence level. ' + \
+                'Positive lags indicate Nino 3.4 index leading.'
 
+        f.text(0.05, 0.05, text_data, va='center', rotation='horizontal', fontsize = 8)
 
-    text_data =  'Positive lags indicate Nino 3.4 index leading.'
+    else:
+        text_data =  'Positive lags indicate Nino 3.4 index leading.'
 
-    f.text(0.05, 0.05, text_data, rotation='horizontal', fontsize = 10)
+        f.text(0.05, 0.05, text_data, rotation='horizontal', fontsize = 10)
 
 
     plt.subplots_adjust(hspace=0.25)
@@ -324,22 +298,25 @@ def plot_regress_lead_lag_index_field (indir,
     cbar_ax = f.add_axes([0.9, 0.25, 0.01, 0.5])
 
     cb = f.colorbar(c, cax=cbar_ax)
-    cb.set_label('Correlation')
 
-    mpl.rcParams['savefig.dpi']=300
+    if kind == 'regr':
+        cb.set_label('Regression Coefficient (' + units + ')')
+    else:
+        cb.set_label('Correlation')
 
+    save_plot(outfile)
 
-    print __name__, 'begin_month: ', begin_month
-    print __name__, 'end_month: ', end_month
+    plt.close(f)
 
-    outfile = plots_dir + '/' + casename[0] + '_ENSO_evolution_corr_' \
-               + field_name[0] + '_' + reg[0] + '_' + season_field + '_' \
-               + field_name[1] + '_' + reg[1] + '_' + season_index + '.png'
 
-    plt.savefig(outfile)
+def replot_regress_lead_lag_index_field(plot_data_file, plots_dir):
+
+    plot_data, plot_name = read_plot_data_file(plot_data_file, 'plot_regress_lead_lag_index_field')
+
+    draw_regress_lead_lag_index_field(plot_data, plots_dir + '/' + plot_name)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
@@ -407,6 +384,9 @@ if __name__ == "__main__":
     parser.add_argument("--plots_dir", dest = "plots_dir",
                         help = "filepath to directory where plots will be saved")
 
+    parser.add_argument("--replot", dest = "replot",
+                        help = "plot data file (see plot_data_file.py) to plot again, without computing the regressions")
+
     args = parser.parse_args()
 
     debug                = args.debug
@@ -431,6 +411,7 @@ if __name__ == "__main__":
     reg            = args.reg
     reg_name        = args.reg_name
     plots_dir           = args.plots_dir
+    replot              = args.replot
 
 
     colors = ['b', 'g', 'r', 'c', 'm', 'y']
@@ -438,22 +419,26 @@ if __name__ == "__main__":
     x = mpl.get_backend()
     print 'backend: ', x
 
-    plot_regress_lead_lag_index_field (indir = indir,
-                   casename = casename,
-                               field_name = field_name,
-                   interp_grid = interp_grid,
-                   interp_method = interp_method,
-                   ref_case_dir = ref_case_dir,
-                   ref_case = ref_case,
-                   ref_interp_grid = ref_interp_grid,
-                   ref_interp_method = ref_interp_method,
-                               begin_yr = begin_yr,
-                               end_yr = end_yr,
-                               ref_begin_yr = ref_begin_yr,
-                               ref_end_yr = ref_end_yr,
-                               begin_month = begin_month,
-                               end_month = end_month,
-                               reg = reg,
-                   reg_name = reg_name,
-                   aggregate = aggregate,
-                               debug = debug)
+    if replot is not None:
+        replot_regress_lead_lag_index_field(replot, plots_dir)
+
+    else:
+        plot_regress_lead_lag_index_field (indir = indir,
+                       casename = casename,
+                                   field_name = field_name,
+                       interp_grid = interp_grid,
+                       interp_method = interp_method,
+                       ref_case_dir = ref_case_dir,
+                       ref_case = ref_case,
+                       ref_interp_grid = ref_interp_grid,
+                       ref_interp_method = ref_interp_method,
+                                   begin_yr = begin_yr,
+                                   end_yr = end_yr,
+                                   ref_begin_yr = ref_begin_yr,
+                                   ref_end_yr = ref_end_yr,
+                                   begin_month = begin_month,
+                                   end_month = end_month,
+                                   reg = reg,
+                       reg_name = reg_name,
+                       aggregate = aggregate,
+                                   debug = debug)
@@ -6,12 +6,6 @@
 # in the LICENSE file in the top level a-prime directory
 #
 
-import matplotlib as mpl
-#changing the default backend to agg to resolve contouring issue on rhea
-mpl.use('Agg')
-
-from   mpl_toolkits.basemap import Basemap
-import matplotlib.pyplot as plt
 import math
 import numpy
 
@@ -24,6 +18,10 @@ from get_reg_area_avg_rmse import get_reg_area_avg_rmse
 from read_climo_file       import read_climo_file
 from compute_reg_seasonal_climo_and_stddev import compute_reg_seasonal_climo_and_stddev
 from compute_contour_levels import compute_contour_levels
+from get_contour_levels    import get_contour_levels
+from get_basemap           import get_basemap, get_basemap_xy
+from save_plot             import save_plot
+from plot_data_file        import write_plot_data_file, read_plot_data_file
 from optparse            import OptionParser
 
 parser = OptionParser(usage = "python %prog [options]")
@@ -82,6 +80,224 @@ parser.add_option("--plots_dir", dest = "plots_dir",
 parser.add_option("--debug", dest = "debug",
                     help = "debug flag", default = False)
 
+parser.add_option("--replot", dest = "replot",
+                    help = "plot data file (see plot_data_file.py) to plot again, without computing the climatologies")
+
+
+def draw_stddev(plot_data, outfile):
+
+    #Imported here, so that --help and option errors return without loading
+    #the plotting packages
+    import matplotlib as mpl
+    #changing the default backend to agg to resolve contouring issue on rhea
+    #(already set if pyplot was imported, e.g. by plot_climo_batch)
+    mpl.use('Agg', warn = False)
+    import matplotlib.pyplot as plt
+
+    casename   = plot_data['casename']
+    ref_case   = plot_data['ref_case']
+    field_name = plot_data['field_name']
+    units      = plot_data['units']
+    season     = plot_data['season']
+    lat        = plot_data['lat']
+    lon        = plot_data['lon']
+
+    field_mean        = plot_data['field_mean']
+    ref_field_mean    = plot_data['ref_field_mean']
+    field_mean_diff   = plot_data['field_mean_diff']
+    field_stddev      = plot_data['field_stddev']
+    ref_field_stddev  = plot_data['ref_field_stddev']
+    field_stddev_diff = plot_data['field_stddev_diff']
+
+    levels_mean        = plot_data['levels_mean']
+    levels_mean_diff   = plot_data['levels_mean_diff']
+    levels_stddev      = plot_data['levels_stddev']
+    levels_stddev_diff = plot_data['levels_stddev_diff']
+    cmap_mean          = plot_data['cmap_mean']
+
+    #Plot std. dev.
+    f, ax = plt.subplots(3, 2, figsize=(17, 11))
+
+    plt.suptitle('Climatology and Inter-annual Standard Deviation\n' + field_name + ' (' + units + ') ' + season, fontsize = 14, color = 'blue')
+
+    for k in [0, 1, 2]:
+        if k == 0:
+            plot_case = casename
+            plot_field = field_mean
+            cmap_color = cmap_mean
+            levels = levels_mean
+        if k == 1:
+            plot_case = ref_case
+            plot_field = ref_field_mean
+            cmap_color = cmap_mean
+            levels = levels_mean
+        if k == 2:
+            plot_case = 'Difference'
+            plot_field = field_mean_diff
+            cmap_color = 'seismic'
+            levels   = levels_mean_diff
+
+        plot_field_min = numpy.min(plot_field[:])
+        plot_field_max = numpy.max(plot_field[:])
+
+        ax[k, 0].set_title(plot_case)
+
+        m = get_basemap(projection = 'cyl', llcrnrlat = lat[0], urcrnrlat = lat[-1],
+                        llcrnrlon = lon[0], urcrnrlon = lon[-1], resolution = 'c', ax = ax[k, 0])
+
+        m.drawcoastlines()
+
+        x, y = get_basemap_xy(m, lat, lon)
+
+
+        c = m.contourf(x, y, plot_field[:, :], cmap = cmap_color, levels = levels, extend = 'both')
+
+        meridians = numpy.arange(numpy.floor(lon[0]),numpy.ceil(lon[-1]),30)
+        parallels = numpy.arange(numpy.floor(lat[0]),numpy.ceil(lat[-1]),30)
+
+        m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
+        m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
+
+        cb = m.colorbar(c)
+
+        text_data = 'min = '  + str(round(plot_field_min, 2)) + ', ' + \
+                'max = '  + str(round(plot_field_max, 2))
+
+        ax[k, 0].text(0.0, -0.15, text_data, transform = ax[k, 0].transAxes, fontsize = 10)
+
+        if k == 0:
+            ax[k, 0].text(0.5, 1.2, 'Mean', ha='center', \
+                    fontsize = 14, transform=ax[k, 0].transAxes, color = 'green')
+
+
+    for k in [0, 1, 2]:
+        if k == 0:
+            plot_case = casename
+            plot_field = field_stddev
+            cmap_color = 'hot_r'
+            levels = levels_stddev
+        if k == 1:
+            plot_case = ref_case
+            plot_field = ref_field_stddev
+            cmap_color = 'hot_r'
+            levels = levels_stddev
+        if k == 2:
+            plot_case = 'Difference'
+            plot_field = field_stddev_diff
+            cmap_color = 'seismic'
+            levels   = levels_stddev_diff
+
+        plot_field_min = numpy.min(plot_field[:])
+        plot_field_max = numpy.max(plot_field[:])
+
+        ax[k, 1].set_title(plot_case)
+
+        m = get_basemap(projection = 'cyl', llcrnrlat = lat[0], urcrnrlat = lat[-1],
+                        llcrnrlon = lon[0], urcrnrlon = lon[-1], resolution = 'c', ax = ax[k, 1])
+
+        m.drawcoastlines()
+
+        x, y = get_basemap_xy(m, lat, lon)
+
+
+        c = m.contourf(x, y, plot_field[:, :], cmap = cmap_color, levels = levels, extend = 'both')
+
+        meridians = numpy.arange(numpy.floor(lon[0]),numpy.ceil(lon[-1]),30)
+        parallels = numpy.arange(numpy.floor(lat[0]),numpy.ceil(lat[-1]),30)
+
+        m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
+        m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
+
+        cb = m.colorbar(c)
+
+        text_data = 'min = '  + str(round(plot_field_min, 2)) + ', ' + \
+                'max = '  + str(round(plot_field_max, 2))
+
+        ax[k, 1].text(0.0, -0.15, text_data, transform = ax[k, 1].transAxes, fontsize = 10)
+
+        if k == 0:
+            ax[k, 1].text(0.5, 1.2, 'Std. Dev.', ha='center', \
+                    fontsize = 14, transform=ax[k, 1].transAxes, color = 'green')
+
+    plt.subplots_adjust(hspace=0.25)
+
+
+    #Plot ref_case
+    #ax = f.add_subplot(2,1,2)
+    #
+    #ax.set_title(ref_case)
+    #
+    #m = Basemap(projection='cyl',llcrnrlat=lat[0],urcrnrlat=lat[-1],\
+    #            llcrnrlon=lon[0],urcrnrlon=lon[-1],resolution='c')
+    #
+    #m.drawcoastlines()
+    #
+    #c = m.contourf(x, y, ref_plot_field[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
+    #
+    #m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
+    #m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
+    #
+    #cb = m.colorbar(c)
+    #
+    #text_data = 'min = '  + str(round(ref_field_min, 2)) + ', ' + \
+    #            'max = '  + str(round(ref_field_max, 2))
+    #
+    #ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+
+
+    ##Computing levels for diff plot using mean and standard deviation
+    #field_diff      = field[:, :] - field_ref_case[:, :]
+    #field_diff_mean = field_avg - field_ref_case_avg
+    #field_diff_rmse = get_reg_area_avg_rmse(field_diff, lat, lon, area)
+    #field_diff_min  = numpy.min(field_diff)
+    #field_diff_max  = numpy.max(field_diff)
+    #
+    #num         = 11
+    #max_plot    = round_to_first(4.0 * numpy.ma.std(field_diff))
+    #levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
+    #
+    #print
+    #print 'For difference plot: '
+    #print 'mean, stddev, max_plot: ', \
+    #        numpy.ma.mean(field_diff), numpy.ma.std(field_diff), max_plot
+    #print 'min, max: ', numpy.ma.min(field_diff), numpy.ma.max(field_diff)
+    #print 'contour levels: ', levels_diff
+    #
+    ##Plot difference plot
+    #ax = f.add_subplot(3,1,3)
+    #
+    ##ax.set_title(casename + ' - ' + ref_case)
+    #ax.set_title('Difference')
+    #
+    #m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
+    #            llcrnrlon=0,urcrnrlon=360,resolution='c')
+    #m.drawcoastlines()
+    #
+    #c = m.contourf(x, y, field_diff[:, :], cmap = 'seismic', levels = levels_diff, extend = 'both')
+    #cb = m.colorbar()
+    #
+    #text_data = 'RMSE = ' + str(round(field_diff_rmse, 2))+ ', ' + \
+    #        'mean bias = ' + str(round(field_diff_mean, 2))+ ', ' + \
+    #            'min = '  + str(round(field_diff_min, 2)) + ', ' + \
+    #            'max = '  + str(round(field_diff_max, 2))
+    #
+    #ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
+
+    #Fill contour was buggy when plotting negative values, so we use image plots with line contours overlayed as another option
+    #Contour seems to be fixed now with a different backend
+    #c = m.imshow(field_diff, cmap = 'seismic', vmin = -max_abs, vmax = max_abs, filternorm = 0, interpolation = 'nearest')
+    #cb = m.colorbar(extend = 'both')
+    #c = m.contour(x, y, field_diff, levels = levels_diff, colors = 'k', extend = 'both', linewidths = 0.25)
+
+
+
+    save_plot(outfile)
+
+    #plt.show()
+
+    plt.close(f)
+
+
 (options, args) = parser.parse_args()
 
 indir                = options.indir
@@ -102,278 +318,143 @@ ref_interp_grid         = options.ref_interp_grid
 ref_interp_method       = options.ref_interp_method
 plots_dir              = options.plots_dir
 debug            = options.debug
-
-#Get filename
-season = get_season_name(begin_month, end_month)
-
-print
-print 'Computing climo and inter-annual std. dev. for case: ', casename
-print
-
-field_mean, field_stddev, lat, lon, units = compute_reg_seasonal_climo_and_stddev(
-                                indir = indir,
-                                casename= casename,
-                                field_name = field_name,
-                                interp_grid = interp_grid,
-                                interp_method = interp_method,
-                                begin_yr= begin_yr,
-                                end_yr= end_yr,
-                                begin_month = begin_month,
-                                end_month = end_month,
-                                reg = reg,
-                                aggregate = 1,
-                                debug = debug)
-
-
-ref_field_mean, ref_field_stddev, lat, lon, units = compute_reg_seasonal_climo_and_stddev(
-                                indir = ref_case_dir,
-                                casename = ref_case,
-                                field_name = field_name,
-                                interp_grid = ref_interp_grid,
-                                interp_method = ref_interp_method,
-                                begin_yr= ref_begin_yr,
-                                end_yr= ref_end_yr,
-                                begin_month = begin_month,
-                                end_month = end_month,
-                                reg = reg,
-                                aggregate = 1,
-                                debug = debug)
-
-
-#field, lat, lon, area, units = read_climo_file(indir = indir, \
-#                     casename = casename, \
-#                     season = season, \
-#                     field_name = field_name, \
-#                     begin_yr = begin_yr, \
-#                     end_yr = end_yr, \
-#                     interp_grid = interp_grid, \
-#                     interp_method = interp_method, \
-#                     reg = 'global')
-#
-#print
-#print 'Reading climo file for case: ', ref_case
-#print
-#
-#field_ref_case, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
-#                         casename = ref_case, \
-#                         season = season, \
-#                         field_name = field_name, \
-#                         begin_yr = ref_begin_yr, \
-#                         end_yr = ref_end_yr, \
-#                         interp_grid = ref_interp_grid, \
-#                         interp_method = ref_interp_method,
-#                         reg = 'global')
-#
-
-
-#field_max = numpy.max(field[:])
-#field_min = numpy.min(field[:])
-#field_avg = get_reg_area_avg(field, lat, lon, area)
-#
-#field_ref_case_max = numpy.max(field_ref_case[:])
-#field_ref_case_min = numpy.min(field_ref_case[:])
-#field_ref_case_avg = get_reg_area_avg(field_ref_case, lat, lon, area)
-
-
-
-#Computing levels using mean and standard deviation
-num = 11
-n_stddev = 5
-
-
-#Plot std. dev.
-f, ax = plt.subplots(3, 2, figsize=(17, 11))
-
-plt.suptitle('Climatology and Inter-annual Standard Deviation\n' + field_name + ' (' + units + ') ' + season, fontsize = 14, color = 'blue')
-
-levels = compute_contour_levels(ref_field_mean, n_stddev, num)
-
-for k in [0, 1, 2]:
-    if k == 0:
-        plot_case = casename
-        plot_field = field_mean
-        cmap_color = 'hot_r'
-        if numpy.ma.min(ref_field_mean) < 0 and numpy.ma.max(ref_field_mean) > 0:
-            cmap_color = 'seismic'
-    if k == 1:
-        plot_case = ref_case
-        plot_field = ref_field_mean
-        cmap_color = 'hot_r'
-        if numpy.ma.min(ref_field_mean) < 0 and numpy.ma.max(ref_field_mean) > 0:
-            cmap_color = 'seismic'
-    if k == 2:
-        plot_case = 'Difference'
-        plot_field = field_mean - ref_field_mean
-        cmap_color = 'seismic'
-        max_plot = round_to_first(2.0 * numpy.ma.std(ref_field_mean))
-        levels   = numpy.linspace(-max_plot, max_plot, num = num)
-        #levels = compute_contour_levels(plot_field, n_stddev, num)
-
-    plot_field_min = numpy.min(plot_field[:])
-    plot_field_max = numpy.max(plot_field[:])
-
-    ax[k, 0].set_title(plot_case)
-
-    m = Basemap(projection='cyl',llcrnrlat=lat[0],urcrnrlat=lat[-1],\
-            llcrnrlon=lon[0],urcrnrlon=lon[-1],resolution='c', ax = ax[k, 0])
-
-    m.drawcoastlines()
-
-    lons, lats = numpy.meshgrid(lon,lat)
-    x, y = m(lons,lats)
-
-
-    c = m.contourf(x, y, plot_field[:, :], cmap = cmap_color, levels = levels, extend = 'both')
-
-    meridians = numpy.arange(numpy.floor(lon[0]),numpy.ceil(lon[-1]),30)
-    parallels = numpy.arange(numpy.floor(lat[0]),numpy.ceil(lat[-1]),30)
-
-    m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
-    m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
-
-    cb = m.colorbar(c)
-
-    text_data = 'min = '  + str(round(plot_field_min, 2)) + ', ' + \
-            'max = '  + str(round(plot_field_max, 2))
-
-    ax[k, 0].text(0.0, -0.15, text_data, transform = ax[k, 0].transAxes, fontsize = 10)
-
-    if k == 0:
-        ax[k, 0].text(0.5, 1.2, 'Mean', ha='center', \
-                fontsize = 14, transform=ax[k, 0].transAxes, color = 'green')
-
-
-levels = compute_contour_levels(ref_field_stddev, n_stddev, num)
-
-for k in [0, 1, 2]:
-    if k == 0:
-        plot_case = casename
-        plot_field = field_stddev
-        cmap_color = 'hot_r'
-    if k == 1:
-        plot_case = ref_case
-        plot_field = ref_field_stddev
-        cmap_color = 'hot_r'
-    if k == 2:
-        plot_case = 'Difference'
-        plot_field = field_stddev - ref_field_stddev
-        cmap_color = 'seismic'
-        max_plot = round_to_first(2.0 * numpy.ma.std(ref_field_stddev))
-        levels   = numpy.linspace(-max_plot, max_plot, num = num)
-        #levels = compute_contour_levels(plot_field, n_stddev, num)
-
-    plot_field_min = numpy.min(plot_field[:])
-    plot_field_max = numpy.max(plot_field[:])
-
-    ax[k, 1].set_title(plot_case)
-
-    m = Basemap(projection='cyl',llcrnrlat=lat[0],urcrnrlat=lat[-1],\
-            llcrnrlon=lon[0],urcrnrlon=lon[-1],resolution='c', ax = ax[k, 1])
-
-    m.drawcoastlines()
-
-    lons, lats = numpy.meshgrid(lon,lat)
-    x, y = m(lons,lats)
-
-
-    c = m.contourf(x, y, plot_field[:, :], cmap = cmap_color, levels = levels, extend = 'both')
-
-    meridians = numpy.arange(numpy.floor(lon[0]),numpy.ceil(lon[-1]),30)
-    parallels = numpy.arange(numpy.floor(lat[0]),numpy.ceil(lat[-1]),30)
-
-    m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
-    m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
-
-    cb = m.colorbar(c)
-
-    text_data = 'min = '  + str(round(plot_field_min, 2)) + ', ' + \
-            'max = '  + str(round(plot_field_max, 2))
-
-    ax[k, 1].text(0.0, -0.15, text_data, transform = ax[k, 1].transAxes, fontsize = 10)
-
-    if k == 0:
-        ax[k, 1].text(0.5, 1.2, 'Std. Dev.', ha='center', \
-                fontsize = 14, transform=ax[k, 1].transAxes, color = 'green')
-
-plt.subplots_adjust(hspace=0.25)
-
-
-#Plot ref_case
-#ax = f.add_subplot(2,1,2)
-#
-#ax.set_title(ref_case)
-#
-#m = Basemap(projection='cyl',llcrnrlat=lat[0],urcrnrlat=lat[-1],\
-#            llcrnrlon=lon[0],urcrnrlon=lon[-1],resolution='c')
-#
-#m.drawcoastlines()
-#
-#c = m.contourf(x, y, ref_plot_field[:, :], cmap = 'hot_r', levels = levels, extend = 'both')
-#
-#m.drawmeridians(meridians, labels=[0,0,0,1],fontsize=10)
-#m.drawparallels(parallels, labels=[1,0,0,0],fontsize=10)
-#
-#cb = m.colorbar(c)
-#
-#text_data = 'min = '  + str(round(ref_field_min, 2)) + ', ' + \
-#            'max = '  + str(round(ref_field_max, 2))
-#
-#ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
-
-
-##Computing levels for diff plot using mean and standard deviation
-#field_diff      = field[:, :] - field_ref_case[:, :]
-#field_diff_mean = field_avg - field_ref_case_avg
-#field_diff_rmse = get_reg_area_avg_rmse(field_diff, lat, lon, area)
-#field_diff_min  = numpy.min(field_diff)
-#field_diff_max  = numpy.max(field_diff)
-#
-#num         = 11
-#max_plot    = round_to_first(4.0 * numpy.ma.std(field_diff))
-#levels_diff = numpy.linspace(-max_plot, max_plot, num = num)
-#
-#print
-#print 'For difference plot: '
-#print 'mean, stddev, max_plot: ', \
-#        numpy.ma.mean(field_diff), numpy.ma.std(field_diff), max_plot
-#print 'min, max: ', numpy.ma.min(field_diff), numpy.ma.max(field_diff)
-#print 'contour levels: ', levels_diff
-#
-##Plot difference plot
-#ax = f.add_subplot(3,1,3)
-#
-##ax.set_title(casename + ' - ' + ref_case)
-#ax.set_title('Difference')
-#
-#m = Basemap(projection='cyl',llcrnrlat=-90,urcrnrlat=90,\
-#            llcrnrlon=0,urcrnrlon=360,resolution='c')
-#m.drawcoastlines()
-#
-#c = m.contourf(x, y, field_diff[:, :], cmap = 'seismic', levels = levels_diff, extend = 'both')
-#cb = m.colorbar()
-#
-#text_data = 'RMSE = ' + str(round(field_diff_rmse, 2))+ ', ' + \
-#        'mean bias = ' + str(round(field_diff_mean, 2))+ ', ' + \
-#            'min = '  + str(round(field_diff_min, 2)) + ', ' + \
-#            'max = '  + str(round(field_diff_max, 2))
-#
-#ax.text(0, -100, text_data, transform = ax.transData, fontsize = 10)
-
-#Fill contour was buggy when plotting negative values, so we use image plots with line contours overlayed as another option
-#Contour seems to be fixed now with a different backend
-#c = m.imshow(field_diff, cmap = 'seismic', vmin = -max_abs, vmax = max_abs, filternorm = 0, interpolation = 'nearest')
-#cb = m.colorbar(extend = 'both')
-#c = m.contour(x, y, field_diff, levels = levels_diff, colors = 'k', extend = 'both', linewidths = 0.25)
-
-
-mpl.rcParams['savefig.dpi']=300
-
-outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
-                   + field_name + '_stddev_' + reg + '_' + season + '.png'
-
-plt.savefig(outfile)
-
-#plt.show()
-
-
-
+replot               = options.replot
+
+if replot is not None:
+    plot_data, plot_name = read_plot_data_file(replot, 'plot_stddev')
+
+    draw_stddev(plot_data, plots_dir + '/' + plot_name)
+
+else:
+    #Get filename
+    season = get_season_name(begin_month, end_month)
+
+    print
+    print 'Computing climo and inter-annual std. dev. for case: ', casename
+    print
+
+    field_mean, field_stddev, lat, lon, units = compute_reg_seasonal_climo_and_stddev(
+                                    indir = indir,
+                                    casename= casename,
+                                    field_name = field_name,
+                                    interp_grid = interp_grid,
+                                    interp_method = interp_method,
+                                    begin_yr= begin_yr,
+                                    end_yr= end_yr,
+                                    begin_month = begin_month,
+                                    end_month = end_month,
+                                    reg = reg,
+                                    aggregate = 1,
+                                    debug = debug)
+
+
+    #Files the reference fields are read from, to recompute their contour
+    #levels if they change (see get_contour_levels)
+    ref_input_files = []
+
+    ref_field_mean, ref_field_stddev, lat, lon, units = compute_reg_seasonal_climo_and_stddev(
+                                    indir = ref_case_dir,
+                                    casename = ref_case,
+                                    field_name = field_name,
+                                    interp_grid = ref_interp_grid,
+                                    interp_method = ref_interp_method,
+                                    begin_yr= ref_begin_yr,
+                                    end_yr= ref_end_yr,
+                                    begin_month = begin_month,
+                                    end_month = end_month,
+                                    reg = reg,
+                                    aggregate = 1,
+                                    input_files = ref_input_files,
+                                    debug = debug)
+
+
+    #field, lat, lon, area, units = read_climo_file(indir = indir, \
+    #                     casename = casename, \
+    #                     season = season, \
+    #                     field_name = field_name, \
+    #                     begin_yr = begin_yr, \
+    #                     end_yr = end_yr, \
+    #                     interp_grid = interp_grid, \
+    #                     interp_method = interp_method, \
+    #                     reg = 'global')
+    #
+    #print
+    #print 'Reading climo file for case: ', ref_case
+    #print
+    #
+    #field_ref_case, lat, lon, area, units = read_climo_file(indir = ref_case_dir, \
+    #                         casename = ref_case, \
+    #                         season = season, \
+    #                         field_name = field_name, \
+    #                         begin_yr = ref_begin_yr, \
+    #                         end_yr = ref_end_yr, \
+    #                         interp_grid = ref_interp_grid, \
+    #                         interp_method = ref_interp_method,
+    #                         reg = 'global')
+    #
+
+
+    #field_max = numpy.max(field[:])
+    #field_min = numpy.min(field[:])
+    #field_avg = get_reg_area_avg(field, lat, lon, area)
+    #
+    #field_ref_case_max = numpy.max(field_ref_case[:])
+    #field_ref_case_min = numpy.min(field_ref_case[:])
+    #field_ref_case_avg = get_reg_area_avg(field_ref_case, lat, lon, area)
+
+
+
+    #Computing levels using mean and standard deviation
+    num = 11
+    n_stddev = 5
+
+    #Levels of the reference case are computed once per reference field (see
+    #get_contour_levels)
+    levels_key = (ref_case, field_name, season, reg, ref_begin_yr, ref_end_yr, ref_interp_grid, ref_interp_method)
+
+    levels_mean, ref_mean_stats = get_contour_levels(levels_key + ('mean',), ref_field_mean, compute_contour_levels,
+                                                     n_stddev = n_stddev, num_levels = num,
+                                                     input_files = ref_input_files)
+
+    cmap_mean = 'hot_r'
+    if ref_mean_stats['min'] < 0 and ref_mean_stats['max'] > 0:
+        cmap_mean = 'seismic'
+
+    max_plot         = round_to_first(2.0 * ref_mean_stats['std'])
+    levels_mean_diff = numpy.linspace(-max_plot, max_plot, num = num)
+    #levels_mean_diff = compute_contour_levels(field_mean - ref_field_mean, n_stddev, num)
+
+    levels_stddev, ref_stddev_stats = get_contour_levels(levels_key + ('stddev',), ref_field_stddev, compute_contour_levels,
+                                                         n_stddev = n_stddev, num_levels = num,
+                                                         input_files = ref_input_files)
+
+    max_plot           = round_to_first(2.0 * ref_stddev_stats['std'])
+    levels_stddev_diff = numpy.linspace(-max_plot, max_plot, num = num)
+    #levels_stddev_diff = compute_contour_levels(field_stddev - ref_field_stddev, n_stddev, num)
+
+    outfile = plots_dir + '/' + casename + '-' + ref_case + '_' \
+                       + field_name + '_stddev_' + reg + '_' + season
+
+    #Arrays and numbers drawn, saved to redraw the plot (see plot_data_file)
+    plot_data = {'casename':           casename,
+                 'ref_case':           ref_case,
+                 'field_name':         field_name,
+                 'units':              units,
+                 'season':             season,
+                 'lat':                lat,
+                 'lon':                lon,
+                 'field_mean':         field_mean,
+                 'ref_field_mean':     ref_field_mean,
+                 'field_mean_diff':    field_mean - ref_field_mean,
+                 'field_stddev':       field_stddev,
+                 'ref_field_stddev':   ref_field_stddev,
+                 'field_stddev_diff':  field_stddev - ref_field_stddev,
+                 'levels_mean':        levels_mean,
+                 'levels_mean_diff':   levels_mean_diff,
+                 'levels_stddev':      levels_stddev,
+                 'levels_stddev_diff': levels_stddev_diff,
+                 'cmap_mean':          cmap_mean}
+
+    write_plot_data_file(outfile, 'plot_stddev', plot_data)
+
+    draw_stddev(plot_data, outfile)
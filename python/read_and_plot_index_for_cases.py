@@ -10,7 +10,6 @@ import matplotlib as mpl
 #changing the default backend to agg to resolve contouring issue on rhea
 mpl.use('Agg')
 
-from mpl_toolkits.basemap import Basemap
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
@@ -27,6 +26,7 @@ from get_season_name import get_season_name
 from get_reg_avg_climo import get_reg_avg_climo
 from remove_seasonal_cycle_monthly_data import remove_seasonal_cycle_monthly_data
 from standardize_time_series import standardize_time_series
+from save_plot import save_plot
 from optparse import OptionParser
 import argparse
 
@@ -212,17 +212,16 @@ def read_and_plot_index_for_cases (indir,
     f.subplots_adjust(top = 0.8)
 
 
-    mpl.rcParams['savefig.dpi']=300
 
     outfile = plots_dir + '/' + casename + '_' \
-           + field_name + '_' + season + '_' + index_set_name + '.png'
+           + field_name + '_' + season + '_' + index_set_name
 
-    plt.savefig(outfile)
+    save_plot(outfile)
     #plt.show()
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(usage = "python %prog [options]")
+    parser = argparse.ArgumentParser(usage = "python %(prog)s [options]")
 
     parser.add_argument("-d", "--debug", dest = "debug", default = False,
             help = "debug option to print some data")
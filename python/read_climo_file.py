@@ -6,11 +6,12 @@
 # in the LICENSE file in the top level a-prime directory
 #
 from netCDF4 import Dataset
-from get_reg_box import get_reg_box
+from get_reg_grid import get_reg_grid, read_reg_slab
 from get_climo_filename import get_climo_filename
-from get_derived_var_expr import get_derived_var_expr
+from get_derived_var_expr import derived_var_defs
+from eval_derived_var import eval_derived_var, read_errors
+from ts_field_cache import get_ts_field_cache_key, get_ts_field_cache, put_ts_field_cache
 import numpy
-from sympy import *
 
 def read_climo_file (indir, \
              casename, \
@@ -21,166 +22,85 @@ def read_climo_file (indir, \
              interp_grid, \
              interp_method, \
              reg, \
+             input_files = None, \
              debug = False):
 
-    file_name = get_climo_filename(    indir,
-                    casename,
-                    field_name,
-                    season,
-                    begin_yr,
-                    end_yr,
-                    interp_grid,
-                    interp_method)
+    #Names of the files read (components of derived variables included) are
+    #appended to input_files if given, e.g. to detect changes of the inputs
+    #of products computed from the field (see get_contour_levels)
 
-    try:
-        f = Dataset(file_name, "r")
-        field_temp = f.variables[field_name]
-        lat = f.variables['lat'][:]
-        lon = f.variables['lon'][:]
+    def read_component(component_name):
 
-        try:
-            area = f.variables['area'][:]
-        except:
-            gw = f.variables['gw'][:]
+        file_name = get_climo_filename(    indir,
+                        casename,
+                        component_name,
+                        season,
+                        begin_yr,
+                        end_yr,
+                        interp_grid,
+                        interp_method)
 
-        try:
-            units = field_temp.units
-        except AttributeError:
-            units = field_temp.lunits
+        if input_files is not None and file_name not in input_files:
+            input_files.append(file_name)
 
-        field = field_temp[:]
-        f.close()
+        #Fields read are kept in ts_field_cache, so that processes plotting
+        #several figures (plot_climo_batch) read each reference field once
+        cache_key = get_ts_field_cache_key(file_name, component_name, None, None, reg, 0)
 
-    except:
+        cached = get_ts_field_cache(cache_key)
+        if cached is not None:
+            return cached
 
-        print
-        print file_name, 'not found! Checking derived variables list for ', field_name
+        f = Dataset(file_name, "r")
 
-        var_expr, var_expr_numpy = get_derived_var_expr(field_name)
+        try:
+            field_temp = f.variables[component_name]
 
-        for i, field_name_temp in enumerate(var_expr.atoms(Symbol)):
+            #Region lat, lon, area and slices, precomputed once per file and region
+            reg_grid = get_reg_grid(f, file_name, reg, debug = debug)
 
-            print field_name_temp
-            field_name_temp_str = str(field_name_temp)
-            print field_name_temp_str
+            try:
+                units = field_temp.units
+            except AttributeError:
+                units = field_temp.lunits
 
-            file_name_temp = get_climo_filename(     indir,
-                                casename,
-                                field_name_temp_str,
-                                season,
-                                begin_yr,
-                                end_yr,
-                                interp_grid,
-                                interp_method)
+            field = read_reg_slab(field_temp, reg_grid, leading = (0,) * (field_temp.ndim - 2))
 
-            f = Dataset(file_name_temp, "r")
+        finally:
+            f.close()
 
-            field_temp = f.variables[field_name_temp_str]
+        entry = (field, reg_grid['lat_reg'], reg_grid['lon_reg'], reg_grid['area_reg'], units)
 
-            print 'field_temp.shape: ', field_temp.shape
+        put_ts_field_cache(cache_key, entry)
 
-            if i == 0:
-                field_list = [field_temp[:]]
-                units = field_temp.units
-                lat = f.variables['lat'][:]
-                lon = f.variables['lon'][:]
+        return entry
 
-                try:
-                    area = f.variables['area'][:]
-                except:
-                    gw = f.variables['gw'][:]
+    #Derived variables (e.g. PRECT, RESTOM, RESSURF) are computed from their
+    #components if they are not available in files
 
-            else:
-                field_list.append(field_temp[:])
+    try:
+        field, lat_reg, lon_reg, area_reg, units = read_component(field_name)
 
-            f.close()
+    except read_errors:
+        if field_name not in derived_var_defs:
+            raise
 
         print
-        print 'field_list length: ', len(field_list)
+        print field_name, 'not found! Checking derived variables list for ', field_name
 
-        field = var_expr_numpy(*field_list)
-        print __name__, 'field.shape: ', field.shape
+        field, lat_reg, lon_reg, area_reg, units = eval_derived_var(field_name, read_component, debug = debug)
 
     print __name__, 'field.shape: ', field.shape
     print field
 
-
-    nlon = lon.shape[0]
-    nlat = lat.shape[0]
-
-
-    #Getting area tile from gw if "area" is not available in the climo file
-
-    if 'gw' in locals():
-        print __name__, 'Computing area weights from gw'
-
-        area_tile = numpy.tile(gw[:], (nlon))
-        area_transpose = numpy.reshape(area_tile, (nlon, nlat))
-
-        area = numpy.transpose(area_transpose)
-
-
-    #Getting the requested region
-
-    lat_ll, lat_ul, lon_ll, lon_ul = get_reg_box(reg)
-
-    print
-    print __name__, 'lat_ll, lat_ul, lon_ll, lon_ul: ', lat_ll, lat_ul, lon_ll, lon_ul
-    print __name__, 'lat: ', lat
-    print __name__, 'type(lat[:]): ', type(lat[:])
-
-    lat_reg_boolean = numpy.logical_and(lat[:]>=lat_ll, lat[:]<=lat_ul)
-    lat_index_reg   = numpy.asarray(numpy.where(lat_reg_boolean))[0, :]
-    lat_reg         = lat[lat_reg_boolean]
-
-    #The following also works:
-    #lat_index = numpy.arange(0,nlat)
-    #lat_index_reg = lat_index[lat_reg_boolean]
-
-    if lon_ll > lon_ul:
-        lon_reg_boolean = numpy.logical_or(lon[:]>=lon_ll, lon[:] <= lon_ul)
-    else:
-        lon_reg_boolean = numpy.logical_and(lon[:]>=lon_ll, lon[:] <= lon_ul)
-
-    lon_index_reg   = numpy.asarray(numpy.where(lon_reg_boolean))[0, :]
-    lon_reg         = lon[lon_reg_boolean]
-
-    #lon_index = numpy.arange(0,nlon)
-    #lon_index_reg = lon_index[lon_reg_boolean]
-
     if debug: print
-    if debug: print __name__, 'lat_reg: ', lat_reg_boolean
-    if debug: print __name__, 'lon_reg: ', lon_reg_boolean
-    if debug: print __name__, 'lat_index_reg.shape: ', lat_index_reg.shape
-    if debug: print __name__, 'lat_index_reg: ', lat_index_reg
-    if debug: print __name__, 'lon_index_reg: ', lon_index_reg
+    if debug: print __name__, 'lat_reg: ', lat_reg
+    if debug: print __name__, 'lon_reg: ', lon_reg
     if debug: print __name__, 'type(field): ', type(field)
 
-    #Mulitdimensional indexing with numpy require indexes to be multidimensional arrays
-    #Used here only for derived variables like RESTOM
-
-    if isinstance(field, numpy.ndarray):
-        if field.ndim == 2:
-            field_in = field[lat_index_reg[:, None],lon_index_reg[None, :]]
-        if field.ndim == 3:
-            field_in = field[0,lat_index_reg[:, None],lon_index_reg[None, :]]
-
-
-        #Multidimensional indexing with netcdf variables require 1d index variables
-    #Used here for variables that are available in netcdf files
-
-    else:
-        if field.ndim == 2:
-            field_in = field[lat_index_reg,lon_index_reg]
-        if field.ndim == 3:
-            field_in = field[0,lat_index_reg,lon_index_reg]
-
-
-    if isinstance(area, numpy.ndarray):
-        area_reg = area[lat_index_reg[:, None],lon_index_reg[None, :]]
-    else:
-        area_reg = area[lat_index_reg,lon_index_reg]
+    #Fields are read for the region only, from the first time step of 3d fields
 
+    field_in = field
 
     print __name__, "field_in.shape: ", field_in.shape
 
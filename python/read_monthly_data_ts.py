@@ -6,10 +6,10 @@
 # in the LICENSE file in the top level a-prime directory
 #
 from read_monthly_data_ts_field import read_monthly_data_ts_field
-from get_derived_var_expr import get_derived_var_expr
+from eval_derived_var import eval_derived_var, read_errors
+from get_derived_var_expr import derived_var_defs
 
 import numpy
-from sympy import *
 
 
 def read_monthly_data_ts(indir,
@@ -22,87 +22,15 @@ def read_monthly_data_ts(indir,
                          begin_month,
                          end_month,
                          reg,
+                         skip_yrs = 0,
+                         input_files = None,
                          debug = False):
 
 
-    if field_name == 'RESSURF':
-
-        try:
-            field_in, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                     casename = casename,
-                     field_name = field_name,
-                     interp_grid = interp_grid,
-                     interp_method = interp_method,
-                     begin_yr = begin_yr,
-                     end_yr = end_yr,
-                     begin_month = begin_month,
-                     end_month = end_month,
-                     reg = reg,
-                     debug = debug)
-
-
-        except:
-
-            print
-            print field_name, 'not found! Checking derived variables list for ', field_name
-
-            var_expr, var_expr_numpy = get_derived_var_expr(field_name)
-
-            for i, field_name_temp in enumerate(var_expr.atoms(Symbol)):
-
-                print field_name_temp
-                field_name_temp_str = str(field_name_temp)
-                print field_name_temp_str
-
-
-                field_temp, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                     casename = casename,
-                     field_name = field_name_temp_str,
-                     interp_grid = interp_grid,
-                     interp_method = interp_method,
-                     begin_yr = begin_yr,
-                     end_yr = end_yr,
-                     begin_month = begin_month,
-                     end_month = end_month,
-                     reg = reg,
-                     debug = debug)
-
-                if i == 0:
-                    field_list = [field_temp]
-                else:
-                    field_list.append(field_temp)
-
-            print
-            print 'field_list length: ', len(field_list)
-
-            field_in = var_expr_numpy(*field_list)
-            print __name__, 'field_in.shape: ', field_in.shape
-
-
-    elif field_name == 'PRECT':
-
-        try:
-            field_in, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                     casename = casename,
-                     field_name = field_name,
-                     interp_grid = interp_grid,
-                     interp_method = interp_method,
-                     begin_yr = begin_yr,
-                     end_yr = end_yr,
-                     begin_month = begin_month,
-                     end_month = end_month,
-                     reg = reg,
-                     debug = debug)
-
-
-        except:
-            print
-            print "Could not find file for: ", field_name, " Trying to look for PRECC and PRECL files!"
-            print
-
-            field_PRECC, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
+    def read_component(component_name):
+        return read_monthly_data_ts_field(indir = indir,
                      casename = casename,
-                     field_name = 'PRECC',
+                     field_name = component_name,
                      interp_grid = interp_grid,
                      interp_method = interp_method,
                      begin_yr = begin_yr,
@@ -110,82 +38,24 @@ def read_monthly_data_ts(indir,
                      begin_month = begin_month,
                      end_month = end_month,
                      reg = reg,
+                     skip_yrs = skip_yrs,
+                     input_files = input_files,
                      debug = debug)
 
-            field_PRECL, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                     casename = casename,
-                     field_name = 'PRECL',
-                     interp_grid = interp_grid,
-                     interp_method = interp_method,
-                     begin_yr = begin_yr,
-                     end_yr = end_yr,
-                     begin_month = begin_month,
-                     end_month = end_month,
-                     reg = reg,
-                     debug = debug)
-
-            field_in = field_PRECC + field_PRECL
-
-
-    elif field_name == 'RESTOM':
-
-        try:
-            field_in, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                     casename = casename,
-                     field_name = field_name,
-                     interp_grid = interp_grid,
-                     interp_method = interp_method,
-                     begin_yr = begin_yr,
-                     end_yr = end_yr,
-                     begin_month = begin_month,
-                     end_month = end_month,
-                     reg = reg,
-                     debug = debug)
-
-
-        except:
-            print
-            print "Could not find file for: ", field_name, " Trying to look for FSNT and FLNT files!"
-            print
-
-            field_FSNT, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                 casename = casename,
-                             field_name = 'FSNT',
-                             interp_grid = interp_grid,
-                             interp_method = interp_method,
-                             begin_yr = begin_yr,
-                             end_yr = end_yr,
-                             begin_month = begin_month,
-                             end_month = end_month,
-                             reg = reg,
-                             debug = debug)
+    #Derived variables (e.g. PRECT, RESTOM, RESSURF) are computed from their
+    #components if they are not available in files
 
-            field_FLNT, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-                 casename = casename,
-                             field_name = 'FLNT',
-                             interp_grid = interp_grid,
-                             interp_method = interp_method,
-                             begin_yr = begin_yr,
-                             end_yr = end_yr,
-                             begin_month = begin_month,
-                             end_month = end_month,
-                             reg = reg,
-                             debug = debug)
+    try:
+        field_in, lat, lon, area, units = read_component(field_name)
 
-        field_in = field_FSNT - field_FLNT     #positive downwards
+    except read_errors:
+        if field_name not in derived_var_defs:
+            raise
 
-    else:
+        print
+        print "Could not find file for: ", field_name, " Trying to compute it from its components!"
+        print
 
-        field_in, lat, lon, area, units = read_monthly_data_ts_field(indir = indir,
-             casename = casename,
-                         field_name = field_name,
-                         interp_grid = interp_grid,
-                         interp_method = interp_method,
-                         begin_yr = begin_yr,
-                         end_yr = end_yr,
-                         begin_month = begin_month,
-                         end_month = end_month,
-                         reg = reg,
-                         debug = debug)
+        field_in, lat, lon, area, units = eval_derived_var(field_name, read_component, debug = debug)
 
     return (field_in, lat, lon, area, units)
@@ -8,7 +8,35 @@
 import numpy
 from netCDF4 import Dataset
 from get_season_months_index import get_season_months_index
-from get_reg_box import get_reg_box
+from get_reg_grid import get_reg_grid, read_reg_slab
+from ts_field_cache import get_ts_field_cache_key, get_ts_field_cache, put_ts_field_cache
+
+def select_season_time_steps(slab, index_slab, n_months_season):
+
+    #Selects slab[index_slab] in memory. For whole seasons, i.e. blocks of
+    #n_months_season consecutive months one year apart, this is done by
+    #reshaping the slab to (years, 12, ...) and slicing the season months,
+    #without an index array.
+
+    n_seasons = index_slab.size / n_months_season
+
+    season_blocks = (numpy.arange(n_seasons) * 12)[:, None] + numpy.arange(n_months_season)[None, :]
+
+    if n_seasons == 0 or index_slab.size != n_seasons * n_months_season or \
+       not numpy.array_equal(index_slab, season_blocks.ravel() + index_slab[0]):
+        return slab[index_slab]
+
+    if n_months_season == 12 or n_seasons == 1:
+        return slab
+
+    n_full = (n_seasons - 1) * 12
+    trailing_shape = slab.shape[1:]
+
+    slab_years = slab[0:n_full].reshape((n_seasons - 1, 12) + trailing_shape)[:, 0:n_months_season]
+
+    return numpy.ma.concatenate((slab_years.reshape(((n_seasons - 1) * n_months_season,) + trailing_shape),
+                                 slab[n_full:]), axis = 0)
+
 
 def read_monthly_data_ts_field(indir,
              casename,
@@ -20,6 +48,8 @@ def read_monthly_data_ts_field(indir,
              reg,
              interp_method,
              interp_grid,
+             skip_yrs = 0,
+             input_files = None,
              debug = False):
 
     #Get filename
@@ -48,6 +78,18 @@ def read_monthly_data_ts_field(indir,
 
     print "file_name: ", file_name
 
+    #Names of the files read, see read_climo_file
+    if input_files is not None and file_name not in input_files:
+        input_files.append(file_name)
+
+    #Fields already read in this process, e.g. for another lag or index
+    cache_key = get_ts_field_cache_key(file_name, field_name, begin_month, end_month, reg, skip_yrs)
+
+    cached = get_ts_field_cache(cache_key)
+
+    if cached is not None:
+        print __name__, 'Using field read earlier from: ', file_name
+        return cached
 
     f = Dataset(file_name, "r")
 
@@ -55,10 +97,6 @@ def read_monthly_data_ts_field(indir,
     field = f.variables[field_name]
     units = field.units
 
-    lat = f.variables['lat']
-    lon = f.variables['lon']
-    area = f.variables['area']
-
     nt = field.shape[0]
     nyrs = nt/12
 
@@ -104,44 +142,33 @@ def read_monthly_data_ts_field(indir,
 
         index_time = index_months_tile + index_yr_repeat
 
-    if debug: print __name__, 'index_time: ', index_time
-
-    nlon = lon.shape[0]
-    nlat = lat.shape[0]
+    #Skipping the first skip_yrs years, for e.g. already processed in an earlier run
+    if skip_yrs > 0:
+        index_time = index_time[index_time >= skip_yrs*12]
 
-    lat_ll, lat_ul, lon_ll, lon_ul = get_reg_box(reg)
-
-    print __name__, 'lat_ll, lat_ul, lon_ll, lon_ul: ', lat_ll, lat_ul, lon_ll, lon_ul
+    if debug: print __name__, 'index_time: ', index_time
 
-    lat_reg_boolean = numpy.logical_and(lat[:]>=lat_ll, lat[:]<=lat_ul)
-    lat_index_reg   = numpy.asarray(numpy.where(lat_reg_boolean))[0, :]
-    lat_reg         = lat[lat_reg_boolean]
+    #Region lat, lon, area and indices, precomputed once per file and region
+    reg_grid = get_reg_grid(f, file_name, reg, debug = debug)
 
-    #The following also works:
-    #lat_index = numpy.arange(0,nlat)
-    #lat_index_reg = lat_index[lat_reg_boolean]
+    lat_reg       = reg_grid['lat_reg']
+    lon_reg       = reg_grid['lon_reg']
+    area_reg      = reg_grid['area_reg']
 
-    if lon_ll > lon_ul:
-        lon_reg_boolean = numpy.logical_or(lon[:]>=lon_ll, lon[:] <= lon_ul)
-    else:
-        lon_reg_boolean = numpy.logical_and(lon[:]>=lon_ll, lon[:] <= lon_ul)
+    #Reading the bounding hyperslab of the season months and the region in one
+    #contiguous request (two for regions wrapping around the lon axis), and
+    #selecting the season months in memory
 
-    lon_index_reg   = numpy.asarray(numpy.where(lon_reg_boolean))[0, :]
-    lon_reg         = lon[lon_reg_boolean]
+    time_slice = slice(index_time[0], index_time[-1] + 1)
 
-    #lon_index = numpy.arange(0,nlon)
-    #lon_index_reg = lon_index[lon_reg_boolean]
+    if debug: print __name__, 'time_slice, lat_slices, lon_slices: ', \
+        time_slice, reg_grid['lat_slices'], reg_grid['lon_slices']
 
-    if debug: print __name__, 'lat_reg: ', lat_reg_boolean
-    if debug: print __name__, 'lon_reg: ', lon_reg_boolean
-    if debug: print __name__, 'lat_index_reg.shape: ', lat_index_reg.shape
-    if debug: print __name__, 'lat_index_reg: ', lat_index_reg
-    if debug: print __name__, 'lon_index_reg: ', lon_index_reg
+    field_slab = read_reg_slab(field, reg_grid, leading = (time_slice,))
 
-    if debug: print __name__, 'field[0, :, :]: ', field[0, :, :]
+    field_in = select_season_time_steps(field_slab, index_time - index_time[0], n_months_season)
 
-    field_in = field[index_time,lat_index_reg,lon_index_reg]
-    area_reg = area[lat_index_reg, lon_index_reg]
+    del field_slab
 
     print __name__, 'field.shape: ', field.shape
     print __name__, 'field_in.shape: ', field_in.shape
@@ -181,4 +208,8 @@ def read_monthly_data_ts_field(indir,
 
     if debug: print __name__, 'field_in[0,:,:]: ', field_in[0, :, :]
 
+    f.close()
+
+    put_ts_field_cache(cache_key, (field_in, lat_reg, lon_reg, area_reg, units))
+
     return (field_in, lat_reg, lon_reg, area_reg, units)
@@ -0,0 +1,28 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+import numpy
+from netCDF4 import Dataset
+
+def read_monthly_sums_file(file_name, field_name):
+
+    print __name__, 'file_name: ', file_name
+
+    f = Dataset(file_name, 'r')
+
+    sum_field   = numpy.array(f.variables[field_name + '_sum'][:])
+    count_field = numpy.array(f.variables['count'][:])
+
+    f.close()
+
+    #Files written before the samples were counted per grid point have one
+    #count per month, wrong at masked points: the sums are computed again
+    if count_field.ndim == 1:
+        print __name__, 'Counts not kept per grid point, not extending: ', file_name
+        return None
+
+    return sum_field, count_field
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to read an ESMF or SCRIP remapping weights file, for e.g.
+# $remap_files_dir/$native_res-to-$interp_grid.conservative.wgts.nc, into a
+# (n_b, n_a) CSR sparse matrix along with the destination lat/lon grid.
+# Returns a dictionary with:
+#   S: scipy.sparse.csr_matrix, dst = S * src
+#   lat, lon: 1-d destination latitudes and longitudes (degrees)
+#   area: (nlat, nlon) destination cell areas
+#   frac: (nlat, nlon) fraction of each destination cell covered by the source grid
+
+import numpy
+from netCDF4 import Dataset
+from scipy import sparse
+
+def read_remap_weights(wgt_file, debug = False):
+
+    print __name__, 'wgt_file: ', wgt_file
+
+    f = Dataset(wgt_file, 'r')
+
+    if 'S' in f.variables:
+        #ESMF format
+        S    = f.variables['S'][:]
+        row  = f.variables['row'][:] - 1
+        col  = f.variables['col'][:] - 1
+        n_a  = len(f.dimensions['n_a'])
+        n_b  = len(f.dimensions['n_b'])
+        yc   = f.variables['yc_b']
+        xc   = f.variables['xc_b']
+        area = f.variables['area_b'][:]
+        frac = f.variables['frac_b'][:]
+    else:
+        #SCRIP format
+        S    = f.variables['remap_matrix'][:, 0]
+        row  = f.variables['dst_address'][:] - 1
+        col  = f.variables['src_address'][:] - 1
+        n_a  = len(f.dimensions['src_grid_size'])
+        n_b  = len(f.dimensions['dst_grid_size'])
+        yc   = f.variables['dst_grid_center_lat']
+        xc   = f.variables['dst_grid_center_lon']
+        area = f.variables['dst_grid_area'][:]
+        frac = f.variables['dst_grid_frac'][:]
+
+    #dst_grid_dims is (nlon, nlat), i.e. the destination grid is stored lon fastest
+    nlon, nlat = f.variables['dst_grid_dims'][:]
+
+    yc_deg = yc[:]
+    xc_deg = xc[:]
+
+    if 'units' in yc.ncattrs() and yc.units.startswith('rad'):
+        yc_deg = numpy.degrees(yc_deg)
+        xc_deg = numpy.degrees(xc_deg)
+
+    f.close()
+
+    S_csr = sparse.csr_matrix((numpy.asarray(S, dtype = numpy.float64),
+                               (numpy.asarray(row), numpy.asarray(col))),
+                              shape = (n_b, n_a))
+
+    weights = {'S':    S_csr,
+               'lat':  numpy.reshape(yc_deg, (nlat, nlon))[:, 0],
+               'lon':  numpy.reshape(xc_deg, (nlat, nlon))[0, :],
+               'area': numpy.reshape(area, (nlat, nlon)),
+               'frac': numpy.reshape(frac, (nlat, nlon))}
+
+    if debug: print __name__, 'n_a, n_b, nnz: ', n_a, n_b, S_csr.nnz
+    if debug: print __name__, 'nlat, nlon: ', nlat, nlon
+
+    return weights
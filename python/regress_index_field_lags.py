@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+import numpy
+
+#Lead-lag regression of field on index at each grid point for all lags at once.
+#For a lag, the index at time t is paired with the field at time t + lag
+#(positive lags: index leading), as in stats.mstats.linregress(index[0:nt-lag],
+#field[lag:nt, j, i]) for lag >= 0 and stats.mstats.linregress(index[-lag:nt],
+#field[0:nt+lag, j, i]) for lag < 0.
+#
+#The sums over time needed for all lags are computed with one matrix product
+#of a (n_lags, nt) matrix of shifted copies of the index with the
+#(nt, nlat*nlon) field, so the field is traversed once per sum and not once
+#per lag. Time steps masked in the index or in the field at a grid point are
+#left out at that grid point, grid points with less than 3 valid time steps
+#are masked.
+#
+#Returns (n_lags, nlat, nlon) arrays of regression coefficients, intercepts,
+#correlations, t-test (1 where p-value < 0.05) and standard errors.
+
+def regress_index_field_lags(index, field, lags, debug = False):
+
+    #Imported here to keep scipy out of the start-up of scripts that import
+    #this module but do not regress
+    from scipy import stats
+
+    nt = field.shape[0]
+    grid_shape = field.shape[1:]
+    n_lags = len(lags)
+
+    y_valid = numpy.logical_not(numpy.ma.getmaskarray(field)).reshape(nt, -1)
+    x_valid = numpy.logical_not(numpy.ma.getmaskarray(index))
+
+    y = numpy.ma.getdata(field).reshape(nt, -1).astype(numpy.float64)
+    x = numpy.ma.getdata(index).astype(numpy.float64)
+
+    #Removing the means over all valid time steps first keeps the one pass
+    #sums below accurate; regression results do not depend on these offsets
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        y_offset = numpy.where(y_valid, y, 0.0).sum(axis = 0) / y_valid.sum(axis = 0)
+    y_offset[numpy.logical_not(numpy.isfinite(y_offset))] = 0.0
+
+    x_offset = x[x_valid].mean() if x_valid.any() else 0.0
+
+    y = numpy.where(y_valid, y - y_offset, 0.0)
+    x = numpy.where(x_valid, x - x_offset, 0.0)
+
+    y_wgts = y_valid.astype(numpy.float64)
+
+    #Row k holds the index shifted by lags[k]: shift[k, s] = index[s - lag]
+    shift_v  = numpy.zeros((n_lags, nt))
+    shift_x  = numpy.zeros((n_lags, nt))
+    shift_xx = numpy.zeros((n_lags, nt))
+
+    for k, lag in enumerate(lags):
+        if lag < 0:
+            s_slice, t_slice = slice(0, nt+lag), slice(-lag, nt)
+        else:
+            s_slice, t_slice = slice(lag, nt), slice(0, nt-lag)
+
+        shift_v[k, s_slice]  = x_valid[t_slice]
+        shift_x[k, s_slice]  = x[t_slice]
+        shift_xx[k, s_slice] = x[t_slice]**2
+
+    sums = numpy.dot(numpy.concatenate((shift_v, shift_x, shift_xx)), y_wgts)
+
+    n     = sums[0:n_lags]
+    sx    = sums[n_lags:2*n_lags]
+    sxx   = sums[2*n_lags:]
+    sy    = numpy.dot(shift_v, y)
+    syy   = numpy.dot(shift_v, y**2)
+    sxy   = numpy.dot(shift_x, y)
+
+    del sums, y, y_wgts
+
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        x_mean = sx / n
+        y_mean = sy / n
+
+        ssxm  = sxx / n - x_mean**2
+        ssym  = syy / n - y_mean**2
+        ssxym = sxy / n - x_mean * y_mean
+
+        ssxm[ssxm < 0.0] = 0.0
+        ssym[ssym < 0.0] = 0.0
+
+        r_den = numpy.sqrt(ssxm * ssym)
+        r = numpy.where(r_den == 0.0, 0.0, ssxym / r_den)
+        r = numpy.clip(r, -1.0, 1.0)
+
+        df = n - 2
+
+        slope     = ssxym / ssxm
+        intercept = y_mean + y_offset - slope * (x_mean + x_offset)
+
+        TINY = 1.0e-20
+        t = r * numpy.sqrt(df / ((1.0 - r + TINY) * (1.0 + r + TINY)))
+        p_val  = 2.0 * stats.t.sf(numpy.abs(t), df)
+        stderr = numpy.sqrt((1.0 - r**2) * ssym / ssxm / df)
+
+        mask = numpy.logical_or(n < 3, ssxm == 0.0)
+        t_test = numpy.logical_and(numpy.logical_not(mask), p_val < 0.05)
+
+    out_shape = (n_lags,) + grid_shape
+    mask = mask.reshape(out_shape)
+
+    regr_matrix   = numpy.ma.array(numpy.where(mask, 0.0, slope.reshape(out_shape)),     mask = mask)
+    const_matrix  = numpy.ma.array(numpy.where(mask, 0.0, intercept.reshape(out_shape)), mask = mask)
+    corr_matrix   = numpy.ma.array(numpy.where(mask, 0.0, r.reshape(out_shape)),         mask = mask)
+    stderr_matrix = numpy.ma.array(numpy.where(mask, 0.0, stderr.reshape(out_shape)),    mask = mask)
+    t_test_matrix = numpy.ma.array(t_test.reshape(out_shape).astype(numpy.float64),     mask = mask)
+
+    if debug: print __name__, 'lags: ', lags
+    if debug: print __name__, 'regr_matrix.shape: ', regr_matrix.shape
+
+    return regr_matrix, const_matrix, corr_matrix, t_test_matrix, stderr_matrix
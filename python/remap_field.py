@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to remap a (ncol), (time, ncol) or (time, ..., ncol) field with the sparse
+# matrix returned by read_remap_weights, returning a (..., nlat, nlon) field.
+#
+# The field is remapped chunk_size time steps at a time with one
+# sparse-dense matrix product per chunk, so that field may be a netCDF4
+# variable larger than memory. chunk_size = None remaps the whole field
+# at once. Masked source points are left out and the destination values
+# renormalized by the weights of the valid source points; destination
+# points without valid source points are masked.
+
+import numpy
+
+def remap_field(field, weights, chunk_size = None, debug = False):
+
+    S    = weights['S']
+    frac = numpy.reshape(weights['frac'], (1, -1))
+    nlat = weights['lat'].shape[0]
+    nlon = weights['lon'].shape[0]
+
+    ncol = field.shape[-1]
+
+    if field.ndim == 1:
+        nt = 1
+    else:
+        nt = field.shape[0]
+
+    if chunk_size is None or chunk_size > nt:
+        chunk_size = nt
+
+    remapped = numpy.ma.zeros(field.shape[:-1] + (nlat*nlon,))
+
+    for t_begin in range(0, nt, chunk_size):
+        t_end = min(t_begin + chunk_size, nt)
+
+        if debug: print __name__, 'remapping time steps: ', t_begin, t_end
+
+        if field.ndim == 1:
+            block = field[:]
+        else:
+            block = field[t_begin:t_end, ...]
+
+        block_shape = block.shape[:-1]
+        block = numpy.ma.reshape(block, (-1, ncol))
+
+        mask = numpy.ma.getmaskarray(block)
+        data = numpy.ma.filled(block, 0.0).astype(numpy.float64)
+
+        dst = numpy.ma.asarray(S.dot(data.T).T)
+
+        if mask.any():
+            valid_wgts = numpy.ma.masked_less_equal(S.dot((~mask).T.astype(numpy.float64)).T, 0.0)
+            dst = dst/valid_wgts * frac
+
+        dst = numpy.ma.reshape(dst, block_shape + (nlat*nlon,))
+
+        if field.ndim == 1:
+            remapped[:] = dst
+        else:
+            remapped[t_begin:t_end, ...] = dst
+
+    remapped = numpy.ma.reshape(remapped, field.shape[:-1] + (nlat, nlon))
+
+    return remapped
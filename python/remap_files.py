@@ -0,0 +1,177 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Remap native grid (ncol) files to the lat/lon grid of a weights file,
+# as ncremap -m $wgt_file does, for a list of files sharing the weights.
+# The weights file is read once into a sparse matrix, or memory-mapped
+# from the operator cache in --cache_dir (see get_remap_weights), then every
+# variable with an ncol dimension in each input file is remapped in
+# blocks of --chunk_size time steps with one sparse-dense matrix product
+# per block. Other variables (time, date, ...) are copied as they are.
+# Output files are written under a temporary name, renamed once complete
+# and, if --stage is given, recorded in the scratch cache manifest.
+#
+# for e.g.
+# python remap_files.py --wgt_file ne30-to-GPCP.conservative.wgts.nc -I $scratch_dir \
+#        --infiles a_ANN_climo.PRECT.1-10.nc,a_DJF_climo.PRECT.1-10.nc \
+#        --outfiles a_ANN_climo.GPCP_conservative_mapping.PRECT.1-10.nc,a_DJF_climo.GPCP_conservative_mapping.PRECT.1-10.nc
+
+import os
+import numpy
+from   netCDF4  import Dataset
+import time
+from   optparse import OptionParser
+
+from get_remap_weights import get_remap_weights
+from remap_field import remap_field
+from scratch_cache import get_cache_key, get_temp_filename, record_cache
+
+grid_vars = ['lat', 'lon', 'area']
+
+
+def remap_file(infile, outfile, weights, chunk_size = None, debug = False):
+
+    print "Remapping ", infile, " to ", outfile
+
+    f_in = Dataset(infile, 'r')
+
+    temp_file = get_temp_filename(outfile)
+
+    f_out = Dataset(temp_file, 'w', format = f_in.data_model)
+
+    for ncattr in f_in.ncattrs():
+        f_out.setncattr(ncattr, f_in.getncattr(ncattr))
+
+    nlat = weights['lat'].shape[0]
+    nlon = weights['lon'].shape[0]
+
+    for dim in f_in.dimensions:
+        if dim == 'ncol' or dim in ['lat', 'lon']:
+            continue
+        if f_in.dimensions[dim].isunlimited():
+            f_out.createDimension(dim, None)
+        else:
+            f_out.createDimension(dim, len(f_in.dimensions[dim]))
+
+    f_out.createDimension('lat', nlat)
+    f_out.createDimension('lon', nlon)
+
+    lat_out = f_out.createVariable('lat', 'float64', ('lat'))
+    lat_out.long_name = 'latitude'
+    lat_out.units = 'degrees_north'
+    lat_out[:] = weights['lat']
+
+    lon_out = f_out.createVariable('lon', 'float64', ('lon'))
+    lon_out.long_name = 'longitude'
+    lon_out.units = 'degrees_east'
+    lon_out[:] = weights['lon']
+
+    area_out = f_out.createVariable('area', 'float64', ('lat', 'lon'))
+    area_out.long_name = 'solid angle subtended by gridcell'
+    area_out.units = 'steradian'
+    area_out[:] = weights['area']
+
+    for var_name in f_in.variables:
+
+        if var_name in grid_vars:
+            continue
+
+        var_in = f_in.variables[var_name]
+
+        ncattrs = var_in.ncattrs()
+
+        if len(var_in.dimensions) > 0 and var_in.dimensions[-1] == 'ncol':
+            dims_out = var_in.dimensions[:-1] + ('lat', 'lon')
+        else:
+            dims_out = var_in.dimensions
+
+        if '_FillValue' in ncattrs:
+            var_out = f_out.createVariable(var_name, var_in.dtype, dims_out,
+                                           fill_value = var_in.getncattr('_FillValue'))
+        else:
+            var_out = f_out.createVariable(var_name, var_in.dtype, dims_out)
+
+        for ncattr in ncattrs:
+            if ncattr != '_FillValue':
+                var_out.setncattr(ncattr, var_in.getncattr(ncattr))
+
+        if dims_out == var_in.dimensions:
+            var_out[:] = var_in[:]
+            continue
+
+        if debug: print __name__, 'remapping ', var_name, var_in.shape
+
+        var_out[:] = remap_field(var_in, weights, chunk_size = chunk_size, debug = debug)
+
+    f_out.close()
+    f_in.close()
+
+    os.rename(temp_file, outfile)
+
+
+if __name__ == "__main__":
+    parser = OptionParser(usage = "python %prog [options]")
+
+    parser.add_option("--wgt_file", dest = "wgt_file",
+                        help = "ESMF or SCRIP remapping weights file")
+
+    parser.add_option("-I", "--indir", dest = "indir", default = ".",
+                        help = "directory of the input files")
+
+    parser.add_option("-O", "--outdir", dest = "outdir", default = None,
+                        help = "directory of the output files, default is indir")
+
+    parser.add_option("--infiles", dest = "infiles",
+                        help = "comma separated list of input files")
+
+    parser.add_option("--outfiles", dest = "outfiles",
+                        help = "comma separated list of output files")
+
+    parser.add_option("--cache_dir", dest = "cache_dir", default = None,
+                        help = "directory of the persistent remapping operator cache")
+
+    parser.add_option("--chunk_size", dest = "chunk_size", type = "int", default = 12,
+                        help = "number of time steps remapped at once")
+
+    parser.add_option("--stage", dest = "stage", default = None,
+                        help = "scratch cache stage name to record the output files with")
+
+    parser.add_option("-d", "--debug", dest = "debug", action = "store_true", default = False,
+                        help = "debug option to print some data")
+
+    (options, args) = parser.parse_args()
+
+    indir  = options.indir
+    outdir = options.outdir
+
+    if outdir is None:
+        outdir = indir
+
+    infiles  = options.infiles.split(',')
+    outfiles = options.outfiles.split(',')
+
+    if len(infiles) != len(outfiles):
+        parser.error("--infiles and --outfiles must list the same number of files")
+
+    t0 = time.time()
+
+    weights = get_remap_weights(options.wgt_file, cache_dir = options.cache_dir, debug = options.debug)
+
+    print "weights read!, time taken: ", str(time.time()-t0)
+
+    for infile, outfile in zip(infiles, outfiles):
+        t0 = time.time()
+
+        infile  = os.path.join(indir, infile)
+        outfile = os.path.join(outdir, outfile)
+
+        remap_file(infile, outfile, weights, chunk_size = options.chunk_size, debug = options.debug)
+
+        if options.stage is not None:
+            record_cache(outfile, get_cache_key(options.stage, [infile, options.wgt_file]))
+
+        print "time taken: ", str(time.time()-t0)
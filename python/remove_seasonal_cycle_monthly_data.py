@@ -7,26 +7,54 @@
 #
 import numpy
 
-def remove_seasonal_cycle_monthly_data(field, n_months_season = 12, debug = False):
+#Anomalies from the mean seasonal cycle of a monthly (or seasonal subset of
+#monthly) time series: the first nyrs*n_months_season time steps are viewed
+#as (nyrs, n_months_season, ...), the climatology of each month is the mean
+#over years (masked values left out) and is removed by one broadcast
+#subtraction. Trailing time steps that do not fill a whole year are set to NaN.
+#
+#With in_place = True the anomalies overwrite field (a float array) and field
+#is returned, avoiding a second full size array for large gridded fields.
+
+def remove_seasonal_cycle_monthly_data(field, n_months_season = 12, in_place = False, debug = False):
 
     ntime = field.shape[0]
-    field_noann = field + numpy.nan
 
     nyrs = ntime/n_months_season
-    yrs = numpy.arange(0, nyrs)
+    n_full = nyrs * n_months_season
+
+    if debug: print __name__, 'ntime, nyrs, field.ndim: ', ntime, nyrs, field.ndim
+
+    view_shape = (nyrs, n_months_season) + field.shape[1:]
+
+    field_climo = numpy.ma.mean(field[0:n_full].reshape(view_shape), axis = 0)
+    field_climo = numpy.ma.filled(field_climo, numpy.nan)
 
-    if debug: print __name__, 'ntime, nyrs, yrs, field.ndim: ', ntime, nyrs, yrs, field.ndim
+    data = numpy.ma.getdata(field)
 
-    if field.ndim == 1:
-        for i in range(0, n_months_season):
-            field_mean_temp = numpy.ma.mean(field[n_months_season*yrs + i])
-            field_noann[n_months_season*yrs + i] = field[n_months_season*yrs + i] - field_mean_temp
+    if in_place:
+        field_noann = field
+        data_noann  = data
     else:
-        for i in range(0, n_months_season):
-            field_mean_temp = numpy.ma.mean(field[n_months_season*yrs + i, ::], axis = 0)
-            field_noann[n_months_season*yrs + i, ::] = field[n_months_season*yrs + i, ::] - field_mean_temp
+        if data.dtype.kind == 'f':
+            data_noann = numpy.empty(data.shape, dtype = data.dtype)
+        else:
+            data_noann = numpy.empty(data.shape)
+        if numpy.ma.isMaskedArray(field):
+            field_noann = numpy.ma.array(data_noann, mask = numpy.ma.getmaskarray(field).copy())
+        else:
+            field_noann = data_noann
+
+    view_noann = data_noann[0:n_full].reshape(view_shape)
+
+    numpy.subtract(data[0:n_full].reshape(view_shape), field_climo, out = view_noann)
+
+    #reshape copies arrays that are not contiguous
+    if not numpy.may_share_memory(view_noann, data_noann):
+        data_noann[0:n_full] = view_noann.reshape((n_full,) + field.shape[1:])
+
+    data_noann[n_full:] = numpy.nan
 
     if debug: print __name__, 'field_noann: ', field_noann
 
     return field_noann
-
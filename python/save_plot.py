@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Output of the plots, configured for all plot scripts from the environment
+# (set in run_aprime.bash):
+#
+#   plot_format          png (default), webp, svg or pdf
+#   plot_dpi             resolution of raster formats (default 300)
+#   plot_compression     0-9 (default 6): zlib level of png files, effort
+#                        (up to 6) of lossless webp files
+#   plot_thumbnail_width width in pixels of <outfile>_thumb.png thumbnails
+#                        for the index page (default 0: no thumbnails)
+#
+# save_plot(outfile) saves a figure to outfile + '.' + plot_format. Raster
+# formats are rendered by the calling thread, and compressed and written by
+# a background thread while the caller goes on with its next figure, so the
+# figure may be closed once save_plot returns. The write of a figure is
+# waited for before the next one is started, and at exit.
+#
+# Pillow is needed to write png files in the background, webp files and
+# thumbnails; without it png files are written by savefig.
+
+import atexit
+import os
+import sys
+import threading
+import traceback
+
+import numpy
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+save_plot_threads = []
+save_plot_failures = []
+
+
+def get_plot_output_config():
+
+    config = {'format':          os.environ.get('plot_format', 'png').lower(),
+              'dpi':             float(os.environ.get('plot_dpi', 300)),
+              'compression':     int(os.environ.get('plot_compression', 6)),
+              'thumbnail_width': int(os.environ.get('plot_thumbnail_width', 0))}
+
+    if config['format'] not in ['png', 'webp', 'svg', 'pdf']:
+        raise ValueError('plot_format should be one of png, webp, svg, pdf: ' + config['format'])
+
+    if config['format'] == 'webp' and Image is None:
+        raise ImportError('Pillow is needed to write webp plots')
+
+    #The index page links the thumbnails when plot_thumbnail_width is set
+    if config['thumbnail_width'] > 0 and Image is None:
+        raise ImportError('Pillow is needed to write plot thumbnails (plot_thumbnail_width > 0)')
+
+    return config
+
+
+def render_plot_rgba(fig, dpi):
+
+    #Rendering as savefig does: at dpi, on the savefig background color
+    import matplotlib as mpl
+
+    dpi_orig       = fig.get_dpi()
+    facecolor_orig = fig.get_facecolor()
+    edgecolor_orig = fig.get_edgecolor()
+
+    fig.set_dpi(dpi)
+    fig.set_facecolor(mpl.rcParams['savefig.facecolor'])
+    fig.set_edgecolor(mpl.rcParams['savefig.edgecolor'])
+
+    try:
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+
+        rgba = numpy.frombuffer(renderer.buffer_rgba(), dtype = numpy.uint8)
+        rgba = rgba.reshape(int(renderer.height), int(renderer.width), 4).copy()
+
+    finally:
+        fig.set_dpi(dpi_orig)
+        fig.set_facecolor(facecolor_orig)
+        fig.set_edgecolor(edgecolor_orig)
+
+    return rgba
+
+
+def write_plot_rgba(rgba, outfile, config, thumbnail_file):
+
+    try:
+        image = Image.fromarray(rgba, 'RGBA')
+
+        if config['format'] == 'png':
+            image.save(outfile, format = 'PNG', compress_level = config['compression'])
+
+        elif config['format'] == 'webp':
+            image.save(outfile, format = 'WEBP', lossless = True, quality = 100,
+                       method = min(config['compression'], 6))
+
+        if thumbnail_file is not None:
+            write_plot_thumbnail(image, thumbnail_file, config)
+
+    except Exception:
+        traceback.print_exc()
+        save_plot_failures.append(outfile)
+
+
+def write_plot_thumbnail(image, thumbnail_file, config):
+
+    width  = config['thumbnail_width']
+    height = max(1, int(round(float(image.size[1]) * width / image.size[0])))
+
+    image.convert('RGB').resize((width, height), Image.LANCZOS).save(thumbnail_file, format = 'PNG')
+
+
+def wait_for_saved_plots():
+
+    while save_plot_threads:
+        save_plot_threads.pop(0).join()
+
+    if save_plot_failures:
+        failures = list(save_plot_failures)
+        del save_plot_failures[:]
+        raise IOError('Failed writing plots: ' + ', '.join(failures))
+
+
+def save_plot(outfile, fig = None, debug = False):
+
+    if fig is None:
+        import matplotlib.pyplot as plt
+        fig = plt.gcf()
+
+    config = get_plot_output_config()
+
+    outfile = outfile + '.' + config['format']
+
+    if config['thumbnail_width'] > 0:
+        thumbnail_file = os.path.splitext(outfile)[0] + '_thumb.png'
+    else:
+        thumbnail_file = None
+
+    if debug: print __name__, 'config: ', config
+    print __name__, 'Saving plot: ', outfile
+
+    #One figure is written at a time, while the next one is computed
+    wait_for_saved_plots()
+
+    if config['format'] in ['svg', 'pdf'] or Image is None:
+        fig.savefig(outfile, dpi = config['dpi'], format = config['format'])
+
+        if thumbnail_file is not None:
+            rgba = render_plot_rgba(fig, config['thumbnail_width'] / fig.get_size_inches()[0])
+            write_plot_thumbnail(Image.fromarray(rgba, 'RGBA'), thumbnail_file, config)
+
+        return outfile
+
+    rgba = render_plot_rgba(fig, config['dpi'])
+
+    thread = threading.Thread(target = write_plot_rgba, args = (rgba, outfile, config, thumbnail_file))
+    thread.start()
+
+    save_plot_threads.append(thread)
+
+    return outfile
+
+
+def wait_for_saved_plots_at_exit():
+
+    try:
+        wait_for_saved_plots()
+    except IOError as e:
+        print >> sys.stderr, e
+        sys.stderr.flush()
+        #Exit status of the script, as when savefig fails
+        os._exit(1)
+
+atexit.register(wait_for_saved_plots_at_exit)
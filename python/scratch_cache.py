@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# Cache of scratch products (condensed, climatology, remapped files, ...).
+#
+# A product is reused only if the manifest entry written when it was
+# completed matches the current key, built from the stage name, its
+# parameters and the size and modification time of each input file
+# (or their md5 checksums if cache_checksum=1 in the environment), and
+# if the product itself was not modified since. The manifest is kept as
+# one small JSON file per product in $scratch_dir/cache_manifest, so
+# that stages running in background do not write to the same file.
+#
+# Products are written to a temporary file that is renamed once complete
+# (see get_temp_filename), so that a killed job never leaves a partial
+# file under the final name.
+#
+# Used from python:
+#   key = get_cache_key(stage, inputs, params)
+#   if not is_cached(outfile, key): ... write outfile ... record_cache(outfile, key)
+# and from bash:
+#   python python/scratch_cache.py check  --stage remap_climo --output $outfile $infile $wgt_file
+#   python python/scratch_cache.py record --stage remap_climo --output $outfile $infile $wgt_file
+# where check exits with status 0 if the product can be reused. Stage
+# parameters are given as --param name=value, once per parameter.
+#
+# Drivers checking many products (e.g. all variables and seasons) do it in
+# one python process, with the options and inputs of one check per line of
+# the standard input, and get the products that cannot be reused, one per
+# line:
+#   python python/scratch_cache.py check-many < $check_list
+
+import hashlib
+import json
+import os
+import shlex
+import sys
+from   optparse import OptionParser
+
+manifest_dir_name = 'cache_manifest'
+
+
+checksums = {}
+
+
+def get_file_checksum(file_name, block_size = 2**20):
+
+    stat = os.stat(file_name)
+
+    checksum_id = (file_name, stat.st_size, stat.st_mtime)
+
+    if checksum_id in checksums:
+        return checksums[checksum_id]
+
+    md5 = hashlib.md5()
+
+    with open(file_name, 'rb') as f:
+        block = f.read(block_size)
+        while block:
+            md5.update(block)
+            block = f.read(block_size)
+
+    checksums[checksum_id] = md5.hexdigest()
+
+    return checksums[checksum_id]
+
+
+def get_cache_key(stage, inputs, params = None, checksum = None):
+
+    if checksum is None:
+        checksum = os.environ.get('cache_checksum', '0') == '1'
+
+    if params is None:
+        params = {}
+
+    inputs_info = []
+    for file_name in [os.path.abspath(file_name) for file_name in inputs]:
+        if not os.path.isfile(file_name):
+            inputs_info.append([file_name, None])
+        elif checksum:
+            inputs_info.append([file_name, get_file_checksum(file_name)])
+        else:
+            stat = os.stat(file_name)
+            inputs_info.append([file_name, stat.st_size, int(stat.st_mtime)])
+
+    key_data = {'stage':  stage,
+                'params': dict((str(name), str(value)) for name, value in params.items()),
+                'inputs': inputs_info}
+
+    return hashlib.sha1(json.dumps(key_data, sort_keys = True)).hexdigest()
+
+
+def get_manifest_filename(outfile):
+
+    return os.path.join(os.path.dirname(os.path.abspath(outfile)),
+                        manifest_dir_name,
+                        os.path.basename(outfile) + '.json')
+
+
+def get_temp_filename(outfile):
+
+    return outfile + '.tmp' + str(os.getpid())
+
+
+def is_cached(outfile, key):
+
+    manifest_file = get_manifest_filename(outfile)
+
+    if not os.path.isfile(outfile) or not os.path.isfile(manifest_file):
+        return False
+
+    try:
+        with open(manifest_file, 'r') as f:
+            entry = json.load(f)
+    except ValueError:
+        return False
+
+    stat = os.stat(outfile)
+
+    return entry.get('key') == key and \
+           entry.get('size') == stat.st_size and \
+           entry.get('mtime') == int(stat.st_mtime)
+
+
+def record_cache(outfile, key):
+
+    manifest_file = get_manifest_filename(outfile)
+
+    if not os.path.isdir(os.path.dirname(manifest_file)):
+        try:
+            os.makedirs(os.path.dirname(manifest_file))
+        except OSError:
+            pass
+
+    stat = os.stat(outfile)
+
+    entry = {'key':   key,
+             'size':  stat.st_size,
+             'mtime': int(stat.st_mtime)}
+
+    temp_file = get_temp_filename(manifest_file)
+
+    with open(temp_file, 'w') as f:
+        json.dump(entry, f)
+
+    os.rename(temp_file, manifest_file)
+
+
+def get_params(param_list):
+
+    #name=value strings of the command line, values may contain commas
+    params = {}
+
+    for param in param_list or []:
+        if '=' not in param:
+            raise ValueError('stage parameters must be given as name=value: ' + param)
+
+        name, value = param.split('=', 1)
+        params[name] = value
+
+    return params
+
+
+if __name__ == "__main__":
+    parser = OptionParser(usage = "python %prog check|record|check-many [options] input_file ...")
+
+    parser.add_option("--stage", dest = "stage",
+                        help = "name of the stage producing the file")
+
+    parser.add_option("--output", dest = "output",
+                        help = "product file")
+
+    parser.add_option("--param", dest = "params", action = "append",
+                        help = "name=value stage parameter, repeated for each parameter")
+
+    (options, args) = parser.parse_args()
+
+    if len(args) == 0 or args[0] not in ['check', 'record', 'check-many']:
+        parser.error("first argument must be check, record or check-many")
+
+    action = args[0]
+    inputs = args[1:]
+
+    if action == 'check-many':
+        for line in sys.stdin:
+            if line.strip() == '':
+                continue
+
+            (line_options, line_inputs) = parser.parse_args(shlex.split(line))
+
+            key = get_cache_key(line_options.stage, line_inputs, get_params(line_options.params))
+
+            if not is_cached(line_options.output, key):
+                print line_options.output
+
+        sys.exit(0)
+
+    key = get_cache_key(options.stage, inputs, get_params(options.params))
+
+    if action == 'check':
+        if is_cached(options.output, key):
+            print "file", options.output, "is up to date!"
+            sys.exit(0)
+        else:
+            sys.exit(1)
+    else:
+        record_cache(options.output, key)
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# In-process cache of the time series fields read by
+# read_monthly_data_ts_field, so that drivers looping over regions, lags
+# or indices read each (file, field, season, region) from disk once.
+# read_climo_file keeps the climatology fields it reads in the same cache,
+# for processes plotting several figures against one reference case.
+#
+# Entries are evicted in least recently used order once the arrays held
+# exceed ts_field_cache_mb (MB, from the environment, default 2048).
+# ts_field_cache_mb=0 disables the cache.
+#
+# Arrays are copied on the way out, so callers may modify what they get
+# without changing the cached entry.
+
+import os
+from   collections import OrderedDict
+
+import numpy
+
+ts_field_cache = OrderedDict()
+ts_field_cache_nbytes = [0]
+
+
+def get_ts_field_cache_max_bytes():
+
+    return float(os.environ.get('ts_field_cache_mb', 2048)) * 2**20
+
+
+def get_ts_field_cache_key(file_name, field_name, begin_month, end_month, reg, skip_yrs):
+
+    #File modification time is part of the key, so that files rewritten
+    #during the run (e.g. incremental updates) are read again
+    file_name = os.path.abspath(file_name)
+
+    if isinstance(reg, list):
+        reg = tuple(reg)
+
+    return (file_name, os.path.getmtime(file_name), field_name,
+            begin_month, end_month, reg, skip_yrs)
+
+
+def get_entry_nbytes(entry):
+
+    nbytes = 0
+
+    for x in entry:
+        if isinstance(x, numpy.ndarray):
+            nbytes += x.nbytes
+            if numpy.ma.isMaskedArray(x) and x.mask is not numpy.ma.nomask:
+                nbytes += x.mask.nbytes
+
+    return nbytes
+
+
+def copy_entry(entry):
+
+    return tuple(x.copy() if isinstance(x, numpy.ndarray) else x for x in entry)
+
+
+def get_ts_field_cache(key):
+
+    if key not in ts_field_cache:
+        return None
+
+    entry = ts_field_cache.pop(key)
+    ts_field_cache[key] = entry
+
+    return copy_entry(entry)
+
+
+def put_ts_field_cache(key, entry):
+
+    max_bytes = get_ts_field_cache_max_bytes()
+    nbytes    = get_entry_nbytes(entry)
+
+    if nbytes > max_bytes:
+        return
+
+    if key in ts_field_cache:
+        ts_field_cache_nbytes[0] -= get_entry_nbytes(ts_field_cache.pop(key))
+
+    while ts_field_cache and ts_field_cache_nbytes[0] + nbytes > max_bytes:
+        old_key, old_entry = ts_field_cache.popitem(last = False)
+        ts_field_cache_nbytes[0] -= get_entry_nbytes(old_entry)
+
+    ts_field_cache[key] = copy_entry(entry)
+    ts_field_cache_nbytes[0] += nbytes
+
+
+def clear_ts_field_cache():
+
+    ts_field_cache.clear()
+    ts_field_cache_nbytes[0] = 0
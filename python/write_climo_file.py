@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to write a native grid (ncol) seasonal climatology file, copying
+# the attributes of the source field, lat and lon variables.
+# The file is written under a temporary name and renamed once complete.
+
+import os
+import numpy
+from netCDF4 import Dataset
+
+from scratch_cache import get_temp_filename
+
+def write_climo_file(outfile, field_name, seasonal_clim, field, lat, lon, units_out):
+
+    print "Writing ", outfile
+    print ""
+
+    ncol = seasonal_clim.shape[0]
+
+    temp_file = get_temp_filename(outfile)
+
+    f_write = Dataset(temp_file, 'w', format = 'NETCDF3_64BIT')
+
+    ncol_outfile = f_write.createDimension('ncol', ncol)
+
+    #Points without valid samples (see compute_monthly_climo) are masked
+    if numpy.ma.is_masked(seasonal_clim):
+        field_outfile = f_write.createVariable(field_name, 'f4', ('ncol'), fill_value = 1.e20)
+    else:
+        field_outfile = f_write.createVariable(field_name, 'f4', ('ncol'))
+    lat_outfile = f_write.createVariable('lat', 'float64', ('ncol'))
+    lon_outfile = f_write.createVariable('lon', 'float64', ('ncol'))
+
+    field_outfile[:] = seasonal_clim
+
+    for ncattr in field.ncattrs():
+        if ncattr != '_FillValue':
+            field_outfile.setncattr(ncattr, field.getncattr(ncattr))
+
+    field_outfile.units = units_out
+
+    lat_outfile[:] = lat[:]
+
+    for ncattr in lat.ncattrs():
+        lat_outfile.setncattr(ncattr, lat.getncattr(ncattr))
+
+    lon_outfile[:] = lon[:]
+    for ncattr in lon.ncattrs():
+        lon_outfile.setncattr(ncattr, lon.getncattr(ncattr))
+
+    f_write.close()
+
+    os.rename(temp_file, outfile)
@@ -0,0 +1,39 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to write the monthly sums and counts of a field (see compute_monthly_sums),
+# kept so that climatologies can be extended when a run is extended.
+# The file is written under a temporary name and renamed once complete.
+
+import os
+from netCDF4 import Dataset
+
+from scratch_cache import get_temp_filename
+
+def write_monthly_sums_file(outfile, field_name, sum_field, count_field, dimensions):
+
+    print "Writing ", outfile
+    print ""
+
+    temp_file = get_temp_filename(outfile)
+
+    f_write = Dataset(temp_file, 'w', format = 'NETCDF4')
+
+    f_write.createDimension('month', 12)
+
+    for i, dim in enumerate(dimensions):
+        f_write.createDimension(dim, sum_field.shape[i+1])
+
+    sum_outfile = f_write.createVariable(field_name + '_sum', 'float64', ('month',) + tuple(dimensions))
+    count_outfile = f_write.createVariable('count', 'float64', ('month',) + tuple(dimensions))
+
+    sum_outfile[:] = sum_field
+    count_outfile[:] = count_field
+
+    f_write.close()
+
+    os.rename(temp_file, outfile)
@@ -0,0 +1,65 @@
+#
+# Copyright (c) 2017, UT-BATTELLE, LLC
+# All rights reserved.
+#
+# This software is released under the BSD license detailed
+# in the LICENSE file in the top level a-prime directory
+#
+# to write a remapped (lat, lon) seasonal climatology file, as ncremap
+# would write from the native grid climatology file, copying the attributes
+# of the source field and the destination grid of the remapping weights
+# (see read_remap_weights). The file is written under a temporary name
+# and renamed once complete.
+
+import os
+import numpy
+from netCDF4 import Dataset
+
+from scratch_cache import get_temp_filename
+
+def write_remapped_climo_file(outfile, field_name, seasonal_clim, field, weights, units_out):
+
+    print "Writing ", outfile
+    print ""
+
+    nlat = weights['lat'].shape[0]
+    nlon = weights['lon'].shape[0]
+
+    temp_file = get_temp_filename(outfile)
+
+    f_write = Dataset(temp_file, 'w', format = 'NETCDF3_64BIT')
+
+    lat_outfile = f_write.createDimension('lat', nlat)
+    lon_outfile = f_write.createDimension('lon', nlon)
+
+    lat_outfile = f_write.createVariable('lat', 'float64', ('lat'))
+    lat_outfile.long_name = 'latitude'
+    lat_outfile.units = 'degrees_north'
+    lat_outfile[:] = weights['lat']
+
+    lon_outfile = f_write.createVariable('lon', 'float64', ('lon'))
+    lon_outfile.long_name = 'longitude'
+    lon_outfile.units = 'degrees_east'
+    lon_outfile[:] = weights['lon']
+
+    area_outfile = f_write.createVariable('area', 'float64', ('lat', 'lon'))
+    area_outfile.long_name = 'solid angle subtended by gridcell'
+    area_outfile.units = 'steradian'
+    area_outfile[:] = weights['area']
+
+    if numpy.ma.is_masked(seasonal_clim):
+        field_outfile = f_write.createVariable(field_name, 'f4', ('lat', 'lon'), fill_value = 1.e20)
+    else:
+        field_outfile = f_write.createVariable(field_name, 'f4', ('lat', 'lon'))
+
+    for ncattr in field.ncattrs():
+        if ncattr != '_FillValue':
+            field_outfile.setncattr(ncattr, field.getncattr(ncattr))
+
+    field_outfile.units = units_out
+
+    field_outfile[:] = seasonal_clim
+
+    f_write.close()
+
+    os.rename(temp_file, outfile)
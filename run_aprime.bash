@@ -322,6 +322,56 @@ else
   export useMOCpostprocessing=False
 fi
 
+# Memory budget (in MB) for each atmosphere climatology process. If set to a
+# value larger than 0, create_climatology.py reads the condensed fields in
+# chunks of time steps that fit this budget (useful for high resolution runs,
+# e.g. ne120, or when running on shared login nodes). 0 reads whole fields.
+export climo_max_memory_mb=0
+# If set to 1, atmosphere climatologies are computed directly from the monthly
+# history files in one sweep for all variables, skipping the condense step for
+# climo variables (requires the corresponding condense_field_climo switch = 1).
+export climo_from_history=0
+# Maximum number of parallel processes used to condense atmosphere fields.
+# Each process reads every history file once for its share of the variables.
+export condense_n_procs=4
+# If set to 1, condensed files, climatologies and index files of an earlier
+# run of the same case with the same begin year (e.g. years 1-40 when
+# processing years 1-50) are extended with the new years only, instead of
+# being recomputed from the begin year.
+export incremental_update=0
+# Scratch products are reused only if their inputs did not change since they
+# were written (see python/scratch_cache.py). Inputs are compared by size and
+# modification time, or by md5 checksum if cache_checksum=1 (slower).
+export cache_checksum=0
+# Engine used to remap atmosphere climatologies and time series to obs grids:
+# "python" (python/remap_files.py, reads each weights file once for all files
+# sharing it) or "ncremap" (one ncremap call per file)
+export remap_engine=python
+# Directory of the remapping operators preprocessed from the weights files by
+# python/remap_files.py, shared by all variables, seasons and cases
+export remap_cache_dir=$output_base_dir/coupled_diagnostics/remap_cache
+# If set to 1, atmosphere climatologies are remapped in memory as they are
+# computed and only the remapped climatology files are written, skipping the
+# separate remap step (not applied when climo_from_history=1). Set
+# fuse_climo_write_native=1 to also keep the native grid climatology files.
+export fuse_climo_remap=0
+export fuse_climo_write_native=0
+# Memory (in MB) used by each plotting process to keep the time series fields
+# it read, so that fields shared by several regions, lags or indices are read
+# from disk once (see python/ts_field_cache.py). 0 disables this cache.
+export ts_field_cache_mb=2048
+# Number of python processes plotting climatologies (see
+# python/plot_climo_batch.py). 0 uses one process per core.
+export plot_climo_n_workers=0
+# Output of the plots (see python/save_plot.py): format (png, webp, svg or
+# pdf), resolution of png/webp files, compression level (0-9) and width in
+# pixels of the thumbnails shown in the index page (0: no thumbnails).
+# webp and thumbnails need the python Pillow package.
+export plot_format=png
+export plot_dpi=300
+export plot_compression=6
+export plot_thumbnail_width=0
+
 # Set paths to scratch, plots and logs directories
 export test_scratch_dir=$output_base_dir/coupled_diagnostics/$test_casename.scratch
 export ref_scratch_dir=$output_base_dir/coupled_diagnostics/$ref_case.scratch
@@ -335,6 +385,16 @@ fi
 #export plots_dir_name=XXXX
 export plots_dir=$plots_base_dir/$plots_dir_name
 export log_dir=$plots_dir.logs
+# Contour levels of the reference case plots, computed once per reference
+# field and kept for other test cases and runs (see python/get_contour_levels.py).
+# Levels are computed again if the reference case files change. Set to an
+# empty string to compute the levels for each plot.
+export contour_levels_dir=$ref_scratch_dir/contour_levels
+# Data drawn in the climatology and regression plots, saved so that a plot can
+# be drawn again without computing the diagnostics, e.g.
+#   python python/plot_climo.py --replot $plot_data_dir/<plot>.nc --plots_dir <dir>
+# (see python/plot_data_file.py). Set to an empty string to not save them.
+export plot_data_dir=$plots_dir.data
 
 # Set atm specific paths to mapping and data files locations
 export remap_files_dir=$projdir/diagnostics/a-prime/maps